@@ -0,0 +1,12 @@
+"""Options for running the load test under pytest: uv run pytest benchmarks/ [--load-output results.json]."""
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("load", "zaatar load test")
+    group.addoption("--load-requests", type=int, default=50, help="Measured requests per scenario")
+    group.addoption("--load-concurrency", type=int, default=8, help="Requests in flight")
+    group.addoption("--load-output", default=None, help="Write the JSON report here")
+    group.addoption("--load-baseline", default=None, help="Fail if p99 latency regressed against this JSON report")
+    group.addoption("--load-tolerance", type=float, default=0.2, help="Allowed p99 increase over the baseline")
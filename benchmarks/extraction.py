@@ -0,0 +1,64 @@
+"""Compare extraction engines: throughput and output parity against readability + html2text.
+
+Usage:
+    uv run python -m benchmarks.extraction [--iterations N] [page.html ...]
+
+Without arguments, synthetic article pages of increasing size are used.
+"""
+
+import argparse
+import difflib
+import logging
+import re
+import time
+from pathlib import Path
+
+from benchmarks.pages import synthetic_page
+from zaatar.clients.fetcher import _extract_content
+
+ENGINE_PAIRS = (("markdown", "lxml-markdown"), ("text", "lxml-text"))
+SYNTHETIC_PARAGRAPHS = (10, 100, 1000)
+WORD = re.compile(r"\w+")
+
+
+def parity(expected: str, actual: str) -> float:
+    """Word-level similarity (0-1) between two extractions, ignoring markup differences."""
+    return difflib.SequenceMatcher(None, WORD.findall(expected), WORD.findall(actual), autojunk=False).ratio()
+
+
+def measure(html: str, mode: str, iterations: int) -> tuple[float, str]:
+    """Return the mean seconds per extraction and the extracted output."""
+    output = _extract_content(html, mode)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        _extract_content(html, mode)
+    return (time.perf_counter() - start) / iterations, output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", type=Path, help="HTML files to extract (default: synthetic pages)")
+    parser.add_argument("--iterations", type=int, default=20, help="Extractions per engine and page")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # readability logs every scoring step at DEBUG
+    if args.pages:
+        pages = [(path.name, path.read_text(errors="replace")) for path in args.pages]
+    else:
+        pages = [(f"synthetic-{count}p", synthetic_page(count)) for count in SYNTHETIC_PARAGRAPHS]
+
+    print(f"{'page':<20} {'KiB':>7} {'baseline':<14} {'ms':>8} {'engine':<14} {'ms':>8} {'speedup':>8} {'parity':>7}")
+    for name, html in pages:
+        for baseline_mode, engine_mode in ENGINE_PAIRS:
+            baseline_seconds, baseline_output = measure(html, baseline_mode, args.iterations)
+            engine_seconds, engine_output = measure(html, engine_mode, args.iterations)
+            print(
+                f"{name:<20} {len(html.encode()) / 1024:>7.1f} "
+                f"{baseline_mode:<14} {baseline_seconds * 1000:>8.2f} "
+                f"{engine_mode:<14} {engine_seconds * 1000:>8.2f} "
+                f"{baseline_seconds / engine_seconds:>7.1f}x {parity(baseline_output, engine_output):>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
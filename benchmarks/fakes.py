@@ -0,0 +1,151 @@
+"""In-process stand-ins for SearXNG, Ollama and an HTML origin, with configurable latency and payload size.
+
+Each server runs on 127.0.0.1 on a free port in a daemon thread::
+
+    with FakeSearxng(latency=0.05, results=10) as searxng:
+        httpx.get(f"{searxng.url}/search", params={"q": "python"})
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.pages import synthetic_page
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _Server
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+    def _reply(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        url = urlparse(self.path)
+        fake = self.server.fake
+        with fake.lock:
+            fake.requests += 1
+        if fake.latency > 0:
+            time.sleep(fake.latency)
+        status, payload, content_type = fake.respond(method, url.path, parse_qs(url.query), body)
+        self._reply(status, payload, content_type)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: FakeServer
+
+
+class FakeServer:
+    """Base class: serve ``respond()`` after ``latency`` seconds on a background thread."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, bytes, str]:
+        raise NotImplementedError
+
+    def start(self) -> Self:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def _json(data: object) -> tuple[int, bytes, str]:
+    return 200, json.dumps(data).encode(), "application/json"
+
+
+class FakeSearxng(FakeServer):
+    """Answers ``/search?format=json`` with ``results`` results of ``description_chars`` characters."""
+
+    def __init__(self, latency: float = 0.0, results: int = 10, description_chars: int = 200) -> None:
+        super().__init__(latency)
+        self.results = results
+        self.description_chars = description_chars
+
+    def respond(self, method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, bytes, str]:
+        if path != "/search":
+            return 404, b"", "text/plain"
+        q = query.get("q", [""])[0]
+        description = ("lorem ipsum " * (self.description_chars // 12 + 1))[: self.description_chars]
+        results = [
+            {"title": f"{q} result {index}", "url": f"https://example.com/{index}", "content": description}
+            for index in range(self.results)
+        ]
+        return _json({"query": q, "results": results})
+
+
+class FakeOllama(FakeServer):
+    """Answers ``/api/generate`` (non-streamed) with a ``response_chars`` summary and ``/api/tags``."""
+
+    def __init__(self, latency: float = 0.0, response_chars: int = 500, model: str = "gemma3:4b") -> None:
+        super().__init__(latency)
+        self.response_chars = response_chars
+        self.model = model
+
+    def respond(self, method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, bytes, str]:
+        if path == "/api/tags":
+            return _json({"models": [{"model": self.model}]})
+        if path != "/api/generate":
+            return 404, b"", "text/plain"
+        prompt = json.loads(body).get("prompt", "")
+        summary = ("Summary text. " * (self.response_chars // 14 + 1))[: self.response_chars]
+        return _json(
+            {
+                "model": self.model,
+                "response": summary,
+                "done": True,
+                "prompt_eval_count": len(prompt) // 4,
+                "eval_count": len(summary) // 4,
+            }
+        )
+
+
+class FakeOrigin(FakeServer):
+    """Serves a synthetic article of ``paragraphs`` paragraphs for every path."""
+
+    def __init__(self, latency: float = 0.0, paragraphs: int = 100) -> None:
+        super().__init__(latency)
+        self.page = synthetic_page(paragraphs).encode()
+
+    def respond(self, method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, bytes, str]:
+        return 200, self.page, "text/html; charset=utf-8"
@@ -0,0 +1,229 @@
+"""Load test the API against local SearXNG, Ollama and origin stand-ins.
+
+Usage:
+    uv run python -m benchmarks.load [--requests N] [--concurrency N] [--output results.json]
+    uv run python -m benchmarks.load --compare baseline.json     # fail on p99 regressions
+
+The fakes (benchmarks.fakes) are started first and zaatar is configured to use them through
+its environment variables, so this must run in a fresh process. create_app() is served by a
+threaded werkzeug server and driven over HTTP; each scenario reports throughput and p50/p99
+latency, and the results are written as JSON to compare across commits.
+
+In pytest mode (uv run pytest benchmarks/), benchmarks/test_load.py runs this driver in a
+subprocess; see benchmarks/conftest.py for its options.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+from benchmarks.fakes import FakeOllama, FakeOrigin, FakeSearxng
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+@dataclass
+class UpstreamProfile:
+    """Latency (seconds) and payload sizes of the stand-in upstreams."""
+
+    searxng_latency: float = 0.02
+    searxng_results: int = 10
+    ollama_latency: float = 0.2
+    ollama_response_chars: int = 800
+    origin_latency: float = 0.02
+    origin_paragraphs: int = 100
+
+
+@dataclass
+class Scenario:
+    """A named request mix; ``path(i)`` builds the i-th request path."""
+
+    name: str
+    path: Callable[[int], str]
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+
+def scenarios(origin_url: str) -> list[Scenario]:
+    """The measured request mixes. Unique queries and URLs bypass the caches; ``cached`` ones hit them."""
+    return [
+        Scenario("web_search", lambda i: f"/web_search?query=load+test+{i}&summarize=false"),
+        Scenario("web_search_cached", lambda _i: "/web_search?query=load+test&summarize=false"),
+        Scenario("web_search_summarize", lambda i: f"/web_search?query=load+test+{i}&summarize=true"),
+        Scenario("web_fetch", lambda i: f"/web_fetch?url={origin_url}/page/{i}&maxChars=5000"),
+        Scenario("web_fetch_cached", lambda _i: f"/web_fetch?url={origin_url}/page&maxChars=5000"),
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def drive(base_url: str, scenario: Scenario, requests: int, concurrency: int) -> ScenarioResult:
+    """Send ``requests`` requests with ``concurrency`` in flight and collect latencies."""
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    lock = threading.Lock()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    with httpx.Client(base_url=base_url, limits=limits, timeout=60) as client:
+
+        def send(index: int) -> None:
+            started = time.perf_counter()
+            try:
+                status = str(client.get(scenario.path(index)).status_code)
+            except httpx.HTTPError as exc:
+                status = type(exc).__name__
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                status_codes[status] = status_codes.get(status, 0) + 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(send, range(requests)))
+        seconds = time.perf_counter() - started
+
+    return ScenarioResult(
+        requests=requests,
+        errors=requests - status_codes.get("200", 0),
+        seconds=round(seconds, 3),
+        throughput=round(requests / seconds, 1),
+        p50_ms=round(percentile(latencies, 0.5) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 2),
+        status_codes=status_codes,
+    )
+
+
+@contextmanager
+def serve_app(profile: UpstreamProfile) -> Iterator[tuple[str, str]]:
+    """Start the fakes and the app; yield ``(app_url, origin_url)``."""
+    if "zaatar.settings" in sys.modules:
+        msg = "zaatar was imported before the fakes were configured; run the load test in a fresh process"
+        raise RuntimeError(msg)
+
+    with ExitStack() as stack:
+        searxng = stack.enter_context(FakeSearxng(profile.searxng_latency, profile.searxng_results))
+        ollama = stack.enter_context(FakeOllama(profile.ollama_latency, profile.ollama_response_chars))
+        origin = stack.enter_context(FakeOrigin(profile.origin_latency, profile.origin_paragraphs))
+        os.environ["SEARXNG_BASE_URL"] = searxng.url
+        os.environ["OLLAMA_BASE_URL"] = ollama.url
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # one access log line per request
+
+        from werkzeug.serving import make_server  # noqa: PLC0415
+
+        from zaatar.app import create_app  # noqa: PLC0415
+
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.server_port}", origin.url
+        finally:
+            server.shutdown()
+
+
+def git_commit() -> str | None:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=False)  # noqa: S607
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def run(
+    requests: int = 200, concurrency: int = 16, profile: UpstreamProfile | None = None, only: list[str] | None = None
+) -> dict[str, object]:
+    """Run every scenario (or those in ``only``) and return a JSON-serializable report."""
+    profile = profile or UpstreamProfile()
+    results: dict[str, dict[str, object]] = {}
+    with serve_app(profile) as (app_url, origin_url):
+        for scenario in scenarios(origin_url):
+            if only and scenario.name not in only:
+                continue
+            drive(app_url, scenario, min(concurrency, requests), concurrency)  # warm up pools and caches
+            results[scenario.name] = asdict(drive(app_url, scenario, requests, concurrency))
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "requests": requests,
+        "concurrency": concurrency,
+        "profile": asdict(profile),
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> list[str]:
+    """Return the scenarios whose p99 latency grew by more than ``tolerance`` (a fraction) over the baseline."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = (result["p99_ms"] - before["p99_ms"]) / before["p99_ms"]
+        print(f"{name:<24} p99 {before['p99_ms']:>9.2f} -> {result['p99_ms']:>9.2f} ms ({change:+.1%})")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight")
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (repeatable)")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON report to compare p99 latency against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p99 increase over the baseline")
+    args = parser.parse_args()
+
+    report = run(args.requests, args.concurrency, only=args.scenario)
+
+    print(f"{'scenario':<24} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, result in report["results"].items():
+        print(
+            f"{name:<24} {result['throughput']:>8.1f} {result['p50_ms']:>9.2f} "
+            f"{result['p99_ms']:>9.2f} {result['errors']:>7}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.compare:
+        regressions = compare(json.loads(args.compare.read_text()), report, args.tolerance)
+        if regressions:
+            print(f"p99 regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
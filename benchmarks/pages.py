@@ -0,0 +1,27 @@
+"""Synthetic HTML article pages for the benchmarks."""
+
+PARAGRAPH = (
+    "<p>Paragraph {index} discusses the topic at length, with <a href='/ref/{index}'>a reference</a>, "
+    "some <strong>bold claims</strong>, and <em>emphasis</em>. It continues for a while, adding detail, "
+    "caveats, and examples so that it reads like real article text rather than boilerplate.</p>"
+)
+
+
+def synthetic_page(paragraphs: int) -> str:
+    """Build an article page with navigation, a sidebar, and comments around the content."""
+    body = []
+    for index in range(paragraphs):
+        if index % 10 == 0:
+            body.append(f"<h2>Section {index // 10}</h2>")
+        body.append(PARAGRAPH.format(index=index))
+        if index % 25 == 0:
+            body.append("<ul><li>First point</li><li>Second point</li></ul><pre>code = 1\nprint(code)</pre>")
+    links = "".join(f"<li><a href='/page/{i}'>Link {i}</a></li>" for i in range(50))
+    return (
+        "<html><head><title>Synthetic</title><script>var x = 1;</script></head><body>"
+        f"<nav><ul>{links}</ul></nav>"
+        f"<div id='content' class='article'><h1>Synthetic article</h1>{''.join(body)}</div>"
+        f"<div class='sidebar'><ul>{links}</ul></div>"
+        "<div class='comments'><p>First comment, which is long enough to be scored as a paragraph.</p></div>"
+        "<footer>Copyright</footer></body></html>"
+    )
@@ -0,0 +1,39 @@
+"""Load test in pytest form; kept out of the default test run (testpaths = tests)."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.load import compare
+
+
+def test_load(request: pytest.FixtureRequest, tmp_path: Path) -> None:
+    option = request.config.getoption
+    output = Path(option("--load-output") or tmp_path / "load.json")
+    # zaatar reads its upstream URLs at import time, so the driver needs a fresh interpreter
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.load",
+        "--requests",
+        str(option("--load-requests")),
+        "--concurrency",
+        str(option("--load-concurrency")),
+        "--output",
+        str(output),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, check=False, timeout=600)  # noqa: S603
+    print(completed.stdout)
+    assert completed.returncode == 0, completed.stderr
+
+    report = json.loads(output.read_text())
+    for name, result in report["results"].items():
+        assert result["errors"] == 0, f"{name}: {result['status_codes']}"
+
+    baseline = option("--load-baseline")
+    if baseline:
+        regressions = compare(json.loads(Path(baseline).read_text()), report, option("--load-tolerance"))
+        assert not regressions, f"p99 regressions: {regressions}"
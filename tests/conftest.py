@@ -3,6 +3,33 @@
 import pytest
 
 from zaatar.app import create_app
+from zaatar.clients.extraction import ExtractionPool
+from zaatar.clients.fetcher import fetch_cache
+from zaatar.clients.ollama import ollama_backends, semantic_summaries, summary_cache
+from zaatar.clients.searxng import search_cache, searxng_backends, searxng_hedging
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches() -> None:
+    """Isolate tests from results cached by earlier tests."""
+    search_cache.clear()
+    summary_cache.clear()
+    semantic_summaries.clear()
+    fetch_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_backends() -> None:
+    """Isolate tests from backend counters and ejections left by earlier tests."""
+    ollama_backends.after_fork()
+    searxng_backends.after_fork()
+    searxng_hedging.after_fork()
+
+
+@pytest.fixture(autouse=True)
+def _inline_extraction(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Extract in the test process so extraction can be patched; the pool is covered in test_extraction."""
+    monkeypatch.setattr("zaatar.clients.fetcher.extraction_pool", ExtractionPool(workers=0))
 
 
 @pytest.fixture
@@ -0,0 +1,143 @@
+"""Admission control tests."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from zaatar.admission import AdmissionGate, AdmissionRejectedError, ShedReason
+from zaatar.clients.ollama import summarize
+from zaatar.metrics import SUMMARIES_SHED
+
+
+def _hold(gate: AdmissionGate, release: threading.Event) -> threading.Thread:
+    """Occupy one slot of ``gate`` until ``release`` is set."""
+    admitted = threading.Event()
+
+    def run() -> None:
+        with gate.admit():
+            admitted.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert admitted.wait(5)
+    return thread
+
+
+class TestAdmissionGate:
+    def test_admits_up_to_max_active(self):
+        gate = AdmissionGate("test", max_active=2, max_queued=0, max_wait=1)
+        with gate.admit() as waited, gate.admit():
+            assert waited < 0.1
+            assert gate.stats()["active"] == 2
+        assert gate.stats()["active"] == 0
+        assert gate.stats()["admitted"] == 2
+
+    def test_full_queue_rejected_immediately(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=0, max_wait=10)
+        release = threading.Event()
+        holder = _hold(gate, release)
+        started = time.monotonic()
+        with pytest.raises(AdmissionRejectedError) as excinfo, gate.admit():
+            pass
+        release.set()
+        holder.join()
+
+        assert excinfo.value.reason is ShedReason.QUEUE_FULL
+        assert time.monotonic() - started < 1
+        assert gate.stats()["shed_queue_full"] == 1
+
+    def test_wait_exceeded(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=1, max_wait=0.05)
+        release = threading.Event()
+        holder = _hold(gate, release)
+        with pytest.raises(AdmissionRejectedError) as excinfo, gate.admit():
+            pass
+        release.set()
+        holder.join()
+
+        assert excinfo.value.reason is ShedReason.WAIT_EXCEEDED
+        stats = gate.stats()
+        assert stats["shed_wait_exceeded"] == 1
+        assert stats["queued"] == 0
+
+    def test_queued_call_admitted_when_slot_frees(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=1, max_wait=5)
+        release = threading.Event()
+        holder = _hold(gate, release)
+        threading.Timer(0.05, release.set).start()
+        with gate.admit() as waited:
+            assert waited >= 0.04
+        holder.join()
+        assert gate.stats()["admitted"] == 2
+
+    def test_async_wait_exceeded(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=1, max_wait=0.1)
+
+        async def contend() -> None:
+            async with gate.aadmit():
+                with pytest.raises(AdmissionRejectedError) as excinfo:
+                    async with gate.aadmit():
+                        pass
+                assert excinfo.value.reason is ShedReason.WAIT_EXCEEDED
+
+        asyncio.run(contend())
+        assert gate.stats()["active"] == 0
+        assert gate.stats()["queued"] == 0
+
+    def test_async_admitted_after_release(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=1, max_wait=5)
+
+        async def hold() -> None:
+            async with gate.aadmit():
+                await asyncio.sleep(0.1)
+
+        async def contend() -> float:
+            holder = asyncio.create_task(hold())
+            await asyncio.sleep(0)
+            async with gate.aadmit() as waited:
+                await holder
+                return waited
+
+        assert asyncio.run(contend()) > 0
+        assert gate.stats()["admitted"] == 2
+
+    def test_after_fork_resets(self):
+        gate = AdmissionGate("test", max_active=1, max_queued=0, max_wait=1)
+        gate.active = 1
+        gate.after_fork()
+        with gate.admit():
+            pass
+        assert gate.stats()["admitted"] == 1
+
+
+class TestSummaryAdmission:
+    RESULTS = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_summary_shed_when_saturated(self, mock_get_client):
+        release = threading.Event()
+
+        def slow_post(*_args, **_kwargs) -> httpx.Response:
+            release.wait(5)
+            return httpx.Response(200, json={"response": "Summary"}, request=httpx.Request("POST", "http://test"))
+
+        mock_get_client.return_value.post.side_effect = slow_post
+        gate = AdmissionGate("ollama", max_active=1, max_queued=0, max_wait=1)
+        shed_before = SUMMARIES_SHED.value(reason="queue_full")
+        with patch("zaatar.clients.ollama.summary_admission", gate):
+            first = threading.Thread(target=summarize, args=("first", self.RESULTS))
+            first.start()
+            while gate.stats()["active"] == 0:
+                time.sleep(0.01)
+            with pytest.raises(AdmissionRejectedError):
+                summarize("second", self.RESULTS)
+            release.set()
+            first.join()
+
+        assert SUMMARIES_SHED.value(reason="queue_full") == shed_before + 1
+        assert mock_get_client.return_value.post.call_count == 1
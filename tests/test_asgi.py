@@ -0,0 +1,114 @@
+"""ASGI app tests."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from zaatar.admission import AdmissionRejectedError, ShedReason
+from zaatar.asgi import create_asgi_app
+from zaatar.clients.fetcher import FetchError
+from zaatar.models import FetchResponse, SearchResponse, SearchResult, SearchResultsWeb
+
+
+def _get(path: str) -> httpx.Response:
+    async def request() -> httpx.Response:
+        transport = httpx.ASGITransport(app=create_asgi_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+
+    return asyncio.run(request())
+
+
+class TestAsgiWebSearch:
+    @patch("zaatar.asgi.async_summarize", new_callable=AsyncMock, return_value="A concise summary.")
+    @patch("zaatar.asgi.async_search", new_callable=AsyncMock)
+    def test_search_with_summary(self, mock_search, mock_summarize):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(
+                results=[
+                    SearchResult(title="Test", url="https://example.com", description="A test"),
+                ]
+            )
+        )
+        response = _get("/web_search?query=test&count=3")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["summary"] == "A concise summary."
+        assert mock_search.call_args[0][0].count == 3
+        mock_summarize.assert_awaited_once()
+
+    @patch("zaatar.asgi.async_summarize", new_callable=AsyncMock)
+    @patch("zaatar.asgi.async_search", new_callable=AsyncMock)
+    def test_search_without_summary(self, mock_search, mock_summarize):
+        mock_search.return_value = SearchResponse(web=SearchResultsWeb(results=[]))
+        response = _get("/web_search?query=test&summarize=false")
+        assert response.status_code == 200
+        assert "summary" not in response.json()
+        mock_summarize.assert_not_awaited()
+
+    @patch(
+        "zaatar.asgi.async_summarize",
+        new_callable=AsyncMock,
+        side_effect=AdmissionRejectedError(ShedReason.QUEUE_FULL),
+    )
+    @patch("zaatar.asgi.async_search", new_callable=AsyncMock)
+    def test_search_summary_shed(self, mock_search, _mock_summarize):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        response = _get("/web_search?query=test")
+        assert response.status_code == 200
+        assert response.json()["summary_skipped"] == "queue_full"
+
+    def test_search_missing_query(self):
+        response = _get("/web_search")
+        assert response.status_code == 422
+        assert response.json()[0]["loc"] == ["query"]
+
+    @patch("zaatar.deep.async_fetch_within", new_callable=AsyncMock)
+    @patch("zaatar.asgi.async_search", new_callable=AsyncMock)
+    def test_deep_search(self, mock_search, mock_fetch_within):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="Test", url="https://example.com", description="A test")])
+        )
+        mock_fetch_within.return_value = [
+            FetchResponse(url="https://example.com", content="Page", extract_mode="lxml-text", content_length=4)
+        ]
+        response = _get("/web_search?query=test&summarize=false&depth=deep")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["web"]["results"][0]["content"] == "Page"
+        assert data["deep"]["pages_fetched"] == 1
+
+    @patch("zaatar.asgi.async_search", new_callable=AsyncMock, side_effect=httpx.ConnectError("refused"))
+    def test_search_engine_unavailable(self, _mock_search):
+        response = _get("/web_search?query=test")
+        assert response.status_code == 502
+        assert response.json()["error"] == "Search engine unavailable"
+
+
+class TestAsgiWebFetch:
+    @patch("zaatar.asgi.async_fetch", new_callable=AsyncMock)
+    def test_fetch_success(self, mock_fetch):
+        mock_fetch.return_value = FetchResponse(
+            url="https://example.com",
+            content="Hello world",
+            extract_mode="markdown",
+            content_length=11,
+        )
+        response = _get("/web_fetch?url=https://example.com")
+        assert response.status_code == 200
+        assert response.json()["content"] == "Hello world"
+
+    @patch("zaatar.asgi.async_fetch", new_callable=AsyncMock, side_effect=FetchError("not allowed"))
+    def test_fetch_invalid_scheme(self, _mock_fetch):
+        response = _get("/web_fetch?url=ftp://example.com")
+        assert response.status_code == 400
+
+
+class TestAsgiFallback:
+    def test_openapi_served_by_flask(self):
+        response = _get("/openapi/openapi.json")
+        assert response.status_code == 200
+        assert "/web_search" in response.json()["paths"]
@@ -0,0 +1,207 @@
+"""Backend pool routing and ejection tests."""
+
+import time
+
+import httpx
+import pytest
+
+from zaatar.clients.backends import LATENCY_MIN_SAMPLES, PROBE_INTERVAL, BackendPool, is_backend_error
+
+A = "http://ollama-a:11434"
+B = "http://ollama-b:11434"
+REQUEST = httpx.Request("POST", A)
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    response = httpx.Response(status, request=REQUEST)
+    return httpx.HTTPStatusError("error", request=REQUEST, response=response)
+
+
+def _fail(pool: BackendPool, exc: httpx.HTTPError) -> str:
+    with pytest.raises(type(exc)), pool.use() as backend:
+        raise exc
+    return backend.url
+
+
+class TestIsBackendError:
+    def test_transport_and_server_errors(self):
+        assert is_backend_error(httpx.ConnectError("refused"))
+        assert is_backend_error(httpx.ReadTimeout("slow"))
+        assert is_backend_error(_status_error(503))
+        assert is_backend_error(_status_error(404))
+
+    def test_client_errors_not_held_against_backend(self):
+        assert not is_backend_error(_status_error(400))
+
+
+class TestBackendPool:
+    def test_requires_backends(self):
+        with pytest.raises(ValueError, match="No backends"):
+            BackendPool("test", [])
+
+    def test_least_in_flight(self):
+        pool = BackendPool("test", [A, B])
+        with pool.use() as busy, pool.use() as idle:
+            # A backend with a request in flight loses to an idle one
+            assert idle.url != busy.url
+            with pool.use() as third:
+                assert pool.stats()[third.url]["in_flight"] == 2
+
+    def test_idle_backends_take_turns(self):
+        pool = BackendPool("test", [A, B])
+        urls = []
+        for _ in range(4):
+            with pool.use() as backend:
+                urls.append(backend.url)
+        assert urls == [A, B, A, B]
+
+    def test_only_ready_backends_routed(self):
+        pool = BackendPool("test", [A, B], start_ready=False)
+        # Until one is ready, all are used
+        with pool.use() as backend:
+            assert backend.url == A
+
+        pool.set_ready(pool.backends[1], True)
+        for _ in range(2):
+            with pool.use() as backend:
+                assert backend.url == B
+        assert pool.acquire_other({B}) is None
+        assert pool.stats()[A]["ready"] is False
+
+    def test_ejected_after_consecutive_errors(self):
+        pool = BackendPool("test", [A, B], eject_errors=2, eject_seconds=60)
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError), pool.use(pool.backends[0]):
+                raise httpx.ConnectError("refused")
+
+        stats = pool.stats()
+        assert stats[A]["ejected"] is True
+        assert stats[A]["errors_total"] == 2
+        for _ in range(3):
+            with pool.use() as backend:
+                assert backend.url == B
+
+    def test_success_clears_error_count(self):
+        pool = BackendPool("test", [A], eject_errors=2)
+        _fail(pool, httpx.ConnectError("refused"))
+        with pool.use():
+            pass
+        _fail(pool, httpx.ConnectError("refused"))
+
+        assert pool.stats()[A]["ejected"] is False
+        assert pool.stats()[A]["consecutive_errors"] == 1
+
+    def test_client_errors_do_not_eject(self):
+        pool = BackendPool("test", [A], eject_errors=1)
+        _fail(pool, _status_error(400))
+        assert pool.stats()[A]["ejected"] is False
+
+    def test_readmitted_after_ejection(self):
+        pool = BackendPool("test", [A, B], eject_errors=1, eject_seconds=0.05)
+        with pytest.raises(httpx.ConnectError), pool.use(pool.backends[0]):
+            raise httpx.ConnectError("refused")
+        with pool.use() as backend:
+            assert backend.url == B
+
+        time.sleep(0.06)
+        with pool.use() as backend:
+            assert backend.url == A
+
+    def test_all_ejected_uses_soonest_back(self):
+        pool = BackendPool("test", [A, B], eject_errors=1, eject_seconds=60)
+        for backend in pool.backends:
+            with pytest.raises(httpx.ConnectError), pool.use(backend):
+                raise httpx.ConnectError("refused")
+        with pool.use() as backend:
+            assert backend.url == A
+
+    def test_latency_tracked(self):
+        pool = BackendPool("test", [A])
+        with pool.use():
+            time.sleep(0.01)
+        stats = pool.stats()[A]
+        assert stats["latency_ewma_ms"] >= 10
+        assert stats["requests_total"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_acquire_other_skips_excluded_and_ejected(self):
+        pool = BackendPool("test", [A, B], eject_errors=1, eject_seconds=60)
+        backend = pool.acquire_other({A})
+        assert backend is not None
+        assert backend.url == B
+        with pool.track(backend):
+            pass
+
+        with pytest.raises(httpx.ConnectError), pool.use(pool.backends[1]):
+            raise httpx.ConnectError("refused")
+        assert pool.acquire_other({A}) is None
+
+    def test_abandoned_request_released_without_latency(self):
+        pool = BackendPool("test", [A])
+        with pytest.raises(KeyboardInterrupt), pool.use():
+            raise KeyboardInterrupt
+        stats = pool.stats()[A]
+        assert stats["in_flight"] == 0
+        assert stats["latency_ewma_ms"] is None
+        assert stats["errors_total"] == 0
+
+    def test_borrowed_request_not_held_against_backend(self):
+        pool = BackendPool("test", [A], eject_errors=1)
+        with pytest.raises(httpx.HTTPStatusError), pool.borrow():
+            raise _status_error(404)
+        stats = pool.stats()[A]
+        assert stats["in_flight"] == 0
+        assert stats["errors_total"] == 0
+        assert stats["ejected"] is False
+
+    def test_latency_percentile(self):
+        pool = BackendPool("test", [A])
+        assert pool.latency_percentile(0.95) is None
+        for _ in range(LATENCY_MIN_SAMPLES):
+            with pool.use():
+                pass
+        assert pool.latency_percentile(0.95) < 0.01
+
+    def test_after_fork_resets_counters(self):
+        pool = BackendPool("test", [A], eject_errors=1)
+        _fail(pool, httpx.ConnectError("refused"))
+
+        pool.after_fork()
+
+        assert pool.stats()[A]["requests_total"] == 0
+        assert pool.stats()[A]["ejected"] is False
+
+
+class TestLatencyAwareRouting:
+    def test_prefers_faster_backend(self):
+        pool = BackendPool("test", [A, B], latency_aware=True)
+        pool.backends[0].latency_ewma = 0.5
+        pool.backends[1].latency_ewma = 0.05
+        for _ in range(3):
+            with pool.use() as backend:
+                assert backend.url == B
+
+    def test_in_flight_weighs_against_latency(self):
+        pool = BackendPool("test", [A, B], latency_aware=True)
+        pool.backends[0].latency_ewma = 0.12
+        pool.backends[1].latency_ewma = 0.05
+        with pool.use() as first, pool.use() as second, pool.use() as third:
+            # B serves two requests at once (scores 0.05, 0.10) before A (0.12) is worth it
+            assert [first.url, second.url, third.url] == [B, B, A]
+
+    def test_unmeasured_backend_tried_first(self):
+        pool = BackendPool("test", [A, B], latency_aware=True)
+        pool.backends[0].latency_ewma = 0.05
+        with pool.use() as backend:
+            assert backend.url == B
+
+    def test_passed_over_backend_probed(self):
+        pool = BackendPool("test", [A, B], latency_aware=True)
+        pool.backends[0].latency_ewma = 5.0
+        pool.backends[1].latency_ewma = 0.05
+        urls = []
+        for _ in range(PROBE_INTERVAL + 1):
+            with pool.use() as backend:
+                urls.append(backend.url)
+            pool.backends[1].latency_ewma = 0.05
+        assert urls.count(A) == 1
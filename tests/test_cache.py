@@ -0,0 +1,77 @@
+"""TTL/LRU cache tests."""
+
+from unittest.mock import patch
+
+from zaatar.cache import CacheStatus, TTLCache
+
+
+class TestTTLCache:
+    def test_miss_then_hit(self):
+        cache = TTLCache(max_size=10)
+        assert cache.get("a") == (None, CacheStatus.MISS)
+        cache.set("a", 1, ttl=60)
+        assert cache.get("a") == (1, CacheStatus.HIT)
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    @patch("zaatar.cache.time.monotonic")
+    def test_expiry(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        cache = TTLCache(max_size=10)
+        cache.set("a", 1, ttl=60)
+        mock_monotonic.return_value = 61
+        assert cache.get("a") == (None, CacheStatus.MISS)
+        assert len(cache) == 0
+
+    @patch("zaatar.cache.time.monotonic")
+    def test_stale_window(self, mock_monotonic):
+        mock_monotonic.return_value = 0
+        cache = TTLCache(max_size=10, stale_ttl=30)
+        cache.set("a", 1, ttl=60)
+        mock_monotonic.return_value = 75
+        assert cache.get("a") == (1, CacheStatus.STALE)
+        mock_monotonic.return_value = 91
+        assert cache.get("a") == (None, CacheStatus.MISS)
+
+    def test_lru_eviction(self):
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+        assert cache.get("b") == (None, CacheStatus.MISS)
+        assert cache.get("a") == (1, CacheStatus.HIT)
+        assert cache.get("c") == (3, CacheStatus.HIT)
+
+    def test_byte_bound_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=10, max_bytes=10, sizeof=len)
+        cache.set("a", "aaaa", ttl=60)
+        cache.set("b", "bbbb", ttl=60)
+        cache.get("a")
+        cache.set("c", "cccc", ttl=60)
+        assert cache.get("b") == (None, CacheStatus.MISS)
+        assert cache.get("a") == ("aaaa", CacheStatus.HIT)
+        assert cache.bytes == 8
+
+    def test_oversized_value_not_cached(self):
+        cache = TTLCache(max_size=10, max_bytes=10, sizeof=len)
+        cache.set("a", "a" * 4, ttl=60)
+        cache.set("a", "a" * 11, ttl=60)
+        assert cache.get("a") == (None, CacheStatus.MISS)
+        assert cache.bytes == 0
+
+    def test_resize_after_value_grows(self):
+        cache = TTLCache(max_size=10, max_bytes=10, sizeof=len)
+        cache.set("a", ["x"] * 4, ttl=60)
+        cache.set("b", ["y"] * 4, ttl=60)
+        value, _status = cache.get("b")
+        value.extend(["y"] * 4)
+        cache.resize("b")
+        assert cache.get("a") == (None, CacheStatus.MISS)
+        assert cache.bytes == 8
+
+    def test_disabled(self):
+        cache = TTLCache(max_size=0)
+        cache.set("a", 1, ttl=60)
+        assert cache.enabled is False
+        assert cache.get("a") == (None, CacheStatus.MISS)
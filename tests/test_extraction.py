@@ -0,0 +1,98 @@
+"""Extraction process pool tests (these start real worker processes)."""
+
+import threading
+import time
+
+import pytest
+
+from zaatar.clients.extraction import ExtractionAbortedError, ExtractionError, ExtractionPool
+
+
+def _upper(text: str) -> str:
+    return text.upper()
+
+
+def _fail(text: str) -> str:
+    msg = f"cannot parse {text}"
+    raise ValueError(msg)
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.fixture
+def pool():
+    pool = ExtractionPool(workers=1, timeout=2)
+    yield pool
+    pool.close()
+
+
+class TestExtractionPool:
+    def test_inline_when_no_workers(self):
+        pool = ExtractionPool(workers=0)
+        assert pool.run(_upper, "abc") == "ABC"
+        assert pool.stats()["workers_started"] == 0
+
+    def test_inline_exception_is_reported(self):
+        pool = ExtractionPool(workers=0)
+        with pytest.raises(ExtractionError, match="ValueError: cannot parse x") as excinfo:
+            pool.run(_fail, "x")
+        assert not isinstance(excinfo.value, ExtractionAbortedError)
+
+    def test_runs_in_worker_and_reuses_it(self, pool):
+        assert pool.run(_upper, "abc") == "ABC"
+        assert pool.run(_upper, "def") == "DEF"
+        stats = pool.stats()
+        assert stats["completed"] == 2
+        assert stats["workers_started"] == 1
+        assert stats["restarts"] == 0
+
+    def test_worker_exception_is_reported(self, pool):
+        with pytest.raises(ExtractionError, match="ValueError: cannot parse x"):
+            pool.run(_fail, "x")
+        assert pool.stats()["failed"] == 1
+        # The worker survives an ordinary exception
+        assert pool.run(_upper, "ok") == "OK"
+        assert pool.stats()["restarts"] == 0
+
+    def test_timeout_kills_and_replaces_worker(self):
+        pool = ExtractionPool(workers=1, timeout=0.5)
+        try:
+            with pytest.raises(ExtractionAbortedError, match="timed out"):
+                pool.run(_sleep, 30)
+            stats = pool.stats()
+            assert stats["timeouts"] == 1
+            assert stats["restarts"] == 1
+            assert stats["workers_started"] == 0
+            assert pool.run(_upper, "next") == "NEXT"
+        finally:
+            pool.close()
+
+    def test_busy_worker_stopped_after_close(self, pool):
+        thread = threading.Thread(target=pool.run, args=(_sleep, 0.5))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while pool.stats()["active"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pool.close()
+        thread.join()
+        assert pool.stats()["workers_started"] == 0
+
+    def test_queue_depth(self, pool):
+        pool.run(_upper, "warm")
+        thread = threading.Thread(target=pool.run, args=(_sleep, 0.5))
+        thread.start()
+        deadline = time.monotonic() + 2
+        while pool.stats()["active"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        waiter = threading.Thread(target=pool.run, args=(_upper, "queued"))
+        waiter.start()
+        while pool.stats()["queued"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()["queued"] == 1
+        thread.join()
+        waiter.join()
+        assert pool.stats()["queued"] == 0
+        assert pool.stats()["completed"] == 3
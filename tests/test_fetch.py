@@ -4,7 +4,9 @@ from unittest.mock import patch
 
 import httpx
 
+from zaatar.clients.extraction import ExtractionAbortedError
 from zaatar.clients.fetcher import FetchError
+from zaatar.metrics import UPSTREAM_ERRORS
 from zaatar.models import FetchResponse
 
 
@@ -30,10 +32,22 @@ class TestWebFetchEndpoint:
 
     @patch("zaatar.routes.fetch.fetch", side_effect=FetchError("URL scheme 'ftp' not allowed"))
     def test_fetch_invalid_scheme(self, _mock_fetch, client):
+        before = UPSTREAM_ERRORS.value(upstream="fetcher", error="FetchError")
         response = client.get("/web_fetch?url=ftp://example.com")
         assert response.status_code == 400
         data = response.get_json()
         assert "error" in data
+        # A rejected request is not an upstream failure
+        assert UPSTREAM_ERRORS.value(upstream="fetcher", error="FetchError") == before
+
+    @patch(
+        "zaatar.routes.fetch.fetch",
+        side_effect=ExtractionAbortedError("Content extraction timed out after 10.0s"),
+    )
+    def test_fetch_extraction_timeout(self, _mock_fetch, client):
+        response = client.get("/web_fetch?url=https://example.com")
+        assert response.status_code == 504
+        assert response.get_json()["error"] == "Content extraction timed out after 10.0s"
 
     @patch("zaatar.routes.fetch.fetch", side_effect=httpx.ConnectError("connection refused"))
     def test_fetch_connection_error(self, _mock_fetch, client):
@@ -41,3 +55,42 @@ class TestWebFetchEndpoint:
         assert response.status_code == 502
         data = response.get_json()
         assert "error" in data
+
+
+class TestWebFetchBatch:
+    @patch("zaatar.routes.fetch.fetch_batch")
+    def test_batch_maps_outcomes(self, mock_fetch_batch, client):
+        request = httpx.Request("GET", "https://example.com/missing")
+        mock_fetch_batch.return_value = [
+            FetchResponse(url="https://example.com", content="Hello", extract_mode="markdown", content_length=5),
+            FetchError("URL scheme 'ftp' not allowed"),
+            httpx.HTTPStatusError("not found", request=request, response=httpx.Response(404, request=request)),
+            httpx.ConnectError("connection refused"),
+            ExtractionAbortedError("Content extraction worker died"),
+        ]
+        body = {
+            "queries": [
+                {"url": "https://example.com"},
+                {"url": "ftp://example.com"},
+                {"url": "https://example.com/missing"},
+                {"url": "https://down.example.com"},
+                {"url": "https://heavy.example.com"},
+            ]
+        }
+        before = {
+            error: UPSTREAM_ERRORS.value(upstream="fetcher", error=error) for error in ("FetchError", "ConnectError")
+        }
+        response = client.post("/web_fetch/batch", json=body)
+        assert response.status_code == 200
+        items = response.get_json()["results"]
+        assert items[0]["response"]["content"] == "Hello"
+        assert items[1]["status"] == 400
+        assert items[2] == {"status": 502, "error": "Upstream error: 404"}
+        assert items[3] == {"status": 502, "error": "Cannot connect to target URL"}
+        assert items[4] == {"status": 504, "error": "Content extraction worker died"}
+        assert UPSTREAM_ERRORS.value(upstream="fetcher", error="FetchError") == before["FetchError"]
+        assert UPSTREAM_ERRORS.value(upstream="fetcher", error="ConnectError") == before["ConnectError"] + 1
+
+    def test_batch_requires_queries(self, client):
+        response = client.post("/web_fetch/batch", json={"queries": []})
+        assert response.status_code == 422
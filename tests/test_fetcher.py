@@ -1,12 +1,36 @@
 """Fetcher client unit tests."""
 
-from unittest.mock import patch
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from unittest.mock import MagicMock, patch
 
+import html2text
 import httpx
 import pytest
+from readability import Document
 
-from zaatar.clients.fetcher import FetchError, _extract_content, _validate_url, fetch
-from zaatar.models import FetchQuery
+from zaatar.cache import CacheStatus
+from zaatar.clients.fetcher import (
+    CachedPage,
+    FetchError,
+    _byte_budget,
+    _extract_content,
+    _extract_prefix,
+    _freshness_lifetime,
+    _read_body,
+    _validate_url,
+    async_fetch,
+    async_fetch_within,
+    fetch,
+    fetch_batch,
+    fetch_cache,
+    fetch_within,
+)
+from zaatar.models import FetchQuery, FetchResponse
+from zaatar.settings import FETCH_MAX_BYTES, FETCH_MIN_BYTES
 
 SAMPLE_HTML = """
 <html>
@@ -48,17 +72,76 @@ class TestExtractContent:
         assert "Hello World" in content
         assert "test paragraph" in content
 
+    def test_lxml_markdown_mode(self):
+        content = _extract_content(SAMPLE_HTML, "lxml-markdown")
+        assert "# Hello World" in content
+        assert "[a link](https://example.com)" in content
+
+    def test_lxml_text_mode(self):
+        content = _extract_content(SAMPLE_HTML, "lxml-text")
+        assert "test paragraph with a link." in content
+        assert "https://example.com" not in content
+
+    def test_unknown_mode(self):
+        with pytest.raises(FetchError, match="Unsupported extract mode"):
+            _extract_content(SAMPLE_HTML, "pdf")
+
+
+LONG_HTML = (
+    "<html><body><article><h1>Title</h1>"
+    + "".join(
+        f"<p>Paragraph {i} with <a href='/r/{i}'>a link</a>, <em>emphasis</em>&nbsp;and enough words to wrap "
+        "past the html2text line width, so wrapping across chunk boundaries is exercised.</p>"
+        for i in range(60)
+    )
+    + "</article></body></html>"
+)
+
+
+class TestIncrementalExtraction:
+    @pytest.mark.parametrize("mode", ["markdown", "text", "lxml-markdown", "lxml-text"])
+    @patch("zaatar.clients.fetcher.HTML2TEXT_FEED_CHARS", 50)
+    def test_chunks_match_whole_document_conversion(self, mode):
+        if mode in ("markdown", "text"):
+            converter = html2text.HTML2Text()
+            if mode == "text":
+                converter.ignore_links = converter.ignore_images = converter.ignore_emphasis = True
+            expected = converter.handle(Document(LONG_HTML).summary()).strip()
+        else:
+            expected = _extract_content(LONG_HTML, mode)
+        assert _extract_content(LONG_HTML, mode) == expected
+
+    @pytest.mark.parametrize("mode", ["markdown", "lxml-markdown"])
+    @pytest.mark.parametrize("max_chars", [1, 100, 2000])
+    @patch("zaatar.clients.fetcher.HTML2TEXT_FEED_CHARS", 200)
+    def test_prefix_matches_full_extraction(self, mode, max_chars):
+        full = _extract_content(LONG_HTML, mode)
+        content, complete = _extract_prefix(LONG_HTML, mode, max_chars)
+        assert complete is False
+        assert len(content) < len(full)
+        assert content[:max_chars] == full[:max_chars]
+
+    def test_prefix_complete_when_budget_exceeds_content(self):
+        content, complete = _extract_prefix(SAMPLE_HTML, "markdown", 100_000)
+        assert complete is True
+        assert content == _extract_content(SAMPLE_HTML, "markdown")
+
+    def test_unlimited_budget(self):
+        content, complete = _extract_prefix(SAMPLE_HTML, "markdown", 0)
+        assert complete is True
+        assert content == _extract_content(SAMPLE_HTML, "markdown")
+
 
 class TestFetch:
-    @patch("zaatar.clients.fetcher.httpx.Client")
-    def test_fetch_success(self, mock_client_class):
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_fetch_success(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             text=SAMPLE_HTML,
             request=httpx.Request("GET", "https://example.com"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
-        mock_client.get.return_value = mock_response
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(mock_response)
 
         query = FetchQuery(url="https://example.com")
         result = fetch(query)
@@ -68,30 +151,30 @@ class TestFetch:
         assert result.content_length > 0
         assert "Hello World" in result.content
 
-    @patch("zaatar.clients.fetcher.httpx.Client")
-    def test_fetch_text_mode(self, mock_client_class):
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_fetch_text_mode(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             text=SAMPLE_HTML,
             request=httpx.Request("GET", "https://example.com"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
-        mock_client.get.return_value = mock_response
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(mock_response)
 
         query = FetchQuery(url="https://example.com", extractMode="text")
         result = fetch(query)
 
         assert result.extract_mode == "text"
 
-    @patch("zaatar.clients.fetcher.httpx.Client")
-    def test_fetch_max_chars(self, mock_client_class):
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_fetch_max_chars(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             text=SAMPLE_HTML,
             request=httpx.Request("GET", "https://example.com"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
-        mock_client.get.return_value = mock_response
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(mock_response)
 
         query = FetchQuery(url="https://example.com", maxChars=10)
         result = fetch(query)
@@ -102,3 +185,389 @@ class TestFetch:
         query = FetchQuery(url="ftp://example.com")
         with pytest.raises(FetchError, match="not allowed"):
             fetch(query)
+
+
+class TestFreshnessLifetime:
+    def test_max_age(self):
+        assert _freshness_lifetime(httpx.Headers({"cache-control": "public, max-age=300"})) == 300
+
+    def test_max_age_minus_age(self):
+        headers = httpx.Headers({"cache-control": "max-age=300", "age": "100"})
+        assert _freshness_lifetime(headers) == 200
+
+    def test_s_maxage_preferred(self):
+        headers = httpx.Headers({"cache-control": "max-age=300, s-maxage=60"})
+        assert _freshness_lifetime(headers) == 60
+
+    def test_no_store(self):
+        assert _freshness_lifetime(httpx.Headers({"cache-control": "no-store"})) is None
+
+    def test_no_cache(self):
+        assert _freshness_lifetime(httpx.Headers({"cache-control": "no-cache, max-age=300"})) == 0
+
+    def test_expires(self):
+        headers = httpx.Headers(
+            {"date": "Mon, 01 Jan 2024 00:00:00 GMT", "expires": "Mon, 01 Jan 2024 01:00:00 GMT"},
+        )
+        assert _freshness_lifetime(headers) == 3600
+
+    def test_invalid_expires(self):
+        assert _freshness_lifetime(httpx.Headers({"expires": "0"})) == 0
+
+    def test_last_modified_heuristic(self):
+        headers = httpx.Headers(
+            {"date": "Mon, 01 Jan 2024 10:00:00 GMT", "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+        )
+        assert _freshness_lifetime(headers) == 3600
+
+    def test_no_headers(self):
+        assert _freshness_lifetime(httpx.Headers()) == 0
+
+
+class TestFetchCache:
+    @patch("zaatar.clients.fetcher._extract_prefix", wraps=_extract_prefix)
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_fresh_hit_skips_download_and_extraction(self, mock_get_client, mock_extract):
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(
+            httpx.Response(
+                200,
+                text=SAMPLE_HTML,
+                headers={"cache-control": "max-age=300"},
+                request=httpx.Request("GET", "https://example.com"),
+            )
+        )
+
+        first = fetch(FetchQuery(url="https://example.com"))
+        second = fetch(FetchQuery(url="https://example.com"))
+
+        assert first.content == second.content
+        assert first._cache_status == CacheStatus.MISS
+        assert second._cache_status == CacheStatus.HIT
+        mock_client.stream.assert_called_once()
+        mock_extract.assert_called_once()
+
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_extracted_output_cached_per_mode(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(
+            httpx.Response(
+                200,
+                text=SAMPLE_HTML,
+                headers={"cache-control": "max-age=300"},
+                request=httpx.Request("GET", "https://example.com"),
+            )
+        )
+
+        fetch(FetchQuery(url="https://example.com", extractMode="markdown"))
+        result = fetch(FetchQuery(url="https://example.com", extractMode="text"))
+
+        assert result.extract_mode == "text"
+        assert "[a link]" not in result.content
+        page, _status = fetch_cache.get("https://example.com")
+        assert set(page.extracted) == {"markdown", "text"}
+        # The extracted text counts towards the cache's byte bound along with the body
+        assert fetch_cache.bytes == page.size > len(page.body)
+
+    @patch("zaatar.clients.fetcher._extract_prefix", wraps=_extract_prefix)
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_stale_entry_revalidated_with_304(self, mock_get_client, mock_extract):
+        mock_client = mock_get_client.return_value
+        request = httpx.Request("GET", "https://example.com")
+        mock_client.stream.side_effect = [
+            nullcontext(
+                httpx.Response(
+                    200,
+                    text=SAMPLE_HTML,
+                    headers={
+                        "cache-control": "no-cache",
+                        "etag": '"v1"',
+                        "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+                    },
+                    request=request,
+                )
+            ),
+            nullcontext(httpx.Response(304, headers={"cache-control": "max-age=60"}, request=request)),
+        ]
+
+        first = fetch(FetchQuery(url="https://example.com"))
+        second = fetch(FetchQuery(url="https://example.com"))
+
+        assert second.content == first.content
+        assert second._cache_status == CacheStatus.REVALIDATED
+        revalidation_headers = mock_client.stream.call_args_list[1][1]["headers"]
+        assert revalidation_headers["If-None-Match"] == '"v1"'
+        assert revalidation_headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        mock_extract.assert_called_once()
+        page, _status = fetch_cache.get("https://example.com")
+        assert page.is_fresh
+
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_no_store_not_cached(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(
+            httpx.Response(
+                200,
+                text=SAMPLE_HTML,
+                headers={"cache-control": "no-store"},
+                request=httpx.Request("GET", "https://example.com"),
+            )
+        )
+
+        fetch(FetchQuery(url="https://example.com"))
+        fetch(FetchQuery(url="https://example.com"))
+
+        assert mock_client.stream.call_count == 2
+        assert fetch_cache.get("https://example.com")[0] is None
+
+
+class TestAsyncFetch:
+    @patch("zaatar.clients.fetcher.get_async_client")
+    def test_async_fetch_success(self, mock_get_async_client):
+        mock_client = mock_get_async_client.return_value
+        mock_client.stream = MagicMock(
+            return_value=nullcontext(
+                httpx.Response(
+                    200,
+                    text=SAMPLE_HTML,
+                    request=httpx.Request("GET", "https://example.com"),
+                )
+            )
+        )
+
+        result = asyncio.run(async_fetch(FetchQuery(url="https://example.com", maxChars=10)))
+
+        assert result.content_length <= 10
+        assert "Hello" in result.content
+        mock_client.stream.assert_called_once()
+
+
+class TestFetchBatch:
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_batch_results_and_errors_in_order(self, mock_get_client):
+        def fake_stream(method, url, **_kwargs) -> nullcontext[httpx.Response]:
+            request = httpx.Request(method, url)
+            if "missing" in url:
+                return nullcontext(httpx.Response(404, request=request))
+            return nullcontext(httpx.Response(200, text=SAMPLE_HTML, request=request))
+
+        mock_get_client.return_value.stream.side_effect = fake_stream
+        queries = [
+            FetchQuery(url="https://a.example.com"),
+            FetchQuery(url="ftp://b.example.com"),
+            FetchQuery(url="https://c.example.com/missing"),
+            FetchQuery(url="https://d.example.com", extractMode="text"),
+        ]
+
+        results = fetch_batch(queries)
+
+        assert results[0].url == "https://a.example.com"
+        assert isinstance(results[1], FetchError)
+        assert isinstance(results[2], httpx.HTTPStatusError)
+        assert results[3].extract_mode == "text"
+
+    @patch("zaatar.clients.fetcher._get_page")
+    def test_batch_per_host_limit(self, mock_get_page):
+        lock = threading.Lock()
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+
+        def slow_get_page(url, _max_bytes) -> tuple[CachedPage, CacheStatus]:
+            host = url.split("/")[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.05)
+            with lock:
+                in_flight[host] -= 1
+            return CachedPage(body=SAMPLE_HTML, fresh_until=0), CacheStatus.MISS
+
+        mock_get_page.side_effect = slow_get_page
+        queries = [FetchQuery(url=f"https://same.example.com/{i}") for i in range(6)]
+        queries += [FetchQuery(url=f"https://other.example.com/{i}") for i in range(2)]
+
+        results = fetch_batch(queries, concurrency=8, per_host=2)
+
+        assert all(isinstance(r, FetchResponse) for r in results)
+        assert peak["same.example.com"] == 2
+        assert peak["other.example.com"] <= 2
+
+    @patch("zaatar.clients.fetcher._get_page")
+    def test_busy_host_does_not_hold_up_others(self, mock_get_page):
+        started = time.perf_counter()
+        finished: dict[str, float] = {}
+
+        def slow_get_page(url, _max_bytes) -> tuple[CachedPage, CacheStatus]:
+            time.sleep(0.2)
+            finished[url] = time.perf_counter() - started
+            return CachedPage(body=SAMPLE_HTML, fresh_until=0), CacheStatus.MISS
+
+        mock_get_page.side_effect = slow_get_page
+        queries = [FetchQuery(url=f"https://busy.example.com/{i}") for i in range(4)]
+        queries.append(FetchQuery(url="https://idle.example.com"))
+
+        fetch_batch(queries, concurrency=2, per_host=1)
+
+        # Downloads in the first round: one per host
+        assert finished["https://idle.example.com"] < 0.35
+
+
+class TestFetchWithin:
+    @staticmethod
+    def _get_page(url: str, _max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+        if "slow" in url:
+            time.sleep(1)
+        return CachedPage(body=SAMPLE_HTML, fresh_until=0), CacheStatus.MISS
+
+    @patch("zaatar.clients.fetcher._get_page")
+    def test_unfinished_fetches_time_out(self, mock_get_page):
+        mock_get_page.side_effect = self._get_page
+        queries = [
+            FetchQuery(url="https://slow.example.com"),
+            FetchQuery(url="https://fast.example.com"),
+            FetchQuery(url="ftp://bad.example.com"),
+        ]
+
+        started = time.perf_counter()
+        results = fetch_within(queries, budget=0.2)
+
+        assert time.perf_counter() - started < 0.5
+        assert isinstance(results[0], TimeoutError)
+        assert "Hello World" in results[1].content
+        assert isinstance(results[2], FetchError)
+
+    @patch("zaatar.clients.fetcher._get_page")
+    def test_fetches_not_started_by_deadline_cancelled(self, mock_get_page):
+        mock_get_page.side_effect = self._get_page
+        executor = ThreadPoolExecutor(max_workers=1)
+        queries = [FetchQuery(url="https://slow.example.org"), FetchQuery(url="https://queued.example.org")]
+
+        with patch("zaatar.clients.fetcher._within_executor", executor):
+            results = fetch_within(queries, budget=0.2)
+        executor.shutdown(wait=True)
+
+        assert all(isinstance(r, TimeoutError) for r in results)
+        mock_get_page.assert_called_once()
+
+    @patch("zaatar.clients.fetcher._async_get_page")
+    def test_async_unfinished_fetches_cancelled(self, mock_get_page):
+        async def get_page(url: str, _max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+            if "slow" in url:
+                await asyncio.sleep(1)
+            return CachedPage(body=SAMPLE_HTML, fresh_until=0), CacheStatus.MISS
+
+        mock_get_page.side_effect = get_page
+        queries = [FetchQuery(url="https://slow.example.com"), FetchQuery(url="https://fast.example.com")]
+
+        started = time.perf_counter()
+        results = asyncio.run(async_fetch_within(queries, budget=0.2))
+
+        assert time.perf_counter() - started < 0.5
+        assert isinstance(results[0], TimeoutError)
+        assert "Hello World" in results[1].content
+
+    @patch("zaatar.clients.fetcher._async_get_page")
+    def test_async_base_exception_propagates(self, mock_get_page):
+        class Abort(BaseException):
+            pass
+
+        mock_get_page.side_effect = Abort
+
+        with pytest.raises(Abort):
+            asyncio.run(async_fetch_within([FetchQuery(url="https://example.com")], budget=1))
+
+
+class TestStreamingDownload:
+    def test_byte_budget_bounds(self):
+        assert _byte_budget(0) == FETCH_MAX_BYTES
+        assert _byte_budget(10) == FETCH_MIN_BYTES
+        assert _byte_budget(10**9) == FETCH_MAX_BYTES
+
+    def test_read_body_stops_at_budget(self):
+        response = httpx.Response(200, content=iter([b"a" * 10, b"b" * 10, b"c" * 10]))
+        text, bytes_read, truncated = _read_body(response, max_bytes=15)
+        assert text == "a" * 10 + "b" * 5
+        assert bytes_read == 15
+        assert truncated is True
+
+    def test_read_body_exact_fit_not_truncated(self):
+        response = httpx.Response(200, content=iter([b"a" * 10, b"b" * 10]))
+        text, bytes_read, truncated = _read_body(response, max_bytes=20)
+        assert len(text) == 20
+        assert bytes_read == 20
+        assert truncated is False
+
+    def test_read_body_replaces_split_character(self):
+        response = httpx.Response(200, content="héllo".encode(), headers={"content-type": "text/html; charset=utf-8"})
+        text, _bytes_read, truncated = _read_body(response, max_bytes=2)
+        assert text == "h�"
+        assert truncated is True
+
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_non_text_content_rejected_before_body(self, mock_get_client):
+        body = MagicMock()
+        response = httpx.Response(
+            200,
+            headers={"content-type": "application/pdf"},
+            content=body,
+            request=httpx.Request("GET", "https://example.com/file.pdf"),
+        )
+        mock_get_client.return_value.stream.return_value = nullcontext(response)
+
+        with pytest.raises(FetchError, match="Unsupported content type"):
+            fetch(FetchQuery(url="https://example.com/file.pdf"))
+        body.__iter__.assert_not_called()
+
+    @patch("zaatar.clients.fetcher.FETCH_MIN_BYTES", 100)
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_truncation_metadata_and_refetch_for_larger_budget(self, mock_get_client):
+        html = "<html><body><article><p>" + "word " * 200 + "</p></article></body></html>"
+        mock_client = mock_get_client.return_value
+        mock_client.stream.side_effect = lambda method, url, **_kwargs: nullcontext(
+            httpx.Response(
+                200,
+                text=html,
+                headers={"content-type": "text/html", "cache-control": "max-age=300"},
+                request=httpx.Request(method, url),
+            )
+        )
+
+        small = fetch(FetchQuery(url="https://example.com", maxChars=10))
+        assert small.truncated is True
+        assert small.bytes_read == 160
+        cached = fetch(FetchQuery(url="https://example.com", maxChars=10))
+        assert cached._cache_status == CacheStatus.HIT
+
+        full = fetch(FetchQuery(url="https://example.com", maxChars=0))
+        assert full.truncated is False
+        assert full.bytes_read == len(html)
+        assert mock_client.stream.call_count == 2
+
+    @patch("zaatar.clients.fetcher._extract_prefix", wraps=_extract_prefix)
+    @patch("zaatar.clients.fetcher.get_client")
+    def test_partial_extraction_cached_per_budget(self, mock_get_client, mock_extract):
+        mock_client = mock_get_client.return_value
+        mock_client.stream.return_value = nullcontext(
+            httpx.Response(
+                200,
+                text=LONG_HTML,
+                headers={"content-type": "text/html", "cache-control": "max-age=300"},
+                request=httpx.Request("GET", "https://example.com"),
+            )
+        )
+        full_content = _extract_content(LONG_HTML, "lxml-markdown")
+
+        small = fetch(FetchQuery(url="https://example.com", extractMode="lxml-markdown", maxChars=500))
+        smaller = fetch(FetchQuery(url="https://example.com", extractMode="lxml-markdown", maxChars=100))
+        assert mock_extract.call_count == 1
+        page, _status = fetch_cache.get("https://example.com")
+        assert "lxml-markdown" in page.partial
+        assert "lxml-markdown" not in page.extracted
+
+        full = fetch(FetchQuery(url="https://example.com", extractMode="lxml-markdown", maxChars=0))
+        assert mock_extract.call_count == 2
+        assert page.extracted["lxml-markdown"] == full_content
+        assert "lxml-markdown" not in page.partial
+        assert small.content == full_content[:500]
+        assert smaller.content == full_content[:100]
+        assert full.content == full_content
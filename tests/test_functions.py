@@ -0,0 +1,11 @@
+"""Utility function unit tests."""
+
+from zaatar.functions import canonical_url
+
+
+class TestCanonicalUrl:
+    def test_variants_match(self):
+        assert canonical_url("https://www.Example.com/a/") == canonical_url("http://example.com/a#top")
+
+    def test_query_kept(self):
+        assert canonical_url("https://example.com/a?x=1") != canonical_url("https://example.com/a?x=2")
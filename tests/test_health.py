@@ -0,0 +1,32 @@
+"""/health endpoint tests."""
+
+from unittest.mock import patch
+
+from zaatar.warmup import ModelState, ModelWarmer
+
+
+def _warmer(state: ModelState) -> ModelWarmer:
+    warmer = ModelWarmer("gemma3:4b")
+    warmer.state = state
+    return warmer
+
+
+class TestHealthEndpoint:
+    @patch("zaatar.routes.health.model_warmer", _warmer(ModelState.PULLING))
+    def test_live_while_model_pulls(self, client):
+        response = client.get("/health")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["summarization_ready"] is False
+        assert data["summarization"]["state"] == "pulling"
+
+    @patch("zaatar.routes.health.model_warmer", _warmer(ModelState.PULLING))
+    def test_not_ready_while_model_pulls(self, client):
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+
+    @patch("zaatar.routes.health.model_warmer", _warmer(ModelState.READY))
+    def test_ready(self, client):
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.get_json()["summarization"]["model"] == "gemma3:4b"
@@ -0,0 +1,121 @@
+"""Background job queue tests."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from zaatar.jobs import JobError, JobQueue, JobStatus, QueueFullError, defer_summary, summary_jobs
+
+
+def _make_queue(**kwargs) -> JobQueue:
+    options = {"name": "test", "workers": 1, "max_queued": 4, "result_ttl": 60, "max_size": 16}
+    options.update(kwargs)
+    return JobQueue(**options)
+
+
+def _fail_with_message() -> str:
+    msg = "Friendly message"
+    raise JobError(msg)
+
+
+def _crash() -> str:
+    msg = "boom"
+    raise RuntimeError(msg)
+
+
+class TestJobQueue:
+    def test_job_runs_and_result_is_kept(self):
+        jobs = _make_queue()
+        job = jobs.submit(str.upper, "done")
+        assert job.wait(5)
+        assert job.status == JobStatus.DONE
+        assert job.result == "DONE"
+        assert jobs.get(job.id) is job
+        assert jobs.stats()["completed"] == 1
+
+    def test_job_error_message(self):
+        jobs = _make_queue()
+        job = jobs.submit(_fail_with_message)
+        assert job.wait(5)
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Friendly message"
+
+    def test_unexpected_exception(self):
+        jobs = _make_queue()
+        job = jobs.submit(_crash)
+        assert job.wait(5)
+        assert job.error == "Job failed: RuntimeError"
+        assert jobs.stats()["failed"] == 1
+
+    def test_queue_full(self):
+        jobs = _make_queue(max_queued=1)
+        release = threading.Event()
+        blocking = jobs.submit(release.wait, 5)
+        deadline = time.monotonic() + 5
+        while jobs.stats()["running"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        jobs.submit(str.upper, "queued")
+        with pytest.raises(QueueFullError):
+            jobs.submit(str.upper, "rejected")
+        assert jobs.stats()["rejected"] == 1
+        release.set()
+        assert blocking.wait(5)
+
+    def test_finished_job_expires(self):
+        jobs = _make_queue(result_ttl=0.05)
+        job = jobs.submit(str.upper, "x")
+        assert job.wait(5)
+        time.sleep(0.1)
+        assert jobs.get(job.id) is None
+
+    def test_unknown_job(self):
+        assert _make_queue().get("missing") is None
+
+    def test_waiters_bounded(self):
+        jobs = _make_queue(max_waiters=1)
+        release = threading.Event()
+        job = jobs.submit(release.wait, 5)
+        waiter = threading.Thread(target=jobs.wait, args=(job, 5))
+        waiter.start()
+        deadline = time.monotonic() + 5
+        while jobs.stats()["waiting"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        started = time.monotonic()
+        assert jobs.wait(job, 5) is False
+        assert time.monotonic() - started < 1
+        release.set()
+        waiter.join()
+        assert jobs.wait(job, 5) is True
+        assert jobs.stats()["waiting"] == 0
+
+
+RESULTS = [{"title": "A", "url": "https://a.example", "description": "a"}]
+
+
+class TestDeferSummary:
+    @patch("zaatar.jobs.summarize", return_value="Deferred summary.")
+    def test_queues_summary(self, _mock_summarize):
+        summary, summary_id = defer_summary("query", RESULTS)
+        assert summary is None
+        assert summary_id is not None
+
+    @patch("zaatar.jobs.cached_summary", return_value="Cached summary.")
+    @patch("zaatar.jobs.summarize")
+    def test_cached_summary_returned_inline(self, mock_summarize, _mock_cached):
+        assert defer_summary("query", RESULTS) == ("Cached summary.", None)
+        mock_summarize.assert_not_called()
+
+    @patch("zaatar.jobs.summary_jobs.submit", side_effect=QueueFullError("full"))
+    def test_queue_full_returns_no_summary(self, _mock_submit):
+        assert defer_summary("query", RESULTS) == (None, None)
+
+    @patch("zaatar.jobs.summarize", side_effect=httpx.ConnectError("connection refused"))
+    def test_ollama_error_message(self, _mock_summarize):
+        _summary, summary_id = defer_summary("query", RESULTS)
+        job = summary_jobs.get(summary_id)
+        assert job.wait(5)
+        assert job.error == "Summarization service unavailable"
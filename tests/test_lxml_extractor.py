@@ -0,0 +1,71 @@
+"""Single-pass lxml extraction engine tests."""
+
+from zaatar.clients.lxml_extractor import extract, iter_blocks, iter_chunks
+
+ARTICLE_HTML = """
+<html>
+<head><title>Page</title><script>var tracking = 1;</script><style>p { color: red; }</style></head>
+<body>
+<nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<div id="main" class="article-content">
+<h1>Main Title</h1>
+<p>The first paragraph has <strong>bold</strong> text, <em>emphasis</em>, and <a href="https://x.test">a link</a>.</p>
+<p>The second paragraph is long enough to score, with commas, clauses, and detail.<br>After a break.</p>
+<ul><li>One</li><li>Two<ul><li>Nested</li></ul></li></ul>
+<ol><li>First</li><li>Second</li></ol>
+<pre>line one
+  line two</pre>
+<blockquote><p>Quoted paragraph that matters here.</p></blockquote>
+<img src="/pic.png" alt="Picture">
+</div>
+<div class="sidebar"><p>Sidebar text that is long enough to be scored as a paragraph, though.</p></div>
+<footer>Copyright</footer>
+</body>
+</html>
+"""
+
+
+class TestLxmlExtractor:
+    def test_markdown(self):
+        content = extract(ARTICLE_HTML)
+        assert content.startswith("# Main Title")
+        assert "The first paragraph has **bold** text, _emphasis_, and [a link](https://x.test)." in content
+        assert "with commas, clauses, and detail.\nAfter a break." in content
+        assert "  * One\n  * Two\n    * Nested" in content
+        assert "  1. First\n  2. Second" in content
+        assert "    line one\n      line two" in content
+        assert "> Quoted paragraph that matters here." in content
+        assert "![Picture](/pic.png)" in content
+
+    def test_boilerplate_removed(self):
+        content = extract(ARTICLE_HTML)
+        assert "tracking" not in content
+        assert "color" not in content
+        assert "Home" not in content
+        assert "Sidebar" not in content
+        assert "Copyright" not in content
+
+    def test_text_only(self):
+        content = extract(ARTICLE_HTML, text_only=True)
+        assert "The first paragraph has bold text, emphasis, and a link." in content
+        assert "https://x.test" not in content
+        assert "Picture" not in content
+
+    def test_blocks_in_document_order(self):
+        blocks = list(iter_blocks(ARTICLE_HTML))
+        assert blocks[0] == "# Main Title"
+        assert blocks[1].startswith("The first paragraph")
+
+    def test_chunks_join_to_extract(self):
+        chunks = list(iter_chunks(ARTICLE_HTML))
+        assert len(chunks) > 1
+        assert "".join(chunks) == extract(ARTICLE_HTML)
+
+    def test_page_without_paragraphs_uses_body(self):
+        assert extract("<html><body><div>Just a short line</div></body></html>") == "Just a short line"
+
+    def test_xml_declaration(self):
+        html = (
+            '<?xml version="1.0" encoding="utf-8"?><html><body><p>Declared encoding page text here.</p></body></html>'
+        )
+        assert extract(html) == "Declared encoding page text here."
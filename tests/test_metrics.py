@@ -0,0 +1,144 @@
+"""Metrics registry and /metrics endpoint tests."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from zaatar.clients.fetcher import CachedPage, _page_content
+from zaatar.clients.ollama import summarize
+from zaatar.clients.searxng import search
+from zaatar.metrics import (
+    EXTRACTION_CPU_SECONDS,
+    OLLAMA_PROMPT_TOKENS,
+    REQUEST_SECONDS,
+    SEARXNG_SECONDS,
+    UPSTREAM_ERRORS,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+)
+from zaatar.models import SearchQuery
+
+
+class TestMetricTypes:
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = Histogram("test_seconds", "Test latency.", (0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        assert histogram.render().splitlines() == [
+            "# HELP test_seconds Test latency.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            "test_seconds_sum 5.55",
+            "test_seconds_count 3",
+        ]
+
+    def test_bucket_bound_is_inclusive(self):
+        histogram = Histogram("test_bound", "Test.", (1,))
+        histogram.observe(1)
+        assert 'test_bound_bucket{le="1"} 1' in histogram.render()
+
+    def test_labelled_series(self):
+        histogram = Histogram("test_labelled", "Test.", (1,), labelnames=("route",))
+        assert "test_labelled_count" not in histogram.render()
+
+        histogram.observe(0.5, route="/a")
+        histogram.observe(0.5, route="/b")
+
+        rendered = histogram.render()
+        assert 'test_labelled_bucket{route="/a",le="1"} 1' in rendered
+        assert 'test_labelled_count{route="/b"} 1' in rendered
+        assert histogram.count(route="/a") == 1
+
+    def test_counter_escapes_label_values(self):
+        counter = Counter("test_total", "Test.", labelnames=("error",))
+        counter.inc(error='bad "quote"\n')
+        counter.inc(error='bad "quote"\n')
+        assert 'test_total{error="bad \\"quote\\"\\n"} 2' in counter.render()
+
+    def test_unlabelled_counter_starts_at_zero(self):
+        assert "test_zero 0" in Counter("test_zero", "Test.").render()
+
+    def test_labels_must_match(self):
+        counter = Counter("test_labels", "Test.", labelnames=("upstream",))
+        with pytest.raises(ValueError, match="expects labels"):
+            counter.inc(route="/a")
+
+    def test_time_observes_on_error(self):
+        histogram = Histogram("test_time", "Test.", (1,))
+        with pytest.raises(RuntimeError), histogram.time():
+            raise RuntimeError
+        assert histogram.count() == 1
+
+    def test_duplicate_name_rejected(self):
+        metrics = MetricsRegistry()
+        metrics.register(Counter("test_dup", "Test."))
+        with pytest.raises(ValueError, match="already registered"):
+            metrics.register(Counter("test_dup", "Test."))
+
+
+class TestMetricsEndpoint:
+    def test_prometheus_text_format(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+        body = response.get_data(as_text=True)
+        for name in (
+            "zaatar_request_duration_seconds",
+            "zaatar_searxng_request_duration_seconds",
+            "zaatar_ollama_request_duration_seconds",
+            "zaatar_ollama_prompt_tokens",
+            "zaatar_fetch_download_bytes",
+            "zaatar_extraction_cpu_seconds",
+            "zaatar_upstream_errors_total",
+        ):
+            assert f"# TYPE {name} " in body
+
+    def test_route_latency_recorded_by_rule(self, client):
+        before = REQUEST_SECONDS.count(route="/status", method="GET", status="200")
+        client.get("/status")
+        assert REQUEST_SECONDS.count(route="/status", method="GET", status="200") == before + 1
+
+    def test_unmatched_paths_share_one_series(self, client):
+        before = REQUEST_SECONDS.count(route="unmatched", method="GET", status="404")
+        client.get("/no-such-path-1")
+        client.get("/no-such-path-2")
+        assert REQUEST_SECONDS.count(route="unmatched", method="GET", status="404") == before + 2
+
+    @patch("zaatar.routes.search.search", side_effect=httpx.ConnectError("connection refused"))
+    def test_upstream_errors_counted(self, _mock_search, client):
+        before = UPSTREAM_ERRORS.value(upstream="searxng", error="ConnectError")
+        client.get("/web_search?query=test")
+        assert UPSTREAM_ERRORS.value(upstream="searxng", error="ConnectError") == before + 1
+
+
+class TestStageMetrics:
+    @patch("zaatar.clients.searxng.get_client")
+    def test_searxng_latency(self, mock_get_client):
+        mock_get_client.return_value.get.return_value = httpx.Response(
+            200, json={"results": []}, request=httpx.Request("GET", "http://test")
+        )
+        before = SEARXNG_SECONDS.count()
+        search(SearchQuery(query="metrics"))
+        assert SEARXNG_SECONDS.count() == before + 1
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_ollama_token_counts(self, mock_get_client):
+        mock_get_client.return_value.post.return_value = httpx.Response(
+            200,
+            json={"response": "Summary", "prompt_eval_count": 120, "eval_count": 30},
+            request=httpx.Request("POST", "http://test"),
+        )
+        before = OLLAMA_PROMPT_TOKENS.count()
+        summarize("metrics", [{"title": "T", "url": "https://example.com", "description": "d"}])
+        assert OLLAMA_PROMPT_TOKENS.count() == before + 1
+
+    def test_extraction_cpu_time(self):
+        before = EXTRACTION_CPU_SECONDS.count(mode="text")
+        _page_content(CachedPage(body="<html><body><p>Hello metrics</p></body></html>", fresh_until=0), "text", 0)
+        assert EXTRACTION_CPU_SECONDS.count(mode="text") == before + 1
@@ -34,7 +34,7 @@ class TestSearchQuery:
             SearchQuery(query="test", count=0)
 
         with pytest.raises(ValidationError):
-            SearchQuery(query="test", count=11)
+            SearchQuery(query="test", count=51)
 
     def test_query_required(self):
         with pytest.raises(ValidationError):
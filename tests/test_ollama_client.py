@@ -1,66 +1,81 @@
 """Ollama client unit tests."""
 
-from unittest.mock import patch
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
 
-from zaatar.clients.ollama import _is_model_available, pull_model, summarize
+from zaatar.admission import AdmissionGate, AdmissionRejectedError
+from zaatar.cache import PersistentCache
+from zaatar.clients.backends import BackendPool
+from zaatar.clients.ollama import (
+    _is_model_available,
+    _summary_cache_key,
+    async_summarize,
+    pull_model,
+    summarize,
+    summarize_stream,
+    warm_model,
+)
+from zaatar.semantic import SemanticIndex
 
 
 class TestIsModelAvailable:
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_model_found(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_model_found(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"models": [{"model": "gemma3:4b"}, {"model": "mistral:7b"}]},
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
-        assert _is_model_available("gemma3:4b") is True
+        assert _is_model_available("gemma3:4b", "http://localhost:11434") is True
 
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_model_not_found(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_model_not_found(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"models": [{"model": "mistral:7b"}]},
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
-        assert _is_model_available("gemma3:4b") is False
+        assert _is_model_available("gemma3:4b", "http://localhost:11434") is False
 
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_no_models(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_no_models(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"models": []},
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
-        assert _is_model_available("gemma3:4b") is False
+        assert _is_model_available("gemma3:4b", "http://localhost:11434") is False
 
 
 class TestPullModel:
     @patch("zaatar.clients.ollama._is_model_available", return_value=True)
     def test_pull_skipped_when_available(self, mock_available):
         pull_model("gemma3:4b")
-        mock_available.assert_called_once_with("gemma3:4b")
+        mock_available.assert_called_once_with("gemma3:4b", "http://localhost:11434")
 
-    @patch("zaatar.clients.ollama.httpx.Client")
+    @patch("zaatar.clients.ollama.get_client")
     @patch("zaatar.clients.ollama._is_model_available", return_value=False)
-    def test_pull_model_when_not_available(self, _mock_available, mock_client_class):
+    def test_pull_model_when_not_available(self, _mock_available, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"status": "success"},
             request=httpx.Request("POST", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.post.return_value = mock_response
 
         pull_model("gemma3:4b")
@@ -70,9 +85,9 @@ class TestPullModel:
         assert call_kwargs[1]["json"]["model"] == "gemma3:4b"
         assert call_kwargs[1]["json"]["stream"] is False
 
-    @patch("zaatar.clients.ollama.httpx.Client")
+    @patch("zaatar.clients.ollama.get_client")
     @patch("zaatar.clients.ollama._is_model_available", return_value=False)
-    def test_pull_model_http_error(self, _mock_available, mock_client_class):
+    def test_pull_model_http_error(self, _mock_available, mock_get_client):
         mock_response = httpx.Response(
             500,
             json={"error": "internal error"},
@@ -81,22 +96,36 @@ class TestPullModel:
         mock_response.raise_for_status = lambda: (_ for _ in ()).throw(
             httpx.HTTPStatusError("error", request=mock_response.request, response=mock_response)
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.post.return_value = mock_response
 
         with pytest.raises(httpx.HTTPStatusError):
             pull_model("bad-model")
 
 
+class TestWarmModel:
+    @patch("zaatar.clients.ollama.get_client")
+    def test_warm_model_loads_with_keep_alive(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.post.return_value = httpx.Response(
+            200, json={"done": True, "done_reason": "load"}, request=httpx.Request("POST", "http://test")
+        )
+
+        warm_model("gemma3:4b")
+
+        payload = mock_client.post.call_args[1]["json"]
+        assert payload == {"model": "gemma3:4b", "keep_alive": "30m", "options": {"num_ctx": 4096}}
+
+
 class TestSummarize:
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_summarize_success(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_summarize_success(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"response": "Python is a programming language used for web development."},
             request=httpx.Request("POST", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.post.return_value = mock_response
 
         results = [
@@ -111,16 +140,18 @@ class TestSummarize:
         payload = call_kwargs[1]["json"]
         assert payload["model"] == "gemma3:4b"
         assert payload["stream"] is False
+        assert payload["keep_alive"] == "30m"
+        assert payload["options"] == {"num_ctx": 4096, "num_predict": 512}
         assert "python web development" in payload["prompt"]
 
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_summarize_empty_response(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_summarize_empty_response(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"response": ""},
             request=httpx.Request("POST", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.post.return_value = mock_response
 
         results = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
@@ -128,14 +159,14 @@ class TestSummarize:
 
         assert summary == ""
 
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_summarize_custom_model(self, mock_client_class):
+    @patch("zaatar.clients.ollama.get_client")
+    def test_summarize_custom_model(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"response": "Summary text"},
             request=httpx.Request("POST", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.post.return_value = mock_response
 
         results = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
@@ -144,11 +175,340 @@ class TestSummarize:
         call_kwargs = mock_client.post.call_args
         assert call_kwargs[1]["json"]["model"] == "mistral:7b"
 
-    @patch("zaatar.clients.ollama.httpx.Client")
-    def test_summarize_connect_error(self, mock_client_class):
-        mock_client = mock_client_class.return_value.__enter__.return_value
+    @patch("zaatar.clients.ollama.get_client")
+    def test_summarize_connect_error(self, mock_get_client):
+        mock_client = mock_get_client.return_value
         mock_client.post.side_effect = httpx.ConnectError("connection refused")
 
         results = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
         with pytest.raises(httpx.ConnectError):
             summarize("test", results)
+
+
+class TestBackendRouting:
+    RESULTS = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
+    BACKENDS = ["http://ollama-a:11434", "http://ollama-b:11434"]
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_concurrent_summaries_spread_across_backends(self, mock_get_client):
+        def slow_post(*_args, **_kwargs) -> httpx.Response:
+            time.sleep(0.2)
+            return httpx.Response(200, json={"response": "Summary"}, request=httpx.Request("POST", "http://test"))
+
+        mock_client = mock_get_client.return_value
+        mock_client.post.side_effect = slow_post
+        pool = BackendPool("ollama", self.BACKENDS)
+        with patch("zaatar.clients.ollama.ollama_backends", pool), ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda i: summarize(f"query {i}", self.RESULTS), range(2)))
+
+        urls = sorted(call.args[0] for call in mock_client.post.call_args_list)
+        assert urls == [f"{url}/api/generate" for url in self.BACKENDS]
+        assert all(stats["requests_total"] == 1 for stats in pool.stats().values())
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_failing_backend_ejected(self, mock_get_client):
+        def post(url: str, **_kwargs) -> httpx.Response:
+            if url.startswith(self.BACKENDS[0]):
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json={"response": "Summary"}, request=httpx.Request("POST", url))
+
+        mock_get_client.return_value.post.side_effect = post
+        pool = BackendPool("ollama", self.BACKENDS, eject_errors=1, eject_seconds=60)
+        with patch("zaatar.clients.ollama.ollama_backends", pool):
+            with pytest.raises(httpx.ConnectError):
+                summarize("first", self.RESULTS)
+            assert summarize("second", self.RESULTS) == "Summary"
+            assert summarize("third", self.RESULTS) == "Summary"
+
+        stats = pool.stats()
+        assert stats[self.BACKENDS[0]]["ejected"] is True
+        assert stats[self.BACKENDS[1]]["requests_total"] == 2
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_warm_model_tolerates_one_backend_down(self, mock_get_client):
+        def post(url: str, **_kwargs) -> httpx.Response:
+            if url.startswith(self.BACKENDS[0]):
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json={"done": True}, request=httpx.Request("POST", url))
+
+        mock_get_client.return_value.post.side_effect = post
+        with patch("zaatar.clients.ollama.ollama_backends", BackendPool("ollama", self.BACKENDS)):
+            warm_model("gemma3:4b")
+
+        assert mock_get_client.return_value.post.call_count == 2
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_warm_model_fails_when_all_backends_down(self, mock_get_client):
+        mock_get_client.return_value.post.side_effect = httpx.ConnectError("connection refused")
+        with (
+            patch("zaatar.clients.ollama.ollama_backends", BackendPool("ollama", self.BACKENDS)),
+            pytest.raises(httpx.ConnectError),
+        ):
+            warm_model("gemma3:4b")
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_backend_routed_once_its_pull_succeeds(self, mock_get_client):
+        def get(url: str, **_kwargs) -> httpx.Response:
+            request = httpx.Request("GET", url)
+            if url.startswith(self.BACKENDS[0]):
+                return httpx.Response(503, request=request)
+            return httpx.Response(200, json={"models": [{"model": "gemma3:4b"}]}, request=request)
+
+        def post(url: str, **_kwargs) -> httpx.Response:
+            return httpx.Response(200, json={"response": "Summary"}, request=httpx.Request("POST", url))
+
+        mock_client = mock_get_client.return_value
+        mock_client.get.side_effect = get
+        mock_client.post.side_effect = post
+        pool = BackendPool("ollama", self.BACKENDS, start_ready=False)
+        with patch("zaatar.clients.ollama.ollama_backends", pool):
+            pull_model("gemma3:4b")
+            summarize("first", self.RESULTS)
+            summarize("second", self.RESULTS)
+
+        generate_urls = [call.args[0] for call in mock_client.post.call_args_list]
+        assert generate_urls == [f"{self.BACKENDS[1]}/api/generate"] * 2
+        stats = pool.stats()
+        assert stats[self.BACKENDS[0]]["ready"] is False
+        # Pulls are not routed requests
+        assert stats[self.BACKENDS[0]]["requests_total"] == 0
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_warm_pulls_again_on_unready_backend(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.get.return_value = httpx.Response(
+            200, json={"models": [{"model": "gemma3:4b"}]}, request=httpx.Request("GET", "http://test")
+        )
+        mock_client.post.return_value = httpx.Response(200, json={"done": True}, request=httpx.Request("POST", "x"))
+        pool = BackendPool("ollama", self.BACKENDS[:1], start_ready=False)
+        with patch("zaatar.clients.ollama.ollama_backends", pool):
+            warm_model("gemma3:4b")
+
+        mock_client.get.assert_called_once_with(f"{self.BACKENDS[0]}/api/tags")
+        assert pool.stats()[self.BACKENDS[0]]["ready"] is True
+
+    @patch("zaatar.clients.ollama._is_model_available", return_value=True)
+    def test_pull_checks_every_backend(self, mock_available):
+        with patch("zaatar.clients.ollama.ollama_backends", BackendPool("ollama", self.BACKENDS)):
+            pull_model("gemma3:4b")
+
+        assert [call.args[1] for call in mock_available.call_args_list] == self.BACKENDS
+
+
+class TestSummaryCache:
+    RESULTS = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_repeat_summary_served_from_cache(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.post.return_value = httpx.Response(
+            200,
+            json={"response": "Cached summary"},
+            request=httpx.Request("POST", "http://test"),
+        )
+
+        first = summarize("Test  Query", self.RESULTS)
+        second = summarize("test query", self.RESULTS)
+
+        assert first == second == "Cached summary"
+        mock_client.post.assert_called_once()
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_empty_summary_not_cached(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.post.return_value = httpx.Response(
+            200,
+            json={"response": ""},
+            request=httpx.Request("POST", "http://test"),
+        )
+
+        summarize("test", self.RESULTS)
+        summarize("test", self.RESULTS)
+
+        assert mock_client.post.call_count == 2
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_concurrent_summaries_coalesced(self, mock_get_client):
+        def slow_post(*_args, **_kwargs) -> httpx.Response:
+            time.sleep(0.2)
+            return httpx.Response(
+                200, json={"response": "Shared summary"}, request=httpx.Request("POST", "http://test")
+            )
+
+        mock_client = mock_get_client.return_value
+        mock_client.post.side_effect = slow_post
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            summaries = list(executor.map(lambda _: summarize("test", self.RESULTS), range(4)))
+
+        assert summaries == ["Shared summary"] * 4
+        mock_client.post.assert_called_once()
+
+    def test_key_depends_on_results_and_model(self):
+        other_results = [{"title": "Other", "url": "https://example.org", "description": "desc"}]
+        key = _summary_cache_key("test", self.RESULTS, "gemma3:4b")
+        assert key == _summary_cache_key(" TEST ", self.RESULTS, "gemma3:4b")
+        assert key != _summary_cache_key("test", other_results, "gemma3:4b")
+        assert key != _summary_cache_key("test", self.RESULTS, "mistral:7b")
+        assert key != _summary_cache_key("test", self.RESULTS[::-1] + other_results, "gemma3:4b")
+
+
+class TestSemanticSummaryCache:
+    RESULTS = [
+        {"title": "Python 3.14", "url": "https://python.org/3.14", "description": "Release"},
+        {"title": "PEP 745", "url": "https://peps.python.org/pep-0745/", "description": "Schedule"},
+    ]
+
+    @pytest.fixture(autouse=True)
+    def semantic_index(self, monkeypatch: pytest.MonkeyPatch) -> SemanticIndex:
+        pytest.importorskip("numpy")
+        index = SemanticIndex(max_size=8, ttl=60, threshold=0.9, min_url_overlap=0.5)
+        monkeypatch.setattr("zaatar.clients.ollama.semantic_summaries", index)
+        return index
+
+    EMBEDDINGS = {
+        "python 3.14 release date": [1.0, 0.1, 0.0],
+        "when is python 3.14 released": [0.98, 0.15, 0.0],
+        "python 3.14 free threading": [0.2, 1.0, 0.0],
+    }
+
+    def _post(self, url: str, json: dict) -> httpx.Response:
+        request = httpx.Request("POST", url)
+        if url.endswith("/api/embed"):
+            return httpx.Response(200, json={"embeddings": [self.EMBEDDINGS[json["input"]]]}, request=request)
+        return httpx.Response(200, json={"response": f"Summary for {json['prompt'][:30]}"}, request=request)
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_near_duplicate_query_reuses_summary(self, mock_get_client, semantic_index):
+        mock_client = mock_get_client.return_value
+        mock_client.post.side_effect = self._post
+
+        first = summarize("python 3.14 release date", self.RESULTS)
+        second = summarize("when is python 3.14 released", list(reversed(self.RESULTS)))
+
+        assert second == first
+        generate_calls = [c for c in mock_client.post.call_args_list if c.args[0].endswith("/api/generate")]
+        assert len(generate_calls) == 1
+        assert semantic_index.stats()["hits"] == 1
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_unrelated_query_generates(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.post.side_effect = self._post
+
+        summarize("python 3.14 release date", self.RESULTS)
+        summarize("python 3.14 free threading", self.RESULTS)
+
+        generate_calls = [c for c in mock_client.post.call_args_list if c.args[0].endswith("/api/generate")]
+        assert len(generate_calls) == 2
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_embedding_failure_falls_back_to_generation(self, mock_get_client, semantic_index):
+        def post(url: str, **_kwargs) -> httpx.Response:
+            request = httpx.Request("POST", url)
+            if url.endswith("/api/embed"):
+                return httpx.Response(500, request=request)
+            return httpx.Response(200, json={"response": "Generated"}, request=request)
+
+        mock_get_client.return_value.post.side_effect = post
+
+        assert summarize("python 3.14 release date", self.RESULTS) == "Generated"
+        assert semantic_index.stats()["entries"] == 0
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_missing_embedding_model_does_not_eject_backend(self, mock_get_client):
+        def post(url: str, **_kwargs) -> httpx.Response:
+            request = httpx.Request("POST", url)
+            if url.endswith("/api/embed"):
+                return httpx.Response(404, request=request)
+            return httpx.Response(200, json={"response": "Generated"}, request=request)
+
+        mock_get_client.return_value.post.side_effect = post
+        pool = BackendPool("ollama", ["http://ollama-a:11434"], eject_errors=1)
+
+        with patch("zaatar.clients.ollama.ollama_backends", pool):
+            summarize("python 3.14 release date", self.RESULTS)
+            summarize("python 3.14 free threading", self.RESULTS)
+
+        stats = pool.stats()["http://ollama-a:11434"]
+        assert stats["errors_total"] == 0
+        assert stats["ejected"] is False
+
+    @patch("zaatar.clients.ollama.get_client")
+    def test_near_duplicate_served_without_summarization_slot(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.post.side_effect = self._post
+        first = summarize("python 3.14 release date", self.RESULTS)
+        gate = AdmissionGate("ollama", max_active=0, max_queued=0, max_wait=1)
+
+        with patch("zaatar.clients.ollama.summary_admission", gate):
+            assert summarize("when is python 3.14 released", self.RESULTS) == first
+            with pytest.raises(AdmissionRejectedError):
+                summarize("python 3.14 free threading", self.RESULTS)
+
+        generate_calls = [c for c in mock_client.post.call_args_list if c.args[0].endswith("/api/generate")]
+        assert len(generate_calls) == 1
+        assert gate.stats()["shed_queue_full"] == 1
+
+
+class TestPersistentCache:
+    def test_survives_restart(self, tmp_path):
+        path = str(tmp_path / "summaries.sqlite3")
+        cache = PersistentCache(max_size=10, ttl=60, path=path, disk_max_size=10)
+        cache.set("key", "summary")
+
+        restarted = PersistentCache(max_size=10, ttl=60, path=path, disk_max_size=10)
+        value, _status = restarted.get("key")
+
+        assert value == "summary"
+
+    def test_disk_size_bounded(self, tmp_path):
+        path = str(tmp_path / "summaries.sqlite3")
+        cache = PersistentCache(max_size=1, ttl=60, path=path, disk_max_size=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+
+        restarted = PersistentCache(max_size=10, ttl=60, path=path, disk_max_size=2)
+        assert restarted.get("a")[0] is None
+        assert restarted.get("c")[0] == "c"
+
+
+class TestSummarizeStream:
+    @patch("zaatar.clients.ollama.get_client")
+    def test_stream_chunks(self, mock_get_client):
+        lines = [
+            '{"response": "Python ", "done": false}',
+            '{"response": "is great.", "done": false}',
+            '{"response": "", "done": true}',
+        ]
+        mock_client = mock_get_client.return_value
+        stream_response = mock_client.stream.return_value.__enter__.return_value
+        stream_response.iter_lines.return_value = iter(lines)
+
+        results = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
+        chunks = list(summarize_stream("python", results))
+
+        assert chunks == ["Python ", "is great."]
+        payload = mock_client.stream.call_args[1]["json"]
+        assert payload["stream"] is True
+        # Completed stream populates the summary cache
+        assert list(summarize_stream("python", results)) == ["Python is great."]
+        mock_client.stream.assert_called_once()
+
+
+class TestAsyncSummarize:
+    @patch("zaatar.clients.ollama.get_async_client")
+    def test_async_summarize_success(self, mock_get_async_client):
+        mock_client = mock_get_async_client.return_value
+        mock_client.post = AsyncMock(
+            return_value=httpx.Response(
+                200,
+                json={"response": "Async summary"},
+                request=httpx.Request("POST", "http://test"),
+            )
+        )
+
+        results = [{"title": "Test", "url": "https://example.com", "description": "desc"}]
+        summary = asyncio.run(async_summarize("test", results))
+
+        assert summary == "Async summary"
+        assert mock_client.post.call_args[1]["json"]["stream"] is False
@@ -0,0 +1,83 @@
+"""Summarization prompt budget tests."""
+
+from zaatar.prompt import ELLIPSIS, build_summary_prompt, dedupe_results, estimate_tokens
+
+
+def _result(index: int, description: str | None = None) -> dict[str, str]:
+    return {
+        "title": f"Result {index}",
+        "url": f"https://example.com/{index}",
+        "description": f"Description of result {index}" if description is None else description,
+    }
+
+
+class TestEstimateTokens:
+    def test_rounds_up(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abc") == 1
+        assert estimate_tokens("abcde") == 2
+
+
+class TestDedupeResults:
+    def test_same_url_variants_dropped(self):
+        results = [
+            {"title": "A", "url": "https://www.example.com/page/", "description": "first"},
+            {"title": "A", "url": "http://example.com/page#section", "description": "second"},
+            {"title": "B", "url": "https://example.com/other", "description": "third"},
+        ]
+        assert [r["description"] for r in dedupe_results(results)] == ["first", "third"]
+
+    def test_same_description_dropped(self):
+        results = [_result(1, "Same  text"), _result(2, "same text"), _result(3, "")]
+        assert [r["url"] for r in dedupe_results(results)] == ["https://example.com/1", "https://example.com/3"]
+
+
+class TestBuildSummaryPrompt:
+    def test_small_prompt_untouched(self):
+        results = [_result(1), _result(2)]
+        prompt = build_summary_prompt("query", results, context_tokens=4096, max_tokens=512)
+
+        assert "Search query: query" in prompt.prompt
+        assert "- [Result 1](https://example.com/1): Description of result 1" in prompt.prompt
+        assert prompt.prompt_budget_tokens == 3584
+        assert prompt.results_used == 2
+        assert prompt.chars_trimmed == 0
+        assert prompt.prompt_tokens_estimate == estimate_tokens(prompt.prompt)
+
+    def test_descriptions_trimmed_proportionally(self):
+        results = [_result(1, "word " * 400), _result(2, "word " * 100)]
+        prompt = build_summary_prompt("query", results, context_tokens=700, max_tokens=400, reserved_tokens=50)
+
+        assert prompt.prompt_budget_tokens == 250
+        assert prompt.prompt_tokens_estimate <= 250
+        assert prompt.results_used == 2
+        assert prompt.chars_trimmed > 0
+        lines = [line for line in prompt.prompt.splitlines() if line.startswith("- [")]
+        assert all(line.endswith(ELLIPSIS) for line in lines)
+        # The longer description keeps the larger share
+        assert len(lines[0]) > len(lines[1])
+
+    def test_page_text_included_and_trimmed(self):
+        results = [{**_result(1), "content": "Page\n\nbody " + "word " * 2000}, _result(2)]
+        prompt = build_summary_prompt("query", results, context_tokens=1000, max_tokens=200)
+
+        assert "Description of result 1 Page text: Page body word" in prompt.prompt
+        assert prompt.prompt_tokens_estimate <= 800
+        assert prompt.chars_trimmed > 0
+
+    def test_lowest_ranked_results_dropped_when_titles_overflow(self):
+        results = [_result(index) for index in range(50)]
+        prompt = build_summary_prompt("query", results, context_tokens=300, max_tokens=100)
+
+        assert 0 < prompt.results_used < 50
+        assert prompt.results_dropped == 50 - prompt.results_used
+        assert "https://example.com/0)" in prompt.prompt
+        assert "https://example.com/49)" not in prompt.prompt
+
+    def test_metadata_reports_duplicates(self):
+        results = [_result(1), _result(1), _result(2)]
+        metadata = build_summary_prompt("query", results, context_tokens=4096, max_tokens=512).metadata()
+
+        assert "prompt" not in metadata
+        assert metadata["duplicates_dropped"] == 1
+        assert metadata["results_used"] == 2
@@ -0,0 +1,65 @@
+"""Shared HTTP client registry tests."""
+
+from unittest.mock import patch
+
+import httpx
+
+from zaatar.clients.registry import FETCHER, OLLAMA, SEARXNG, ClientRegistry, configure_clients, get_client
+
+
+class TestClientRegistry:
+    def test_client_reused(self):
+        registry = ClientRegistry()
+        assert registry.get(SEARXNG) is registry.get(SEARXNG)
+        assert registry.get(SEARXNG) is not registry.get(OLLAMA)
+        registry.close()
+
+    def test_fetcher_follows_redirects(self):
+        registry = ClientRegistry()
+        assert registry.get(FETCHER).follow_redirects is True
+        assert registry.get(SEARXNG).follow_redirects is False
+        registry.close()
+
+    def test_close_recreates_client(self):
+        registry = ClientRegistry()
+        client = registry.get(SEARXNG)
+        registry.close()
+        assert client.is_closed
+        assert registry.get(SEARXNG) is not client
+        registry.close()
+
+    def test_pool_limits(self):
+        registry = ClientRegistry(max_connections=7, max_keepalive_connections=3)
+        stats = registry.stats()
+        assert stats == {}
+        registry.get(OLLAMA)
+        stats = registry.stats()
+        assert stats[OLLAMA]["max_connections"] == 7
+        assert stats[OLLAMA]["max_keepalive_connections"] == 3
+        assert stats[OLLAMA]["connections_idle"] == 0
+        registry.close()
+
+    def test_request_count(self):
+        registry = ClientRegistry()
+        client = registry.get(SEARXNG)
+        transport = httpx.MockTransport(lambda _request: httpx.Response(200, json={}))
+        client._transport = transport
+        client.get("http://test/search")
+        client.get("http://test/search")
+        assert registry.stats()[SEARXNG]["requests_total"] == 2
+        registry.close()
+
+    @patch("zaatar.clients.registry._http2_available", return_value=False)
+    def test_http2_falls_back_without_h2(self, _mock_available):
+        registry = ClientRegistry(http2=True)
+        assert registry.http2 is False
+
+
+class TestConfigureClients:
+    def test_configure_replaces_and_closes_previous(self):
+        first = configure_clients(ClientRegistry())
+        client = get_client(SEARXNG)
+        second = configure_clients(ClientRegistry())
+        assert first is not second
+        assert client.is_closed
+        assert get_client(SEARXNG) is not client
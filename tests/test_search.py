@@ -1,10 +1,13 @@
 """/web_search endpoint tests."""
 
+import json
+import time
 from unittest.mock import patch
 
 import httpx
 
-from zaatar.models import SearchResponse, SearchResult, SearchResultsWeb
+from zaatar.admission import AdmissionRejectedError, ShedReason
+from zaatar.models import FetchResponse, SearchResponse, SearchResult, SearchResultsWeb
 
 
 class TestWebSearchEndpoint:
@@ -24,6 +27,14 @@ class TestWebSearchEndpoint:
         assert len(data["web"]["results"]) == 1
         assert "summary" not in data
 
+    @patch("zaatar.routes.search.search")
+    def test_search_cache_header(self, mock_search, client):
+        result = SearchResponse(web=SearchResultsWeb(results=[]))
+        result._cache_status = "HIT"
+        mock_search.return_value = result
+        response = client.get("/web_search?query=test&summarize=false")
+        assert response.headers["X-Cache"] == "HIT"
+
     def test_search_missing_query(self, client):
         response = client.get("/web_search")
         assert response.status_code == 422
@@ -36,6 +47,12 @@ class TestWebSearchEndpoint:
         call_args = mock_search.call_args[0][0]
         assert call_args.count == 3
 
+    @patch("zaatar.routes.search.search", side_effect=httpx.ReadTimeout("timed out"))
+    def test_search_engine_timeout(self, _mock_search, client):
+        response = client.get("/web_search?query=test")
+        assert response.status_code == 502
+        assert response.get_json()["error"] == "Search engine timed out"
+
     @patch("zaatar.routes.search.search", side_effect=httpx.ConnectError("connection refused"))
     def test_search_engine_unavailable(self, _mock_search, client):
         response = client.get("/web_search?query=test")
@@ -59,6 +76,9 @@ class TestWebSearchSummarization:
         assert response.status_code == 200
         data = response.get_json()
         assert data["summary"] == "A concise summary."
+        assert data["summary_budget"]["context_tokens"] == 4096
+        assert data["summary_budget"]["max_tokens"] == 512
+        assert data["summary_budget"]["results_used"] == 1
         mock_summarize.assert_called_once()
 
     @patch("zaatar.routes.search.summarize")
@@ -73,6 +93,7 @@ class TestWebSearchSummarization:
         )
         response = client.get("/web_search?query=test&summarize=false")
         assert response.status_code == 200
+        assert "summary_budget" not in response.get_json()
         mock_summarize.assert_not_called()
 
     @patch("zaatar.routes.search.summarize")
@@ -97,3 +118,274 @@ class TestWebSearchSummarization:
         assert response.status_code == 502
         data = response.get_json()
         assert "Summarization service unavailable" in data["error"]
+
+
+def _parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestSummaryAdmission:
+    @patch("zaatar.routes.search.summarize", side_effect=AdmissionRejectedError(ShedReason.WAIT_EXCEEDED))
+    @patch("zaatar.routes.search.search")
+    def test_results_returned_when_summary_shed(self, mock_search, _mock_summarize, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        response = client.get("/web_search?query=test&summarize=true")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["summary_skipped"] == "wait_exceeded"
+        assert "summary" not in data
+        assert len(data["web"]["results"]) == 1
+
+    @patch("zaatar.routes.search.defer_summary", return_value=(None, None))
+    @patch("zaatar.routes.search.search")
+    def test_deferred_queue_full_reported(self, mock_search, _mock_defer, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        data = client.get("/web_search?query=test&defer_summary=true").get_json()
+        assert data["summary_skipped"] == "queue_full"
+        assert "summary_id" not in data
+
+    @patch("zaatar.routes.search.summarize_stream", side_effect=AdmissionRejectedError(ShedReason.QUEUE_FULL))
+    @patch("zaatar.routes.search.search")
+    def test_stream_summary_skipped_event(self, mock_search, _mock_summarize_stream, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        events = _parse_events(client.get("/web_search/stream?query=test").get_data(as_text=True))
+        assert [name for name, _ in events] == ["results", "summary_skipped", "done"]
+        assert events[1][1] == {"reason": "queue_full"}
+
+
+class TestDeferredSummary:
+    @patch("zaatar.jobs.summarize", return_value="A deferred summary.")
+    @patch("zaatar.routes.search.search")
+    def test_results_returned_with_summary_id(self, mock_search, mock_summarize, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        response = client.get("/web_search?query=test&defer_summary=true")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert "summary" not in data
+        summary_id = data["summary_id"]
+
+        response = client.get(f"/web_search/summary/{summary_id}?wait=5")
+        assert response.status_code == 200
+        assert response.get_json() == {"summary_id": summary_id, "status": "done", "summary": "A deferred summary."}
+        mock_summarize.assert_called_once()
+
+    @patch("zaatar.jobs.summarize", side_effect=lambda *_args: time.sleep(0.5) or "Late summary.")
+    @patch("zaatar.routes.search.search")
+    def test_poll_without_wait_reports_pending(self, mock_search, _mock_summarize, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(results=[SearchResult(title="T", url="https://example.com", description="D")])
+        )
+        summary_id = client.get("/web_search?query=test&defer_summary=true").get_json()["summary_id"]
+        data = client.get(f"/web_search/summary/{summary_id}").get_json()
+        assert data["status"] in ("pending", "running")
+        assert "summary" not in data
+
+    def test_unknown_summary_id(self, client):
+        response = client.get("/web_search/summary/does-not-exist")
+        assert response.status_code == 404
+
+    def test_wait_bounded(self, client):
+        response = client.get("/web_search/summary/any?wait=100000")
+        assert response.status_code == 422
+
+
+def _deep_results() -> SearchResponse:
+    return SearchResponse(
+        web=SearchResultsWeb(
+            results=[
+                SearchResult(title=f"Test {i}", url=f"https://example.com/{i}", description=f"Result {i}")
+                for i in range(5)
+            ]
+        )
+    )
+
+
+def _page(url: str) -> FetchResponse:
+    return FetchResponse(url=url, content=f"Text of {url}", extract_mode="lxml-text", content_length=10)
+
+
+class TestDeepSearch:
+    @patch("zaatar.deep.fetch_within")
+    @patch("zaatar.routes.search.summarize", return_value="A concise summary.")
+    @patch("zaatar.routes.search.search")
+    def test_pages_attached_and_summarized(self, mock_search, mock_summarize, mock_fetch_within, client):
+        mock_search.return_value = _deep_results()
+        not_found = httpx.HTTPStatusError(
+            "not found",
+            request=httpx.Request("GET", "https://example.com/2"),
+            response=httpx.Response(404),
+        )
+        mock_fetch_within.return_value = [_page("https://example.com/0"), TimeoutError(), not_found]
+
+        response = client.get("/web_search?query=test&depth=deep")
+
+        assert response.status_code == 200
+        data = response.get_json()
+        queries, _budget = mock_fetch_within.call_args[0]
+        assert [q.url for q in queries] == ["https://example.com/0", "https://example.com/1", "https://example.com/2"]
+        results = data["web"]["results"]
+        assert results[0]["content"] == "Text of https://example.com/0"
+        assert results[1]["content_error"] == "Timed out"
+        assert results[2]["content_error"] == "Upstream error: 404"
+        assert "content" not in results[3]
+        assert data["deep"]["pages_requested"] == 3
+        assert data["deep"]["pages_fetched"] == 1
+        assert data["deep"]["pages_timed_out"] == 1
+        assert data["deep"]["pages_failed"] == 1
+        assert mock_summarize.call_args[0][1][0]["content"] == "Text of https://example.com/0"
+
+    @patch("zaatar.deep.fetch_within")
+    @patch("zaatar.routes.search.search")
+    def test_basic_depth_fetches_nothing(self, mock_search, mock_fetch_within, client):
+        mock_search.return_value = _deep_results()
+
+        data = client.get("/web_search?query=test&summarize=false").get_json()
+
+        mock_fetch_within.assert_not_called()
+        assert "deep" not in data
+
+
+class TestWebSearchStream:
+    @patch("zaatar.routes.search.summarize_stream", return_value=iter(["A concise ", "summary."]))
+    @patch("zaatar.routes.search.search")
+    def test_stream_results_then_summary(self, mock_search, _mock_summarize_stream, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(
+                results=[
+                    SearchResult(title="Test", url="https://example.com", description="A test result"),
+                ]
+            )
+        )
+        response = client.get("/web_search/stream?query=test")
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        events = _parse_events(response.get_data(as_text=True))
+        assert [name for name, _ in events] == ["results", "summary", "summary", "done"]
+        assert events[0][1]["web"]["results"][0]["url"] == "https://example.com"
+        assert "".join(data["delta"] for name, data in events if name == "summary") == "A concise summary."
+
+    @patch("zaatar.routes.search.summarize_stream")
+    @patch("zaatar.routes.search.search")
+    def test_stream_without_summarize(self, mock_search, mock_summarize_stream, client):
+        mock_search.return_value = SearchResponse(web=SearchResultsWeb(results=[]))
+        response = client.get("/web_search/stream?query=test&summarize=false")
+        events = _parse_events(response.get_data(as_text=True))
+        assert [name for name, _ in events] == ["results", "done"]
+        mock_summarize_stream.assert_not_called()
+
+    @patch("zaatar.routes.search.summarize_stream", side_effect=httpx.ConnectError("connection refused"))
+    @patch("zaatar.routes.search.search")
+    def test_stream_summarize_error_event(self, mock_search, _mock_summarize_stream, client):
+        mock_search.return_value = SearchResponse(
+            web=SearchResultsWeb(
+                results=[
+                    SearchResult(title="Test", url="https://example.com", description="A test"),
+                ]
+            )
+        )
+        response = client.get("/web_search/stream?query=test")
+        events = _parse_events(response.get_data(as_text=True))
+        assert [name for name, _ in events] == ["results", "error"]
+        assert "Summarization service unavailable" in events[1][1]["error"]
+
+    @patch("zaatar.routes.search.search", side_effect=httpx.ConnectError("connection refused"))
+    def test_stream_search_unavailable(self, _mock_search, client):
+        response = client.get("/web_search/stream?query=test")
+        assert response.status_code == 502
+
+
+class TestWebSearchBatch:
+    @patch("zaatar.routes.search.search")
+    def test_batch_results_in_input_order(self, mock_search, client):
+        def fake_search(query) -> SearchResponse:
+            # Later queries finish first
+            time.sleep(0.05 if query.query == "first" else 0)
+            return SearchResponse(
+                web=SearchResultsWeb(
+                    results=[SearchResult(title=query.query, url="https://example.com", description="d")],
+                )
+            )
+
+        mock_search.side_effect = fake_search
+        body = {"queries": [{"query": q, "summarize": False} for q in ("first", "second", "third")]}
+        response = client.post("/web_search/batch", json=body)
+        assert response.status_code == 200
+        items = response.get_json()["results"]
+        assert [item["response"]["web"]["results"][0]["title"] for item in items] == ["first", "second", "third"]
+        assert all(item["status"] == 200 for item in items)
+
+    @patch("zaatar.routes.search.search")
+    def test_batch_runs_concurrently(self, mock_search, client):
+        def slow_search(_query) -> SearchResponse:
+            time.sleep(0.2)
+            return SearchResponse(web=SearchResultsWeb(results=[]))
+
+        mock_search.side_effect = slow_search
+        body = {"queries": [{"query": f"q{i}", "summarize": False} for i in range(5)]}
+        start = time.monotonic()
+        response = client.post("/web_search/batch", json=body)
+        elapsed = time.monotonic() - start
+        assert response.status_code == 200
+        assert elapsed < 0.6
+
+    @patch("zaatar.routes.search.summarize", return_value="Summary")
+    @patch("zaatar.routes.search.search")
+    def test_batch_per_item_errors_and_summaries(self, mock_search, mock_summarize, client):
+        def fake_search(query) -> SearchResponse:
+            if query.query == "broken":
+                raise httpx.ConnectError("connection refused")
+            return SearchResponse(
+                web=SearchResultsWeb(
+                    results=[SearchResult(title="Test", url="https://example.com", description="d")],
+                )
+            )
+
+        mock_search.side_effect = fake_search
+        body = {
+            "queries": [
+                {"query": "summarized"},
+                {"query": "broken"},
+                {"query": "plain", "summarize": False},
+            ]
+        }
+        response = client.post("/web_search/batch", json=body)
+        items = response.get_json()["results"]
+        assert items[0]["response"]["summary"] == "Summary"
+        assert items[1] == {"status": 502, "error": "Search engine unavailable"}
+        assert "summary" not in items[2]["response"]
+        mock_summarize.assert_called_once()
+
+    @patch("zaatar.routes.search.search")
+    def test_batch_item_timeout_and_unexpected_error(self, mock_search, client):
+        def fake_search(query) -> SearchResponse:
+            if query.query == "slow":
+                raise httpx.ReadTimeout("timed out")
+            if query.query == "bug":
+                raise KeyError("results")
+            return SearchResponse(web=SearchResultsWeb(results=[]))
+
+        mock_search.side_effect = fake_search
+        body = {"queries": [{"query": q, "summarize": False} for q in ("ok", "slow", "bug")]}
+        response = client.post("/web_search/batch", json=body)
+
+        assert response.status_code == 200
+        items = response.get_json()["results"]
+        assert items[0]["status"] == 200
+        assert items[1] == {"status": 502, "error": "Search engine timed out"}
+        assert items[2] == {"status": 502, "error": "Search failed: KeyError"}
+
+    def test_batch_requires_queries(self, client):
+        response = client.post("/web_search/batch", json={"queries": []})
+        assert response.status_code == 422
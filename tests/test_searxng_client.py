@@ -1,10 +1,16 @@
 """SearXNG client unit tests."""
 
-from unittest.mock import patch
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
 
 import httpx
+import pytest
 
-from zaatar.clients.searxng import _build_searxng_params, search
+from zaatar.cache import CacheStatus
+from zaatar.clients.backends import LATENCY_MIN_SAMPLES, BackendPool, HedgePolicy
+from zaatar.clients.searxng import _build_searxng_params, _cache_key, _cache_ttl, async_search, search, search_cache
 from zaatar.models import SearchQuery
 
 
@@ -40,8 +46,8 @@ class TestBuildSearxngParams:
 
 
 class TestSearch:
-    @patch("zaatar.clients.searxng.httpx.Client")
-    def test_search_success(self, mock_client_class):
+    @patch("zaatar.clients.searxng.get_client")
+    def test_search_success(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={
@@ -52,7 +58,7 @@ class TestSearch:
             },
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
         query = SearchQuery(query="python", count=2)
@@ -62,8 +68,8 @@ class TestSearch:
         assert result.web.results[0].title == "Python"
         assert result.web.results[0].description == "Python programming language"
 
-    @patch("zaatar.clients.searxng.httpx.Client")
-    def test_search_limits_count(self, mock_client_class):
+    @patch("zaatar.clients.searxng.get_client")
+    def test_search_limits_count(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={
@@ -74,7 +80,7 @@ class TestSearch:
             },
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
         query = SearchQuery(query="test", count=3)
@@ -82,17 +88,323 @@ class TestSearch:
 
         assert len(result.web.results) == 3
 
-    @patch("zaatar.clients.searxng.httpx.Client")
-    def test_search_empty_results(self, mock_client_class):
+    @patch("zaatar.clients.searxng.get_client")
+    def test_search_empty_results(self, mock_get_client):
         mock_response = httpx.Response(
             200,
             json={"results": []},
             request=httpx.Request("GET", "http://test"),
         )
-        mock_client = mock_client_class.return_value.__enter__.return_value
+        mock_client = mock_get_client.return_value
         mock_client.get.return_value = mock_response
 
         query = SearchQuery(query="nonexistent")
         result = search(query)
 
         assert result.web.results == []
+
+
+class TestSearchCache:
+    @staticmethod
+    def _response() -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={"results": [{"title": "Python", "url": "https://python.org", "content": "Python"}]},
+            request=httpx.Request("GET", "http://test"),
+        )
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_repeat_query_served_from_cache(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.get.return_value = self._response()
+
+        first = search(SearchQuery(query="python"))
+        second = search(SearchQuery(query="  python "))
+
+        assert mock_client.get.call_count == 1
+        assert first._cache_status == CacheStatus.MISS
+        assert second._cache_status == CacheStatus.HIT
+        assert second.web.results[0].title == "Python"
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_cached_result_not_mutated_by_caller(self, mock_get_client):
+        mock_get_client.return_value.get.return_value = self._response()
+
+        first = search(SearchQuery(query="python"))
+        first.summary = "attached by caller"
+        second = search(SearchQuery(query="python"))
+
+        assert second.summary is None
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_count_is_part_of_key(self, mock_get_client):
+        mock_client = mock_get_client.return_value
+        mock_client.get.return_value = self._response()
+
+        search(SearchQuery(query="python", count=2))
+        search(SearchQuery(query="python", count=3))
+
+        assert mock_client.get.call_count == 2
+
+    @patch("zaatar.clients.searxng._schedule_refresh")
+    @patch("zaatar.clients.searxng.get_client")
+    def test_stale_entry_served_and_refreshed(self, mock_get_client, mock_refresh):
+        mock_client = mock_get_client.return_value
+        query = SearchQuery(query="python")
+        key = _cache_key(_build_searxng_params(query), query.count)
+        search_cache.set(key, search(query), ttl=-1)
+        mock_client.get.reset_mock()
+
+        result = search(query)
+
+        assert result._cache_status == CacheStatus.STALE
+        mock_client.get.assert_not_called()
+        mock_refresh.assert_called_once()
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_concurrent_misses_coalesced(self, mock_get_client):
+        def slow_get(*_args, **_kwargs) -> httpx.Response:
+            time.sleep(0.2)
+            return self._response()
+
+        mock_client = mock_get_client.return_value
+        mock_client.get.side_effect = slow_get
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(search(SearchQuery(query="python")))) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert mock_client.get.call_count == 1
+        assert len({id(result) for result in results}) == 4
+        assert all(result.web.results[0].title == "Python" for result in results)
+
+    def test_freshness_ttl(self):
+        assert _cache_ttl(SearchQuery(query="x", freshness="pd")) < _cache_ttl(SearchQuery(query="x", freshness="py"))
+
+
+class TestAsyncSearch:
+    @patch("zaatar.clients.searxng.get_async_client")
+    def test_async_search_shares_cache(self, mock_get_async_client):
+        mock_client = mock_get_async_client.return_value
+        mock_client.get = AsyncMock(
+            return_value=httpx.Response(
+                200,
+                json={"results": [{"title": "Python", "url": "https://python.org", "content": "Python"}]},
+                request=httpx.Request("GET", "http://test"),
+            )
+        )
+
+        first = asyncio.run(async_search(SearchQuery(query="python")))
+        second = search(SearchQuery(query="python"))
+
+        assert first.web.results[0].title == "Python"
+        assert first._cache_status == CacheStatus.MISS
+        assert second._cache_status == CacheStatus.HIT
+        mock_client.get.assert_awaited_once()
+
+
+class TestHedgedSearch:
+    BACKENDS = ["http://searxng-a:8080", "http://searxng-b:8080"]
+
+    @staticmethod
+    def _response(title: str) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={"results": [{"title": title, "url": "https://python.org", "content": "Python"}]},
+            request=httpx.Request("GET", "http://test"),
+        )
+
+    @pytest.fixture
+    def hedging(self):
+        """Two instances with enough (fast) latency samples to hedge after 50ms."""
+        pool = BackendPool("searxng", self.BACKENDS, latency_aware=True)
+        for _ in range(LATENCY_MIN_SAMPLES):
+            with pool.use():
+                pass
+        policy = HedgePolicy(pool, enabled=True, percentile=0.95, min_delay=0.05, max_ratio=1.0)
+        with (
+            patch("zaatar.clients.searxng.searxng_backends", pool),
+            patch("zaatar.clients.searxng.searxng_hedging", policy),
+        ):
+            yield policy
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_slow_request_hedged(self, mock_get_client, hedging):
+        calls = []
+
+        def get(url: str, **_kwargs) -> httpx.Response:
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return self._response("slow")
+            return self._response("hedge")
+
+        mock_get_client.return_value.get.side_effect = get
+        started = time.monotonic()
+        result = search(SearchQuery(query="python"))
+
+        assert result.web.results[0].title == "hedge"
+        assert time.monotonic() - started < 0.4
+        assert len(set(calls)) == 2
+        assert hedging.stats()["hedged"] == 1
+        assert hedging.stats()["hedge_wins"] == 1
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_fast_request_not_hedged(self, mock_get_client, hedging):
+        mock_get_client.return_value.get.return_value = self._response("fast")
+
+        assert search(SearchQuery(query="python")).web.results[0].title == "fast"
+        mock_get_client.return_value.get.assert_called_once()
+        assert hedging.stats()["hedged"] == 0
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_failed_request_retried_on_other_instance(self, mock_get_client, hedging):
+        calls = []
+
+        def get(url: str, **_kwargs) -> httpx.Response:
+            calls.append(url)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection refused")
+            return self._response("other")
+
+        mock_get_client.return_value.get.side_effect = get
+
+        assert search(SearchQuery(query="python")).web.results[0].title == "other"
+        assert calls[0] != calls[1]
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_hedges_capped(self, mock_get_client, hedging):
+        hedging.max_ratio = 0
+
+        def get(*_args, **_kwargs) -> httpx.Response:
+            time.sleep(0.1)
+            return self._response("slow")
+
+        mock_get_client.return_value.get.side_effect = get
+
+        assert search(SearchQuery(query="python")).web.results[0].title == "slow"
+        mock_get_client.return_value.get.assert_called_once()
+
+    @patch("zaatar.clients.searxng.get_async_client")
+    def test_async_slow_request_hedged_and_cancelled(self, mock_get_async_client, hedging):
+        calls = []
+
+        async def get(url: str, **_kwargs) -> httpx.Response:
+            calls.append(url)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+                return self._response("slow")
+            return self._response("hedge")
+
+        mock_get_async_client.return_value.get = get
+        result = asyncio.run(async_search(SearchQuery(query="python")))
+
+        assert result.web.results[0].title == "hedge"
+        assert hedging.stats()["hedge_wins"] == 1
+        # The cancelled request released its instance
+        assert all(stats["in_flight"] == 0 for stats in hedging.pool.stats().values())
+
+    def test_single_instance_never_hedged(self):
+        pool = BackendPool("searxng", ["http://searxng:8080"])
+        for _ in range(LATENCY_MIN_SAMPLES):
+            with pool.use():
+                pass
+        policy = HedgePolicy(pool, enabled=True, percentile=0.95, min_delay=0.05, max_ratio=1.0)
+        assert policy.delay() is None
+        assert policy.stats()["enabled"] is False
+
+
+class TestPagedSearch:
+    @staticmethod
+    def _page(urls: list[str]) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={"results": [{"title": url, "url": url, "content": url} for url in urls]},
+            request=httpx.Request("GET", "http://test"),
+        )
+
+    def _pages(self, params: dict) -> httpx.Response:
+        page = params.get("pageno", 1)
+        return self._page([f"https://example.com/{page}/{i}" for i in range(10)])
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_pages_requested_concurrently(self, mock_get_client):
+        def slow_get(_url: str, params: dict) -> httpx.Response:
+            time.sleep(0.2)
+            return self._pages(params)
+
+        mock_client = mock_get_client.return_value
+        mock_client.get.side_effect = slow_get
+
+        started = time.perf_counter()
+        result = search(SearchQuery(query="python", count=25))
+
+        assert time.perf_counter() - started < 0.4
+        assert mock_client.get.call_count == 3
+        assert sorted(call.kwargs["params"].get("pageno", 1) for call in mock_client.get.call_args_list) == [1, 2, 3]
+        assert len(result.web.results) == 25
+        # Rank order: page 1 first, then page 2, then page 3
+        assert result.web.results[0].url == "https://example.com/1/0"
+        assert result.web.results[10].url == "https://example.com/2/0"
+        assert result.web.results[24].url == "https://example.com/3/4"
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_repeats_across_pages_dropped(self, mock_get_client):
+        def get(_url: str, params: dict) -> httpx.Response:
+            if params.get("pageno", 1) == 1:
+                return self._page(["https://example.com/a", "https://example.com/b"])
+            return self._page(["http://www.example.com/b/", "https://example.com/c"])
+
+        mock_get_client.return_value.get.side_effect = get
+
+        result = search(SearchQuery(query="python", count=11))
+
+        assert [r.url for r in result.web.results] == [
+            "https://example.com/a",
+            "https://example.com/b",
+            "https://example.com/c",
+        ]
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_failed_later_page_returns_partial_uncached(self, mock_get_client):
+        def get(_url: str, params: dict) -> httpx.Response:
+            if params.get("pageno", 1) == 2:  # noqa: PLR2004
+                raise httpx.ConnectError("down")
+            return self._pages(params)
+
+        mock_client = mock_get_client.return_value
+        mock_client.get.side_effect = get
+        query = SearchQuery(query="python", count=30)
+
+        result = search(query)
+
+        assert len(result.web.results) == 10
+        assert search_cache.get(_cache_key(_build_searxng_params(query), query.count)) == (None, CacheStatus.MISS)
+
+    @patch("zaatar.clients.searxng.get_client")
+    def test_failed_first_page_raises(self, mock_get_client):
+        def get(_url: str, params: dict) -> httpx.Response:
+            if params.get("pageno", 1) == 1:
+                raise httpx.ConnectError("down")
+            return self._pages(params)
+
+        mock_get_client.return_value.get.side_effect = get
+
+        with pytest.raises(httpx.ConnectError):
+            search(SearchQuery(query="python", count=20))
+
+    @patch("zaatar.clients.searxng.get_async_client")
+    def test_async_pages_merged(self, mock_get_async_client):
+        async def get(_url: str, params: dict) -> httpx.Response:
+            return self._pages(params)
+
+        mock_get_async_client.return_value.get = get
+
+        result = asyncio.run(async_search(SearchQuery(query="python", count=15)))
+
+        assert len(result.web.results) == 15
+        assert result.web.results[14].url == "https://example.com/2/4"
@@ -0,0 +1,96 @@
+"""Semantic summary index tests."""
+
+import pytest
+
+from zaatar.semantic import SemanticIndex, result_urls, url_overlap
+
+pytest.importorskip("numpy")
+
+URLS = frozenset({"example.com/a", "example.com/b"})
+
+
+def _index(max_size: int = 8, ttl: float = 60) -> SemanticIndex:
+    return SemanticIndex(max_size=max_size, ttl=ttl, threshold=0.9, min_url_overlap=0.5)
+
+
+class TestUrlOverlap:
+    def test_share_of_current_urls(self):
+        cached = result_urls([{"url": "https://www.example.com/a/"}, {"url": "https://example.com/b"}])
+        current = result_urls([{"url": "http://example.com/a"}, {"url": "https://example.com/c"}])
+        assert url_overlap(cached, current) == 0.5
+        assert url_overlap(cached, frozenset()) == 0.0
+
+
+class TestSemanticIndex:
+    def test_similar_query_hits(self):
+        index = _index()
+        index.add([1.0, 0.0, 0.0], "model", URLS, "summary")
+
+        assert index.lookup([0.95, 0.1, 0.0], "model", URLS) == "summary"
+        assert index.stats()["hits"] == 1
+
+    def test_dissimilar_query_misses(self):
+        index = _index()
+        index.add([1.0, 0.0, 0.0], "model", URLS, "summary")
+
+        assert index.lookup([0.0, 1.0, 0.0], "model", URLS) is None
+        assert index.stats()["misses"] == 1
+
+    def test_top_match_wins(self):
+        index = _index()
+        index.add([1.0, 0.0, 0.0], "model", URLS, "x")
+        index.add([0.0, 1.0, 0.0], "model", URLS, "y")
+
+        assert index.lookup([0.1, 1.0, 0.0], "model", URLS) == "y"
+
+    def test_low_url_overlap_misses(self):
+        index = _index()
+        index.add([1.0, 0.0], "model", URLS, "summary")
+
+        assert index.lookup([1.0, 0.0], "model", frozenset({"example.com/a", "other.com/1", "other.com/2"})) is None
+        assert index.stats()["low_overlap"] == 1
+
+    def test_other_model_misses(self):
+        index = _index()
+        index.add([1.0, 0.0], "model", URLS, "summary")
+
+        assert index.lookup([1.0, 0.0], "other-model", URLS) is None
+
+    def test_expired_entries_miss_and_are_reused(self):
+        index = _index(max_size=1, ttl=-1)
+        index.add([1.0, 0.0], "model", URLS, "old")
+        assert index.lookup([1.0, 0.0], "model", URLS) is None
+
+        index.ttl = 60
+        index.add([0.0, 1.0], "model", URLS, "new")
+        assert index.lookup([0.0, 1.0], "model", URLS) == "new"
+        assert index.stats()["evictions"] == 0
+
+    def test_least_recently_used_evicted(self):
+        index = _index(max_size=2)
+        index.add([1.0, 0.0, 0.0], "model", URLS, "x")
+        index.add([0.0, 1.0, 0.0], "model", URLS, "y")
+        index.lookup([1.0, 0.0, 0.0], "model", URLS)
+
+        index.add([0.0, 0.0, 1.0], "model", URLS, "z")
+
+        assert index.lookup([0.0, 1.0, 0.0], "model", URLS) is None
+        assert index.lookup([1.0, 0.0, 0.0], "model", URLS) == "x"
+        assert index.lookup([0.0, 0.0, 1.0], "model", URLS) == "z"
+        assert index.stats()["entries"] == 2
+        assert index.stats()["evictions"] == 1
+
+    def test_mismatched_dimensions_ignored(self):
+        index = _index()
+        index.add([1.0, 0.0], "model", URLS, "summary")
+
+        assert index.lookup([1.0, 0.0, 0.0], "model", URLS) is None
+        index.add([0.0, 0.0, 1.0], "model", URLS, "other")
+        assert index.stats()["entries"] == 1
+
+    def test_disabled_without_entries(self):
+        index = _index(max_size=0)
+        index.add([1.0, 0.0], "model", URLS, "summary")
+
+        assert not index.enabled
+        assert index.lookup([1.0, 0.0], "model", URLS) is None
@@ -0,0 +1,79 @@
+"""Production server configuration and post-fork reset tests."""
+
+from unittest.mock import MagicMock, patch
+
+from flask_openapi3 import OpenAPI
+
+from zaatar.clients import registry
+from zaatar.clients.extraction import ExtractionPool
+from zaatar.jobs import JobQueue
+from zaatar.server import ZaatarServer, gunicorn_options, post_fork
+from zaatar.singleflight import SingleFlight
+
+
+class TestGunicornOptions:
+    def test_preloads_threaded_workers(self):
+        options = gunicorn_options()
+        assert options["preload_app"] is True
+        assert options["worker_class"] == "gthread"
+        assert options["post_fork"] is post_fork
+
+    @patch("zaatar.server.SERVER_GRACEFUL_TIMEOUT", 12)
+    @patch("zaatar.server.SERVER_WORKERS", 3)
+    def test_settings_applied(self):
+        server = ZaatarServer()
+        assert server.cfg.workers == 3
+        assert server.cfg.graceful_timeout == 12
+        assert server.cfg.preload_app is True
+
+    def test_loads_app(self):
+        assert isinstance(ZaatarServer().load(), OpenAPI)
+
+
+@patch("zaatar.server.model_warmer")
+class TestPostFork:
+    def test_starts_model_warmup(self, mock_warmer):
+        post_fork(MagicMock(), MagicMock(pid=1))
+        mock_warmer.after_fork.assert_called_once()
+        mock_warmer.start.assert_called_once()
+
+    def test_fresh_client_registry(self, _mock_warmer):
+        inherited = registry.get_registry()
+        inherited_client = inherited.get(registry.SEARXNG)
+
+        post_fork(MagicMock(), MagicMock(pid=1))
+
+        assert registry.get_registry() is not inherited
+        assert registry.get_client(registry.SEARXNG) is not inherited_client
+        # The parent's connections are left alone
+        assert not inherited_client.is_closed
+
+    def test_extraction_pool_forgets_inherited_workers(self, _mock_warmer):
+        pool = ExtractionPool(workers=2)
+        pool._idle.append(MagicMock())
+        pool.started = 1
+
+        pool.after_fork()
+
+        assert pool._idle == []
+        assert pool.stats()["workers_started"] == 0
+
+    def test_job_queue_restarts_workers(self, _mock_warmer):
+        jobs = JobQueue(name="test", workers=1, max_queued=4, result_ttl=60, max_size=16)
+        first = jobs.submit(str.upper, "a")
+        assert first.wait(5)
+
+        jobs.after_fork()
+        assert jobs._threads == []
+
+        second = jobs.submit(str.upper, "b")
+        assert second.wait(5)
+        assert second.result == "B"
+
+    def test_single_flight_forgets_calls_in_flight(self, _mock_warmer):
+        flight = SingleFlight("test-fork")
+        flight._calls["key"] = MagicMock()
+
+        flight.after_fork()
+
+        assert flight.do("key", str.upper, "a") == "A"
@@ -0,0 +1,150 @@
+"""Request coalescing tests."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from zaatar.singleflight import SingleFlight, coalescing_stats
+
+
+def _run_concurrently(count: int, func) -> list:
+    results: list = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as exc:  # noqa: BLE001
+            results[index] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test-share")
+        calls = []
+
+        def slow() -> str:
+            calls.append(1)
+            time.sleep(0.2)
+            return "result"
+
+        results = _run_concurrently(5, lambda: flight.do("key", slow))
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"executions": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_error_shared_with_waiters(self):
+        flight = SingleFlight("test-error")
+
+        def failing() -> str:
+            time.sleep(0.2)
+            msg = "upstream down"
+            raise ConnectionError(msg)
+
+        results = _run_concurrently(3, lambda: flight.do("key", failing))
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert flight.stats()["executions"] == 1
+
+    def test_different_keys_not_coalesced(self):
+        flight = SingleFlight("test-keys")
+        assert flight.do("a", str.upper, "a") == "A"
+        assert flight.do("b", str.upper, "b") == "B"
+        assert flight.stats()["executions"] == 2
+        assert flight.stats()["coalesced"] == 0
+
+    def test_sequential_calls_run_again(self):
+        flight = SingleFlight("test-sequential")
+        flight.do("a", str.upper, "a")
+        flight.do("a", str.upper, "a")
+        assert flight.stats()["executions"] == 2
+
+    def test_async_calls_share_one_execution(self):
+        flight = SingleFlight("test-async")
+        calls = []
+
+        async def slow() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main() -> list[str]:
+            return await asyncio.gather(*(flight.ado("key", slow) for _ in range(4)))
+
+        assert asyncio.run(main()) == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats()["coalesced"] == 3
+
+    def test_async_error_shared(self):
+        flight = SingleFlight("test-async-error")
+
+        async def failing() -> str:
+            await asyncio.sleep(0.05)
+            msg = "bad"
+            raise ValueError(msg)
+
+        async def main() -> list:
+            return await asyncio.gather(*(flight.ado("key", failing) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_async_cancelled_leader_does_not_fail_follower(self):
+        flight = SingleFlight("test-async-cancel")
+        calls = []
+
+        async def slow() -> str:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main() -> str:
+            leader = asyncio.create_task(flight.ado("key", slow))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.ado("key", slow))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        assert asyncio.run(main()) == "result"
+        assert len(calls) == 1
+
+    def test_async_call_cancelled_when_every_caller_is(self):
+        flight = SingleFlight("test-async-abandon")
+        finished = []
+
+        async def slow() -> None:
+            await asyncio.sleep(0.05)
+            finished.append(1)
+
+        async def main() -> None:
+            callers = [asyncio.create_task(flight.ado("key", slow)) for _ in range(2)]
+            await asyncio.sleep(0)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(main())
+        assert finished == []
+        assert flight.stats()["in_flight"] == 0
+
+    def test_registered_in_stats(self):
+        SingleFlight("test-registered")
+        assert "test-registered" in coalescing_stats()
+        for name in ("searxng", "fetcher", "extraction", "ollama"):
+            assert name in coalescing_stats()
+
+    @pytest.mark.parametrize("count", [2, 8])
+    def test_leader_result_returned_to_all(self, count):
+        flight = SingleFlight(f"test-count-{count}")
+        results = _run_concurrently(count, lambda: flight.do("k", lambda: time.sleep(0.1) or object()))
+        assert len({id(result) for result in results}) == 1
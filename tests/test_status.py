@@ -0,0 +1,50 @@
+"""/status endpoint tests."""
+
+from zaatar.clients.registry import SEARXNG, get_client
+
+
+class TestStatusEndpoint:
+    def test_status_empty_pools(self, client):
+        response = client.get("/status")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data["http_pools"] == {}
+
+    def test_status_reports_created_pools(self, client):
+        get_client(SEARXNG)
+        response = client.get("/status")
+        data = response.get_json()
+        assert SEARXNG in data["http_pools"]
+        assert data["http_pools"][SEARXNG]["requests_total"] == 0
+
+    def test_status_reports_extraction_pool(self, client):
+        response = client.get("/status")
+        extraction = response.get_json()["extraction"]
+        assert extraction["queued"] == 0
+        assert "timeouts" in extraction
+
+    def test_status_reports_summary_jobs(self, client):
+        summary_jobs = client.get("/status").get_json()["summary_jobs"]
+        assert summary_jobs["rejected"] == 0
+        assert "queued" in summary_jobs
+
+    def test_status_reports_coalescing(self, client):
+        coalescing = client.get("/status").get_json()["coalescing"]
+        assert coalescing[SEARXNG]["in_flight"] == 0
+        assert "coalesced" in coalescing["extraction"]
+
+    def test_status_reports_ollama_backends(self, client):
+        backends = client.get("/status").get_json()["ollama_backends"]
+        assert backends["http://localhost:11434"]["in_flight"] == 0
+        assert backends["http://localhost:11434"]["ejected"] is False
+
+    def test_status_reports_summary_admission(self, client):
+        admission = client.get("/status").get_json()["summary_admission"]
+        assert admission["queued"] == 0
+        assert "shed_queue_full" in admission
+        assert "shed_wait_exceeded" in admission
+
+    def test_status_reports_searxng_routing(self, client):
+        data = client.get("/status").get_json()
+        assert data["searxng_backends"]["http://localhost:8080"]["in_flight"] == 0
+        assert data["searxng_hedging"]["enabled"] is False
@@ -0,0 +1,80 @@
+"""Background model warm-up tests."""
+
+import time
+from unittest.mock import patch
+
+import httpx
+
+from zaatar.warmup import ModelState, ModelWarmer
+
+CONNECT_ERROR = httpx.ConnectError("connection refused")
+
+
+def _wait_for(predicate, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestModelWarmer:
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model")
+    def test_pulls_then_warms(self, mock_pull, mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0)
+        warmer.start()
+
+        assert _wait_for(lambda: warmer.ready)
+        mock_pull.assert_called_once_with("gemma3:4b")
+        mock_warm.assert_called_once_with("gemma3:4b")
+        assert warmer.status().last_warmed_at is not None
+
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model", side_effect=[CONNECT_ERROR, None])
+    def test_retries_after_failure(self, mock_pull, _mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0, retry=0.01)
+        warmer.start()
+
+        assert _wait_for(lambda: warmer.ready)
+        assert mock_pull.call_count == 2
+        assert warmer.error is None
+
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model", side_effect=CONNECT_ERROR)
+    def test_failure_reported(self, _mock_pull, _mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0, retry=60)
+        warmer.start()
+
+        assert _wait_for(lambda: warmer.state is ModelState.FAILED)
+        assert "ConnectError" in warmer.status().error
+        warmer.stop()
+
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model", side_effect=[KeyError("models"), None])
+    def test_retries_after_unexpected_error(self, mock_pull, _mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0, retry=0.01)
+        warmer.start()
+
+        assert _wait_for(lambda: warmer.ready)
+        assert mock_pull.call_count == 2
+
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model")
+    def test_periodic_warm_ping(self, _mock_pull, mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0.01)
+        warmer.start()
+
+        assert _wait_for(lambda: mock_warm.call_count >= 3)
+        warmer.stop()
+
+    @patch("zaatar.warmup.warm_model")
+    @patch("zaatar.warmup.pull_model")
+    def test_start_is_idempotent(self, mock_pull, _mock_warm):
+        warmer = ModelWarmer("gemma3:4b", interval=0)
+        warmer.start()
+        warmer.start()
+
+        assert _wait_for(lambda: warmer.ready)
+        mock_pull.assert_called_once()
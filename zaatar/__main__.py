@@ -1,16 +1,18 @@
-"""Entry point: uv run python -m zaatar."""
+"""Development entry point: uv run python -m zaatar (use zaatar.server in production)."""
 
 import logging
+import os
 
 from zaatar.app import create_app
-from zaatar.clients.ollama import pull_model
-from zaatar.settings import FLASK_HOST, FLASK_PORT, OLLAMA_MODEL
+from zaatar.settings import FLASK_DEBUG, FLASK_HOST, FLASK_PORT
+from zaatar.warmup import model_warmer
 
 logger = logging.getLogger(__name__)
 
 app = create_app()
 
 if __name__ == "__main__":
-    logger.info(f"Ensuring Ollama model '{OLLAMA_MODEL}' is available ...")
-    pull_model()
-    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=True)
+    # With the reloader, only the serving child (not the watcher) warms the model
+    if not FLASK_DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        model_warmer.start()
+    app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
@@ -0,0 +1,135 @@
+"""Admission control: bound how many calls run at once and how long the rest may wait for a slot."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+# How often async waiters re-check for a free slot (seconds)
+ASYNC_POLL_INTERVAL = 0.05
+
+
+class ShedReason(StrEnum):
+    QUEUE_FULL = "queue_full"
+    WAIT_EXCEEDED = "wait_exceeded"
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a call is shed instead of admitted."""
+
+    def __init__(self, reason: ShedReason) -> None:
+        super().__init__(f"Admission rejected: {reason}")
+        self.reason = reason
+
+
+class AdmissionGate:
+    """Let at most ``max_active`` calls run; queue up to ``max_queued`` more for ``max_wait`` seconds.
+
+    A call arriving to a full queue is rejected at once, and a queued call that gets no slot
+    within ``max_wait`` is rejected then, so callers can degrade instead of piling up behind a
+    saturated upstream. Threads wait on a condition; event-loop tasks (``aadmit``) poll.
+    """
+
+    def __init__(self, name: str, max_active: int, max_queued: int, max_wait: float) -> None:
+        self.name = name
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self._reset()
+
+    def _reset(self) -> None:
+        self._condition = threading.Condition()
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed: dict[ShedReason, int] = dict.fromkeys(ShedReason, 0)
+
+    def _reject(self, reason: ShedReason) -> AdmissionRejectedError:
+        self.shed[reason] += 1
+        return AdmissionRejectedError(reason)
+
+    def _enqueue(self) -> None:
+        """Count the caller as queued, or reject it if the queue is full (lock held)."""
+        if self.active >= self.max_active and self.queued >= self.max_queued:
+            raise self._reject(ShedReason.QUEUE_FULL)
+        self.queued += 1
+
+    def _take_slot(self) -> None:
+        """Move a queued caller to active (lock held)."""
+        self.queued -= 1
+        self.active += 1
+        self.admitted += 1
+
+    def _release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self) -> Iterator[float]:
+        """Hold a slot for the block; yields the seconds spent waiting for it."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._condition:
+            self._enqueue()
+            while self.active >= self.max_active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.queued -= 1
+                    raise self._reject(ShedReason.WAIT_EXCEEDED)
+                self._condition.wait(remaining)
+            self._take_slot()
+        try:
+            yield time.monotonic() - started
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def aadmit(self) -> AsyncIterator[float]:
+        """Async variant of admit() that does not block the event loop while waiting."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        with self._condition:
+            self._enqueue()
+        try:
+            while True:
+                with self._condition:
+                    if self.active < self.max_active:
+                        self._take_slot()
+                        break
+                    if time.monotonic() >= deadline:
+                        self.queued -= 1
+                        raise self._reject(ShedReason.WAIT_EXCEEDED)
+                await asyncio.sleep(ASYNC_POLL_INTERVAL)
+        except asyncio.CancelledError:
+            with self._condition:
+                self.queued -= 1
+            raise
+        try:
+            yield time.monotonic() - started
+        finally:
+            self._release()
+
+    def after_fork(self) -> None:
+        """Reset counters and the condition in a forked child; the parent's calls are not ours."""
+        self._reset()
+
+    def stats(self) -> dict[str, Any]:
+        with self._condition:
+            return {
+                "max_active": self.max_active,
+                "max_queued": self.max_queued,
+                "max_wait": self.max_wait,
+                "active": self.active,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "shed_queue_full": self.shed[ShedReason.QUEUE_FULL],
+                "shed_wait_exceeded": self.shed[ShedReason.WAIT_EXCEEDED],
+            }
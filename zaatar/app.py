@@ -1,14 +1,20 @@
 """Flask app factory and OpenAPI YAML route."""
 
 import logging
+import time
 
 import yaml
-from flask import Response
+from flask import Response, g, request
 from flask_openapi3 import Info, OpenAPI
 
 from zaatar import __version__
+from zaatar.clients.registry import ClientRegistry, configure_clients
+from zaatar.metrics import REQUEST_SECONDS
 from zaatar.routes.fetch import fetch_bp
+from zaatar.routes.health import health_bp
+from zaatar.routes.metrics import metrics_bp
 from zaatar.routes.search import search_bp
+from zaatar.routes.status import status_bp
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +32,26 @@ def create_app() -> OpenAPI:
         doc_prefix="/openapi",
     )
 
+    # One long-lived, pooled HTTP client per upstream, shared by all requests
+    app.extensions["zaatar.clients"] = configure_clients(ClientRegistry())
+
     app.register_api(search_bp)
     app.register_api(fetch_bp)
+    app.register_api(status_bp)
+    app.register_api(metrics_bp)
+    app.register_api(health_bp)
+
+    @app.before_request
+    def start_timer() -> None:
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def observe_latency(response: Response) -> Response:
+        # Label by URL rule, not path, to keep the series count bounded
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        elapsed = time.perf_counter() - g.request_started
+        REQUEST_SECONDS.observe(elapsed, route=route, method=request.method, status=str(response.status_code))
+        return response
 
     @app.get("/openapi/yaml", doc_ui=False)
     def openapi_yaml() -> Response:
@@ -0,0 +1,160 @@
+"""ASGI entry point: uv run uvicorn zaatar.asgi:app.
+
+The I/O-bound endpoints (/web_search and /web_fetch) are served natively on the event loop
+with the async upstream clients, so one process can hold many concurrent slow upstream calls.
+Every other path (OpenAPI docs, /status, streaming and batch routes) is delegated to the
+Flask app, so the OpenAPI contract is identical to the WSGI mode.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+from urllib.parse import parse_qsl
+
+import httpx
+from asgiref.wsgi import WsgiToAsgi
+from flask_openapi3 import OpenAPI
+from pydantic import BaseModel, ValidationError
+
+from zaatar.admission import AdmissionRejectedError, ShedReason
+from zaatar.app import create_app
+from zaatar.clients.extraction import ExtractionAbortedError
+from zaatar.clients.fetcher import FetchError, async_fetch
+from zaatar.clients.ollama import async_summarize, summary_budget
+from zaatar.clients.registry import FETCHER, OLLAMA, SEARXNG, close_clients, get_registry
+from zaatar.clients.searxng import async_search
+from zaatar.deep import async_deepen
+from zaatar.jobs import defer_summary
+from zaatar.metrics import REQUEST_SECONDS, count_upstream_error
+from zaatar.models import FetchQuery, SearchQuery
+from zaatar.routes.search import UPSTREAM_ERRORS, upstream_error
+from zaatar.warmup import model_warmer
+
+logger = logging.getLogger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+JsonResult = tuple[dict[str, Any], int, dict[str, str]]
+
+
+async def web_search(query: SearchQuery) -> JsonResult:
+    """Async counterpart of zaatar.routes.search.web_search."""
+    try:
+        result = await async_search(query)
+    except UPSTREAM_ERRORS as exc:
+        return {"error": upstream_error(SEARXNG, exc)}, 502, {}
+
+    if query.depth == "deep":
+        await async_deepen(result)
+    if query.summarize and result.web.results:
+        results_for_llm = [r.model_dump() for r in result.web.results]
+        result.summary_budget = summary_budget(query.query, results_for_llm)
+        if query.defer_summary:
+            result.summary, result.summary_id = defer_summary(query.query, results_for_llm)
+            if result.summary is None and result.summary_id is None:
+                result.summary_skipped = ShedReason.QUEUE_FULL
+        else:
+            try:
+                result.summary = await async_summarize(query.query, results_for_llm)
+            except AdmissionRejectedError as exc:
+                logger.warning(f"Summary skipped under load: {exc.reason}")
+                result.summary_skipped = exc.reason
+            except UPSTREAM_ERRORS as exc:
+                return {"error": upstream_error(OLLAMA, exc)}, 502, {}
+
+    headers = {"X-Cache": result._cache_status} if result._cache_status else {}
+    return result.model_dump(exclude_none=True), 200, headers
+
+
+async def web_fetch(query: FetchQuery) -> JsonResult:
+    """Async counterpart of zaatar.routes.fetch.web_fetch."""
+    try:
+        result = await async_fetch(query)
+    except FetchError as exc:
+        return {"error": str(exc)}, 400, {}
+    except ExtractionAbortedError as exc:
+        return {"error": str(exc)}, 504, {}
+    except httpx.HTTPStatusError as exc:
+        logger.exception("Fetch failed")
+        count_upstream_error(FETCHER, exc)
+        return {"error": f"Upstream error: {exc.response.status_code}"}, 502, {}
+    except httpx.ConnectError as exc:
+        logger.exception("Cannot connect to %s", query.url)
+        count_upstream_error(FETCHER, exc)
+        return {"error": "Cannot connect to target URL"}, 502, {}
+
+    headers = {"X-Cache": result._cache_status} if result._cache_status else {}
+    return result.model_dump(), 200, headers
+
+
+ROUTES: dict[str, tuple[type[BaseModel], Callable[[Any], Awaitable[JsonResult]]]] = {
+    "/web_search": (SearchQuery, web_search),
+    "/web_fetch": (FetchQuery, web_fetch),
+}
+
+
+async def _send_body(send: Send, status: int, body: bytes, headers: dict[str, str]) -> None:
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    raw_headers.extend((name.lower().encode(), value.encode()) for name, value in headers.items())
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class AsgiApp:
+    """Dispatches the native async routes and falls back to the wrapped Flask app."""
+
+    def __init__(self, flask_app: OpenAPI) -> None:
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        route = ROUTES.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if route is None or scope["method"] != "GET":
+            await self.wsgi_app(scope, receive, send)
+            return
+
+        query_model, handler = route
+        path = scope["path"]
+        started = time.perf_counter()
+        # Match flask-openapi3: the first value of each query parameter is validated
+        params: dict[str, str] = {}
+        for key, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+            params.setdefault(key, value)
+        try:
+            query = query_model.model_validate(params)
+        except ValidationError as exc:
+            await _send_body(send, 422, exc.json().encode(), {})
+            REQUEST_SECONDS.observe(time.perf_counter() - started, route=path, method="GET", status="422")
+            return
+
+        body, status, headers = await handler(query)
+        await _send_body(send, status, json.dumps(body).encode(), headers)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, route=path, method="GET", status=str(status))
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                model_warmer.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                model_warmer.stop()
+                await get_registry().aclose()
+                close_clients()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app() -> AsgiApp:
+    """Create the ASGI application around a fresh Flask app."""
+    return AsgiApp(create_app())
+
+
+app = create_asgi_app()
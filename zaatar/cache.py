@@ -0,0 +1,259 @@
+"""In-memory and on-disk caches shared by the upstream clients."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class CacheStatus(StrEnum):
+    """Cache lookup outcome, reported to callers via the X-Cache response header."""
+
+    HIT = "HIT"
+    STALE = "STALE"
+    REVALIDATED = "REVALIDATED"
+    MISS = "MISS"
+    BYPASS = "BYPASS"
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    size: int = 0
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and a stale-while-revalidate window.
+
+    Entries are fresh for their TTL, then served as STALE for a further ``stale_ttl``
+    seconds (giving the caller a chance to refresh them in the background), then dropped.
+
+    With ``max_bytes``, entries are also evicted while their total ``sizeof()`` exceeds it, and a
+    value larger than ``max_bytes`` on its own is not cached. Call resize() after changing a cached
+    value in place.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        stale_ttl: float = 0,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> tuple[Any, CacheStatus]:
+        """Look up a key, returning ``(value, status)``; value is None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry.stale_until:
+                if entry is not None:
+                    self._pop(key)
+                self.misses += 1
+                return None, CacheStatus.MISS
+            self._entries.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+                return entry.value, CacheStatus.HIT
+            self.stale_hits += 1
+            return entry.value, CacheStatus.STALE
+
+    def set(self, key: str, value: object, ttl: float) -> None:
+        """Store a value that stays fresh for ``ttl`` seconds, evicting the least recently used."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        size = self._size(value)
+        entry = _Entry(value=value, fresh_until=now + ttl, stale_until=now + ttl + self.stale_ttl, size=size)
+        with self._lock:
+            self._pop(key)
+            if self.max_bytes and size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.bytes += size
+            self._evict()
+
+    def resize(self, key: str) -> None:
+        """Re-measure a cached value that was changed in place, evicting entries if the cache is now too large."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            size = self._size(entry.value)
+            self.bytes += size - entry.size
+            entry.size = size
+            if size > self.max_bytes:
+                self._pop(key)
+            self._evict()
+
+    def _size(self, value: object) -> int:
+        return self.sizeof(value) if self.max_bytes and self.sizeof is not None else 0
+
+    def _pop(self, key: str) -> None:
+        """Drop an entry (lock held)."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is within its bounds (lock held)."""
+        while len(self._entries) > self.max_size or (self.max_bytes and self.bytes > self.max_bytes):
+            _key, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.hits = self.stale_hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteStore:
+    """Bounded string key/value store persisted to a SQLite file.
+
+    Expiry uses wall-clock time so entries survive process restarts; the least recently
+    accessed rows are pruned once the store grows past ``max_size``.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.max_size = max_size
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if now >= expires_at:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PersistentCache:
+    """In-memory LRU cache of strings, optionally backed by a SqliteStore.
+
+    Memory misses fall through to the store (when a path is configured) and are promoted
+    back into memory, so a restart only costs a disk read instead of a recomputation.
+    """
+
+    def __init__(self, max_size: int, ttl: float, path: str = "", disk_max_size: int = 0) -> None:
+        self.ttl = ttl
+        self.path = path
+        self.disk_max_size = disk_max_size
+        self.memory = TTLCache(max_size=max_size)
+        self._store: SqliteStore | None = None
+        self._store_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.enabled
+
+    def _get_store(self) -> SqliteStore | None:
+        # Opened lazily so the SQLite connection is created in the process that uses it
+        if not self.path or self.disk_max_size <= 0:
+            return None
+        if self._store is None:
+            with self._store_lock:
+                if self._store is None:
+                    self._store = SqliteStore(self.path, self.disk_max_size)
+        return self._store
+
+    def after_fork(self) -> None:
+        """Reopen the SQLite store on next use; a connection must not be shared across processes."""
+        self._store = None
+        self._store_lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[str | None, CacheStatus]:
+        if not self.enabled:
+            return None, CacheStatus.BYPASS
+        value, status = self.memory.get(key)
+        if value is not None:
+            return value, status
+        store = self._get_store()
+        if store is not None:
+            value = store.get(key)
+            if value is not None:
+                self.memory.set(key, value, self.ttl)
+                return value, CacheStatus.HIT
+        return None, CacheStatus.MISS
+
+    def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        self.memory.set(key, value, self.ttl)
+        store = self._get_store()
+        if store is not None:
+            store.set(key, value, self.ttl)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        store = self._get_store()
+        if store is not None:
+            store.clear()
@@ -0,0 +1,291 @@
+"""Pools of interchangeable upstream instances: routing, ejection of failing ones, and request hedging."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+# Weight of the latest request in the latency moving average
+LATENCY_EWMA_ALPHA = 0.2
+# Recent successful request times kept per pool for latency percentiles, and the fewest that give one
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+# With latency-aware routing, a backend passed over for this many selections is tried again,
+# so its moving average does not go stale after one slow request
+PROBE_INTERVAL = 50
+
+
+def is_backend_error(exc: httpx.HTTPError) -> bool:
+    """Errors that say the instance is unhealthy: transport failures, 5xx, and 404 (model missing there)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status == 404  # noqa: PLR2004
+    return isinstance(exc, httpx.TransportError)
+
+
+@dataclass
+class Backend:
+    """One upstream instance and its request counters."""
+
+    url: str
+    ready: bool = True
+    in_flight: int = 0
+    requests: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    ejected_until: float = 0.0
+    latency_ewma: float | None = None
+    last_selected: int = 0
+
+    def ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def stats(self, now: float) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "in_flight": self.in_flight,
+            "requests_total": self.requests,
+            "errors_total": self.errors,
+            "consecutive_errors": self.consecutive_errors,
+            "ejected": self.ejected(now),
+            "ejected_for_seconds": round(max(self.ejected_until - now, 0.0), 1),
+            "latency_ewma_ms": None if self.latency_ewma is None else round(self.latency_ewma * 1000, 1),
+        }
+
+
+class BackendPool:
+    """Route requests across several instances of one upstream.
+
+    By default each request goes to the healthy backend with the fewest requests in flight (ties
+    go to the least recently chosen). With ``latency_aware`` the backend with the lowest moving
+    average latency is preferred instead, weighted by its requests in flight. After
+    ``eject_errors`` consecutive backend errors a backend is ejected for ``eject_seconds``; it then
+    gets requests again, and one more error ejects it again while a success clears its error
+    count. When every backend is ejected, the one returning soonest is used rather than failing
+    the request outright.
+
+    With ``start_ready`` False, backends get requests only once set_ready() marks them ready (e.g.
+    after the model is pulled there); while none is, they are all used as if ready.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        urls: list[str],
+        eject_errors: int = 2,
+        eject_seconds: float = 30.0,
+        latency_aware: bool = False,
+        *,
+        start_ready: bool = True,
+    ) -> None:
+        if not urls:
+            msg = f"No backends configured for '{name}'"
+            raise ValueError(msg)
+        self.name = name
+        self.urls = urls
+        self.eject_errors = eject_errors
+        self.eject_seconds = eject_seconds
+        self.latency_aware = latency_aware
+        self.start_ready = start_ready
+        self._reset()
+
+    def _reset(self) -> None:
+        self.backends = [Backend(url, ready=self.start_ready) for url in self.urls]
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._selections = 0
+        self._lock = threading.Lock()
+
+    def _score(self, backend: Backend) -> tuple[float, int]:
+        if self.latency_aware:
+            if self._selections - backend.last_selected >= PROBE_INTERVAL:
+                return (-1.0, backend.last_selected)
+            # Unmeasured backends score 0 and are tried first
+            return ((backend.latency_ewma or 0.0) * (backend.in_flight + 1), backend.last_selected)
+        return (backend.in_flight, backend.last_selected)
+
+    def _claim(self, backend: Backend) -> None:
+        """Count a request to ``backend`` (lock held)."""
+        self._selections += 1
+        backend.last_selected = self._selections
+        backend.in_flight += 1
+        backend.requests += 1
+
+    def _routable(self) -> list[Backend]:
+        """Backends ready for requests, or all of them while none is (lock held)."""
+        return [backend for backend in self.backends if backend.ready] or self.backends
+
+    def acquire(self) -> Backend:
+        """Choose a backend and count a request to it; release it with track()."""
+        now = time.monotonic()
+        with self._lock:
+            routable = self._routable()
+            healthy = [backend for backend in routable if not backend.ejected(now)]
+            if healthy:
+                backend = min(healthy, key=self._score)
+            else:
+                backend = min(routable, key=lambda b: b.ejected_until)
+            self._claim(backend)
+        return backend
+
+    def acquire_other(self, exclude: Collection[str]) -> Backend | None:
+        """Like acquire(), but only a healthy backend not in ``exclude``; None if there is none."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [b for b in self._routable() if b.url not in exclude and not b.ejected(now)]
+            if not healthy:
+                return None
+            backend = min(healthy, key=self._score)
+            self._claim(backend)
+        return backend
+
+    def _release(self, backend: Backend, seconds: float | None, error: httpx.HTTPError | None) -> None:
+        """Record the outcome of a request; ``seconds`` is None when it was abandoned (e.g. cancelled)."""
+        with self._lock:
+            backend.in_flight -= 1
+            if error is not None and is_backend_error(error):
+                backend.errors += 1
+                backend.consecutive_errors += 1
+                if backend.consecutive_errors >= self.eject_errors:
+                    backend.ejected_until = time.monotonic() + self.eject_seconds
+                return
+            if seconds is None:
+                return
+            backend.consecutive_errors = 0
+            if backend.latency_ewma is None:
+                backend.latency_ewma = seconds
+            else:
+                backend.latency_ewma += LATENCY_EWMA_ALPHA * (seconds - backend.latency_ewma)
+            self._latencies.append(seconds)
+
+    @contextmanager
+    def track(self, backend: Backend) -> Iterator[Backend]:
+        """Time one request to an acquired backend and release it afterwards.
+
+        httpx errors raised inside the block (call ``raise_for_status()`` there) count against it.
+        """
+        started = time.perf_counter()
+        try:
+            yield backend
+        except httpx.HTTPError as exc:
+            self._release(backend, time.perf_counter() - started, exc)
+            raise
+        except BaseException:
+            self._release(backend, None, None)
+            raise
+        self._release(backend, time.perf_counter() - started, None)
+
+    @contextmanager
+    def use(self, backend: Backend | None = None) -> Iterator[Backend]:
+        """Pick a backend (or use ``backend``) for the duration of one request."""
+        if backend is None:
+            backend = self.acquire()
+        else:
+            with self._lock:
+                self._claim(backend)
+        with self.track(backend):
+            yield backend
+
+    @contextmanager
+    def borrow(self) -> Iterator[Backend]:
+        """Like use(), but the request's outcome and latency do not count towards the backend's health.
+
+        For side requests, e.g. to another model, whose failures say nothing about serving this pool's.
+        """
+        backend = self.acquire()
+        try:
+            yield backend
+        finally:
+            self._release(backend, None, None)
+
+    def set_ready(self, backend: Backend, ready: bool) -> None:
+        """Let ``backend`` get requests, or keep it out of routing (e.g. while its model is missing)."""
+        with self._lock:
+            backend.ready = ready
+
+    def latency_percentile(self, fraction: float) -> float | None:
+        """Nearest-rank percentile of recent successful request times, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        index = max(0, min(len(samples) - 1, round(fraction * len(samples) + 0.5) - 1))
+        return samples[index]
+
+    def after_fork(self) -> None:
+        """Reset counters and the lock in a forked child; the parent's requests are not ours."""
+        self._reset()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return in-flight, request, error and latency counters per backend URL."""
+        now = time.monotonic()
+        with self._lock:
+            return {backend.url: backend.stats(now) for backend in self.backends}
+
+
+class HedgePolicy:
+    """Decide when a request still unanswered should also be sent to a second backend.
+
+    The hedge delay is the pool's recent ``percentile`` latency (at least ``min_delay``), so only
+    the slowest requests are duplicated; hedges are further capped at ``max_ratio`` of requests.
+    Hedging needs two or more backends and enough latency samples.
+    """
+
+    def __init__(self, pool: BackendPool, enabled: bool, percentile: float, min_delay: float, max_ratio: float) -> None:
+        self.pool = pool
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self._reset()
+
+    def _reset(self) -> None:
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def delay(self) -> float | None:
+        """Count a request and return how long to wait before hedging it, or None to not hedge."""
+        with self._lock:
+            self.requests += 1
+        if not self.enabled or len(self.pool.backends) < 2:  # noqa: PLR2004
+            return None
+        latency = self.pool.latency_percentile(self.percentile)
+        if latency is None:
+            return None
+        return max(latency, self.min_delay)
+
+    def allow(self) -> bool:
+        """Take a hedge from the budget, if there is room."""
+        with self._lock:
+            if self.hedged >= self.max_ratio * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedge_wins += 1
+
+    def after_fork(self) -> None:
+        self._reset()
+
+    def stats(self) -> dict[str, Any]:
+        delay = self.pool.latency_percentile(self.percentile)
+        with self._lock:
+            return {
+                "enabled": self.enabled and len(self.pool.backends) > 1,
+                "delay_seconds": None if delay is None else round(max(delay, self.min_delay), 3),
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            }
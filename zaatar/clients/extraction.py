@@ -0,0 +1,212 @@
+"""Process pool for CPU-bound content extraction (readability + html2text).
+
+Extraction holds the GIL for hundreds of milliseconds on large pages, so it runs in
+separate worker processes. Each task has a timeout; a worker that exceeds it (or dies)
+is killed and replaced, so a pathological page cannot hang the pool.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import multiprocessing
+import threading
+from typing import TYPE_CHECKING, Any
+
+from zaatar.settings import EXTRACTION_START_METHOD, EXTRACTION_TIMEOUT, EXTRACTION_WORKERS
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import BaseContext
+
+
+class ExtractionError(Exception):
+    """Raised when extraction fails, times out, or its worker process dies."""
+
+
+class ExtractionAbortedError(ExtractionError):
+    """Raised when extraction did not finish: it timed out or its worker process died."""
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker process loop: run (func, args) tasks until the pipe closes or None is received."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        func, args = task
+        try:
+            conn.send((True, func(*args)))
+        except Exception as exc:  # noqa: BLE001 - returned to the parent as a message
+            conn.send((False, f"{type(exc).__name__}: {exc}"))
+
+
+class _Worker:
+    def __init__(self, context: BaseContext) -> None:
+        self.conn, child_conn = context.Pipe()
+        # Every concrete context has Process, but typeshed does not declare it on BaseContext
+        self.process = context.Process(  # pyright: ignore[reportAttributeAccessIssue]
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class ExtractionPool:
+    """A fixed-size pool of extraction worker processes, started on first use.
+
+    ``run()`` blocks the calling thread (without holding the GIL) until a worker is free
+    and the task completes. With ``workers=0`` tasks run inline in the calling thread.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_WORKERS,
+        timeout: float = EXTRACTION_TIMEOUT,
+        start_method: str = EXTRACTION_START_METHOD,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(max(workers, 1))
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self.closed = False
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.started = 0
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self.started += 1
+        return _Worker(self._context)
+
+    def _discard(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self.started -= 1
+            self.restarts += 1
+
+    def _run_in_worker(self, func: Callable[..., Any], args: tuple[Any, ...]) -> tuple[bool, Any]:
+        worker = self._checkout()
+        try:
+            worker.conn.send((func, args))
+            # Workers always reply with an (ok, value) tuple, so None means no reply in time
+            result: tuple[bool, Any] | None = worker.conn.recv() if worker.conn.poll(self.timeout) else None
+        except (EOFError, OSError) as exc:
+            self._discard(worker)
+            msg = "Content extraction worker died"
+            raise ExtractionAbortedError(msg) from exc
+
+        if result is None:
+            # The worker may be stuck in C code (lxml), so it is killed rather than interrupted
+            self._discard(worker)
+            with self._lock:
+                self.timeouts += 1
+            msg = f"Content extraction timed out after {self.timeout}s"
+            raise ExtractionAbortedError(msg)
+
+        with self._lock:
+            if not self.closed:
+                self._idle.append(worker)
+                return result
+            self.started -= 1
+        worker.stop()
+        return result
+
+    def run(self, func: Callable[..., Any], *args: Any) -> Any:  # noqa: ANN401
+        """Run a picklable module-level function on a worker process and return its result.
+
+        Its exceptions are raised as ExtractionError, as they are from a worker process.
+        """
+        if self.workers <= 0:
+            try:
+                return func(*args)
+            except Exception as exc:
+                raise ExtractionError(f"{type(exc).__name__}: {exc}") from exc
+
+        with self._lock:
+            self.queued += 1
+        self._slots.acquire()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            ok, value = self._run_in_worker(func, args)
+        except ExtractionError:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+            self._slots.release()
+
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+        if not ok:
+            raise ExtractionError(value)
+        return value
+
+    def after_fork(self) -> None:
+        """Forget workers inherited by a forked child; they belong to the parent process."""
+        self._slots = threading.BoundedSemaphore(max(self.workers, 1))
+        self._idle = []
+        self._lock = threading.Lock()
+        self.closed = False
+        self.queued = self.active = self.started = 0
+
+    def close(self) -> None:
+        """Stop idle workers; busy workers are stopped when they are next returned."""
+        with self._lock:
+            self.closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self.started -= len(idle)
+        for worker in idle:
+            worker.stop()
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and task counters."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "workers_started": self.started,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts,
+            }
+
+
+extraction_pool = ExtractionPool()
+
+atexit.register(extraction_pool.close)
@@ -1,19 +1,102 @@
 """URL fetch + readability extraction + html2text conversion."""
 
+import asyncio
 import logging
+import time
+from collections import Counter, defaultdict, deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from functools import partial
 from urllib.parse import urlparse
 
 import html2text
 import httpx
 from readability import Document
 
-from zaatar.definitions import ALLOWED_SCHEMES
+from zaatar.cache import CacheStatus, TTLCache
+from zaatar.clients import lxml_extractor
+from zaatar.clients.extraction import ExtractionAbortedError, ExtractionError, extraction_pool
+from zaatar.clients.registry import FETCHER, get_async_client, get_client
+from zaatar.definitions import (
+    ALLOWED_SCHEMES,
+    HEURISTIC_FRESHNESS_FRACTION,
+    HEURISTIC_FRESHNESS_MAX,
+    HTML2TEXT_FEED_CHARS,
+    TEXT_CONTENT_TYPES,
+)
+from zaatar.metrics import EXTRACTION_CPU_SECONDS, FETCH_DOWNLOAD_BYTES, FETCH_DOWNLOAD_SECONDS
 from zaatar.models import FetchQuery, FetchResponse
-from zaatar.settings import FETCH_MAX_CHARS, FETCH_TIMEOUT
+from zaatar.settings import (
+    FETCH_BATCH_CONCURRENCY,
+    FETCH_BATCH_EXTRACT_WORKERS,
+    FETCH_BATCH_PER_HOST,
+    FETCH_BYTES_PER_CHAR,
+    FETCH_CACHE_MAX_BYTES,
+    FETCH_CACHE_MAX_SIZE,
+    FETCH_CACHE_RETENTION,
+    FETCH_MAX_BYTES,
+    FETCH_MAX_CHARS,
+    FETCH_MIN_BYTES,
+    HTTP_MAX_CONNECTIONS,
+)
+from zaatar.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class CachedPage:
+    """A fetched response with its HTTP validators and extracted output per extractMode."""
+
+    body: str
+    fresh_until: float
+    etag: str | None = None
+    last_modified: str | None = None
+    bytes_read: int = 0
+    truncated: bool = False
+    byte_budget: int = 0
+    extracted: dict[str, str] = field(default_factory=dict)
+    # Output prefixes per extractMode where extraction stopped at a maxChars budget
+    partial: dict[str, str] = field(default_factory=dict)
+    # Cache key, for re-measuring the cached page as extracted output is added
+    url: str = ""
+
+    @property
+    def size(self) -> int:
+        """Characters held by the body and extracted output, for the fetch cache's byte bound."""
+        extracted = sum(len(text) for text in self.extracted.values())
+        return len(self.body) + extracted + sum(len(text) for text in self.partial.values())
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+# Keyed on URL; HTTP freshness is tracked per entry, the TTL only bounds retention
+fetch_cache = TTLCache(max_size=FETCH_CACHE_MAX_SIZE, max_bytes=FETCH_CACHE_MAX_BYTES, sizeof=lambda page: page.size)
+fetch_flight = SingleFlight(FETCHER)
+extraction_flight = SingleFlight("extraction")
+
+# Deep search fetches; fetches past their deadline keep running here, and no more can be in flight than the
+# client pool allows
+_within_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="fetch-within")
+
+
 class FetchError(Exception):
     """Raised when URL fetching or extraction fails."""
 
@@ -26,40 +109,524 @@ def _validate_url(url: str) -> None:
         raise FetchError(msg)
 
 
-def _extract_content(html: str, extract_mode: str) -> str:
-    """Extract readable content from HTML."""
-    doc = Document(html)
-    readable_html = doc.summary()
-
+def _html2text_converter(text_only: bool) -> html2text.HTML2Text:
     converter = html2text.HTML2Text()
-    if extract_mode == "text":
+    if text_only:
         converter.ignore_links = True
         converter.ignore_images = True
         converter.ignore_emphasis = True
+    return converter
 
-    return converter.handle(readable_html).strip()
 
+def _readability_chunks(html: str, text_only: bool) -> Iterator[str]:
+    """Extract readable content with readability, then convert it with html2text incrementally.
+
+    The readable HTML is fed to html2text in slices cut just before a tag, and completed
+    output lines are wrapped and yielded as they are produced. Every chunk after the first
+    starts with a non-blank line, so wrapping chunks separately gives the same output as
+    HTML2Text.handle() on the whole document.
+    """
+    readable_html = Document(html).summary()
+    converter = _html2text_converter(text_only)
+    nbsp = html2text.config.UNIFIABLE["nbsp"]
+
+    pending = ""
+    position = 0
+    while position < len(readable_html):
+        end = readable_html.find("<", position + HTML2TEXT_FEED_CHARS)
+        if end < 0:
+            end = len(readable_html)
+        converter.feed(readable_html[position:end])
+        position = end
+
+        pending += "".join(converter.outtextlist)
+        converter.outtextlist.clear()
+        lines = pending.split("\n")
+        # Hold back the last complete non-blank line and everything after it
+        cut = next((index for index in range(len(lines) - 2, 0, -1) if lines[index]), 0)
+        if cut:
+            yield converter.optwrap("\n".join(lines[:cut]).replace(nbsp, " "))
+            pending = "\n".join(lines[cut:])
+
+    converter.feed("")
+    pending += converter.finish()
+    yield converter.optwrap(pending.replace(nbsp, " "))
+
+
+# An extractor yields a page's readable content as markdown or text chunks, in document order
+Extractor = Callable[[str], Iterator[str]]
+
+# Extraction engines per extractMode; the lxml engine scores and renders from a single parse
+EXTRACTORS: dict[str, Extractor] = {
+    "markdown": partial(_readability_chunks, text_only=False),
+    "text": partial(_readability_chunks, text_only=True),
+    "lxml-markdown": partial(lxml_extractor.iter_chunks, text_only=False),
+    "lxml-text": partial(lxml_extractor.iter_chunks, text_only=True),
+}
+
+
+def _extractor(extract_mode: str) -> Extractor:
+    extractor = EXTRACTORS.get(extract_mode)
+    if extractor is None:
+        msg = f"Unsupported extract mode: {extract_mode}"
+        raise FetchError(msg)
+    return extractor
+
+
+def _extract_content(html: str, extract_mode: str) -> str:
+    """Extract readable content from HTML with the engine registered for the mode."""
+    return "".join(_extractor(extract_mode)(html)).strip()
+
+
+def _extract_prefix(html: str, extract_mode: str, max_chars: int) -> tuple[str, bool]:
+    """Extract content until at least ``max_chars`` characters are available.
+
+    Returns ``(content, complete)``. When conversion stops early, content is a prefix of
+    _extract_content() at least ``max_chars`` long, so slicing it to the budget gives the
+    same result as slicing the full extraction. ``max_chars <= 0`` extracts everything.
+    """
+    if max_chars <= 0:
+        return _extract_content(html, extract_mode), True
+
+    chunks: list[str] = []
+    length = 0
+    for chunk in _extractor(extract_mode)(html):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length >= max_chars:
+            # Stripping keeps this a prefix of the full (stripped) output
+            content = "".join(chunks).strip()
+            if len(content) >= max_chars:
+                return content, False
+    return "".join(chunks).strip(), True
+
+
+def _timed_extract_prefix(html: str, extract_mode: str, max_chars: int) -> tuple[str, bool, float]:
+    """_extract_prefix(), also returning the CPU seconds the extracting thread spent on it."""
+    started = time.thread_time()
+    content, complete = _extract_prefix(html, extract_mode, max_chars)
+    return content, complete, time.thread_time() - started
+
+
+def _parse_cache_control(value: str) -> dict[str, str | None]:
+    """Parse a Cache-Control header into a directive -> argument mapping."""
+    directives: dict[str, str | None] = {}
+    for part in value.split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def _parse_http_date(value: str | None) -> float | None:
+    """Parse an HTTP date header into a POSIX timestamp."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except ValueError:
+        return None
+
+
+def _freshness_lifetime(headers: httpx.Headers) -> float | None:
+    """Return how long a response stays fresh in seconds, or None if it must not be stored."""
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0
+
+    age_header = headers.get("age", "")
+    age = int(age_header) if age_header.isdigit() else 0
+    for directive in ("s-maxage", "max-age"):
+        argument = directives.get(directive)
+        if argument is not None and argument.isdigit():
+            return max(0, int(argument) - age)
+
+    date = _parse_http_date(headers.get("date")) or time.time()
+    expires = _parse_http_date(headers.get("expires"))
+    if "expires" in headers:
+        # An invalid Expires value (e.g. "0") means already expired
+        return max(0, expires - date - age) if expires is not None else 0
+
+    last_modified = _parse_http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(HEURISTIC_FRESHNESS_MAX, max(0, (date - last_modified) * HEURISTIC_FRESHNESS_FRACTION))
+    return 0
+
+
+def _byte_budget(max_chars: int) -> int:
+    """Derive the download byte budget from the requested character budget."""
+    if max_chars <= 0:
+        return FETCH_MAX_BYTES
+    return max(FETCH_MIN_BYTES, min(FETCH_MAX_BYTES, max_chars * FETCH_BYTES_PER_CHAR))
+
+
+def _check_content_type(response: httpx.Response) -> None:
+    """Reject non-text responses from their headers, before reading the body."""
+    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not content_type:
+        return
+    if content_type.startswith("text/") or content_type in TEXT_CONTENT_TYPES or content_type.endswith("+xml"):
+        return
+    msg = f"Unsupported content type '{content_type}'. Only text and HTML pages can be fetched."
+    raise FetchError(msg)
+
+
+def _decode_body(response: httpx.Response, chunks: list[bytes]) -> str:
+    # A truncated body may end mid-character
+    return b"".join(chunks).decode(response.encoding or "utf-8", errors="replace")
+
+
+def _read_body(response: httpx.Response, max_bytes: int) -> tuple[str, int, bool]:
+    """Stream the (decompressed) body up to ``max_bytes``, returning ``(text, bytes_read, truncated)``."""
+    chunks: list[bytes] = []
+    bytes_read = 0
+    truncated = False
+    for chunk in response.iter_bytes():
+        if bytes_read + len(chunk) > max_bytes:
+            # Stop reading; leaving the stream context closes the connection mid-download
+            chunks.append(chunk[: max_bytes - bytes_read])
+            bytes_read = max_bytes
+            truncated = True
+            break
+        chunks.append(chunk)
+        bytes_read += len(chunk)
+    return _decode_body(response, chunks), bytes_read, truncated
+
+
+async def _aread_body(response: httpx.Response, max_bytes: int) -> tuple[str, int, bool]:
+    """Async variant of _read_body()."""
+    chunks: list[bytes] = []
+    bytes_read = 0
+    truncated = False
+    async for chunk in response.aiter_bytes():
+        if bytes_read + len(chunk) > max_bytes:
+            # Stop reading; leaving the stream context closes the connection mid-download
+            chunks.append(chunk[: max_bytes - bytes_read])
+            bytes_read = max_bytes
+            truncated = True
+            break
+        chunks.append(chunk)
+        bytes_read += len(chunk)
+    return _decode_body(response, chunks), bytes_read, truncated
+
+
+def _observe_download(started: float, bytes_read: int) -> None:
+    FETCH_DOWNLOAD_SECONDS.observe(time.perf_counter() - started)
+    FETCH_DOWNLOAD_BYTES.observe(bytes_read)
+
+
+def _new_page(url: str, response: httpx.Response, body: tuple[str, int, bool], max_bytes: int) -> CachedPage:
+    """Build a page from a downloaded 200 response, caching it if it is fresh or can be revalidated."""
+    text, bytes_read, truncated = body
+    lifetime = _freshness_lifetime(response.headers)
+    page = CachedPage(
+        body=text,
+        fresh_until=time.time() + (lifetime or 0),
+        etag=response.headers.get("etag"),
+        last_modified=response.headers.get("last-modified"),
+        bytes_read=bytes_read,
+        truncated=truncated,
+        byte_budget=max_bytes,
+        url=url,
+    )
+    if not fetch_cache.enabled or lifetime is None or not (lifetime > 0 or page.has_validators):
+        return page
+    fetch_cache.set(url, page, FETCH_CACHE_RETENTION)
+    return page
+
+
+def _revalidated(page: CachedPage, response: httpx.Response) -> CachedPage:
+    """Refresh a cached page's freshness and validators from a 304 response."""
+    lifetime = _freshness_lifetime(response.headers)
+    page.fresh_until = time.time() + (lifetime or 0)
+    page.etag = response.headers.get("etag", page.etag)
+    page.last_modified = response.headers.get("last-modified", page.last_modified)
+    return page
 
-def fetch(query: FetchQuery) -> FetchResponse:
-    """Fetch a URL, extract readable content, and return the response."""
-    _validate_url(query.url)
 
-    max_chars = query.maxChars if query.maxChars is not None else FETCH_MAX_CHARS
+def _cached_page(url: str, max_bytes: int) -> CachedPage | None:
+    """Return the cached page for a URL, unless it was truncated below the requested budget."""
+    if not fetch_cache.enabled:
+        return None
+    page, _status = fetch_cache.get(url)
+    if page is not None and page.truncated and page.byte_budget < max_bytes:
+        return None
+    return page
 
-    logger.debug(f"Fetching URL: {query.url} mode={query.extractMode} max_chars={max_chars}")
 
-    with httpx.Client(timeout=FETCH_TIMEOUT, follow_redirects=True) as client:
-        response = client.get(query.url)
+def _get_page(url: str, max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+    """Return the page body from the cache, revalidating or downloading as needed.
+
+    The body is streamed and reading stops at ``max_bytes``; non-text content types are
+    rejected from the headers before any of the body is read.
+    """
+    page = _cached_page(url, max_bytes)
+    if page is not None and page.is_fresh:
+        return page, CacheStatus.HIT
+
+    headers = page.conditional_headers() if page is not None else {}
+    started = time.perf_counter()
+    with get_client(FETCHER).stream("GET", url, headers=headers) as response:
+        if page is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            logger.debug(f"Revalidated cached page: {url}")
+            _observe_download(started, 0)
+            return _revalidated(page, response), CacheStatus.REVALIDATED
+        response.raise_for_status()
+        _check_content_type(response)
+        body = _read_body(response, max_bytes)
+    _observe_download(started, body[1])
+
+    return _new_page(url, response, body, max_bytes), CacheStatus.MISS if fetch_cache.enabled else CacheStatus.BYPASS
+
+
+async def _async_get_page(url: str, max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+    """Async variant of _get_page() using the pooled httpx.AsyncClient."""
+    page = _cached_page(url, max_bytes)
+    if page is not None and page.is_fresh:
+        return page, CacheStatus.HIT
+
+    headers = page.conditional_headers() if page is not None else {}
+    started = time.perf_counter()
+    async with get_async_client(FETCHER).stream("GET", url, headers=headers) as response:
+        if page is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+            logger.debug(f"Revalidated cached page: {url}")
+            _observe_download(started, 0)
+            return _revalidated(page, response), CacheStatus.REVALIDATED
         response.raise_for_status()
+        _check_content_type(response)
+        body = await _aread_body(response, max_bytes)
+    _observe_download(started, body[1])
+
+    return _new_page(url, response, body, max_bytes), CacheStatus.MISS if fetch_cache.enabled else CacheStatus.BYPASS
+
+
+def _shared_page(url: str, max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+    """_get_page(), with concurrent calls for the same URL and budget sharing one download."""
+    return fetch_flight.do(f"{max_bytes} {url}", _get_page, url, max_bytes)
+
+
+async def _async_shared_page(url: str, max_bytes: int) -> tuple[CachedPage, CacheStatus]:
+    """_async_get_page(), with concurrent calls for the same URL and budget sharing one download."""
+    return await fetch_flight.ado(f"{max_bytes} {url}", _async_get_page, url, max_bytes)
+
+
+def _page_content(page: CachedPage, extract_mode: str, max_chars: int) -> str:
+    """Return at least ``max_chars`` of the page's extracted content for a mode.
+
+    Extraction stops once the budget is met; the partial output is cached and reused by
+    requests with the same or a smaller budget, and a larger budget extracts again.
+    Concurrent requests for the same page, mode and budget share one extraction.
+    """
+    content = page.extracted.get(extract_mode)
+    if content is not None:
+        return content
+    prefix = page.partial.get(extract_mode)
+    if prefix is not None and 0 < max_chars <= len(prefix):
+        return prefix
 
-    content = _extract_content(response.text, query.extractMode)
+    return extraction_flight.do(f"{id(page)} {extract_mode} {max_chars}", _extract_page, page, extract_mode, max_chars)
 
+
+def _extract_page(page: CachedPage, extract_mode: str, max_chars: int) -> str:
+    """Extract a page on the extraction process pool and cache the output on the page.
+
+    A page the extractor fails on is reported as a FetchError; an extraction that times out or
+    loses its worker process raises ExtractionAbortedError.
+    """
+    try:
+        content, complete, cpu_seconds = extraction_pool.run(_timed_extract_prefix, page.body, extract_mode, max_chars)
+    except ExtractionAbortedError as exc:
+        logger.warning(f"Extraction aborted (mode={extract_mode}): {exc}")
+        raise
+    except ExtractionError as exc:
+        logger.warning(f"Extraction failed (mode={extract_mode}): {exc}")
+        raise FetchError(str(exc)) from exc
+    EXTRACTION_CPU_SECONDS.observe(cpu_seconds, mode=extract_mode)
+    if complete:
+        page.extracted[extract_mode] = content
+        page.partial.pop(extract_mode, None)
+    else:
+        page.partial[extract_mode] = content
+    if page.url:
+        fetch_cache.resize(page.url)
+    return content
+
+
+def _max_chars(query: FetchQuery) -> int:
+    return query.maxChars if query.maxChars is not None else FETCH_MAX_CHARS
+
+
+def _build_response(query: FetchQuery, page: CachedPage, content: str, status: CacheStatus) -> FetchResponse:
+    max_chars = _max_chars(query)
     if max_chars > 0:
         content = content[:max_chars]
 
-    return FetchResponse(
+    result = FetchResponse(
         url=query.url,
         content=content,
         extract_mode=query.extractMode,
         content_length=len(content),
+        bytes_read=page.bytes_read,
+        truncated=page.truncated,
+    )
+    result._cache_status = status
+    return result
+
+
+def fetch(query: FetchQuery) -> FetchResponse:
+    """Fetch a URL, extract readable content, and return the response.
+
+    The body is streamed with a byte budget derived from maxChars. Responses are cached
+    per URL following Cache-Control/Expires; stale entries are revalidated with
+    If-None-Match/If-Modified-Since, and a 304 reuses the cached body and extracted content.
+    """
+    _validate_url(query.url)
+
+    max_chars = _max_chars(query)
+    max_bytes = _byte_budget(max_chars)
+
+    logger.debug(f"Fetching URL: {query.url} mode={query.extractMode} max_chars={max_chars} max_bytes={max_bytes}")
+
+    page, status = _shared_page(query.url, max_bytes)
+    content = _page_content(page, query.extractMode, max_chars)
+    return _build_response(query, page, content, status)
+
+
+async def async_fetch(query: FetchQuery) -> FetchResponse:
+    """Async variant of fetch(); the wait for the extraction pool runs in a worker thread."""
+    _validate_url(query.url)
+
+    max_chars = _max_chars(query)
+    max_bytes = _byte_budget(max_chars)
+
+    logger.debug(
+        f"Fetching URL (async): {query.url} mode={query.extractMode} max_chars={max_chars} max_bytes={max_bytes}"
     )
+
+    page, status = await _async_shared_page(query.url, max_bytes)
+    content = await asyncio.to_thread(_page_content, page, query.extractMode, max_chars)
+    return _build_response(query, page, content, status)
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def fetch_batch(
+    queries: list[FetchQuery],
+    concurrency: int = FETCH_BATCH_CONCURRENCY,
+    per_host: int = FETCH_BATCH_PER_HOST,
+) -> list[FetchResponse | Exception]:
+    """Fetch many URLs concurrently, returning a response or the raised exception per query.
+
+    Downloads run on up to ``concurrency`` threads with at most ``per_host`` in flight per
+    host. A URL is handed to a download thread only once its host has a free slot, so URLs
+    queued for a busy host do not hold threads that other hosts could use. Extraction is
+    pipelined: each page is handed to a separate extraction pool as soon as its download
+    completes, freeing the download slot for the next URL.
+    """
+
+    def download(query: FetchQuery) -> tuple[CachedPage, CacheStatus]:
+        _validate_url(query.url)
+        return _shared_page(query.url, _byte_budget(_max_chars(query)))
+
+    def extract(query: FetchQuery, page: CachedPage, status: CacheStatus) -> FetchResponse:
+        return _build_response(query, page, _page_content(page, query.extractMode, _max_chars(query)), status)
+
+    # Indexes of the URLs not yet downloading, per host in input order, and downloads running per host
+    waiting: defaultdict[str, deque[int]] = defaultdict(deque)
+    for index, query in enumerate(queries):
+        waiting[_host(query.url)].append(index)
+    running: Counter[str] = Counter()
+
+    results: list[FetchResponse | Exception] = [FetchError("Not fetched")] * len(queries)
+    with (
+        ThreadPoolExecutor(max_workers=min(concurrency, len(queries)), thread_name_prefix="fetch-dl") as downloads,
+        ThreadPoolExecutor(max_workers=FETCH_BATCH_EXTRACT_WORKERS, thread_name_prefix="fetch-extract") as extractions,
+    ):
+        download_futures: dict[Future[tuple[CachedPage, CacheStatus]], int] = {}
+        extract_futures: dict[Future[FetchResponse], int] = {}
+
+        def start_downloads() -> None:
+            for host, indexes in waiting.items():
+                while indexes and running[host] < per_host and len(download_futures) < concurrency:
+                    index = indexes.popleft()
+                    running[host] += 1
+                    download_futures[downloads.submit(download, queries[index])] = index
+
+        start_downloads()
+        while download_futures:
+            done, _pending = wait(download_futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = download_futures.pop(future)
+                running[_host(queries[index].url)] -= 1
+                try:
+                    page, status = future.result()
+                except Exception as exc:  # noqa: BLE001 - reported per item
+                    results[index] = exc
+                    continue
+                extract_futures[extractions.submit(extract, queries[index], page, status)] = index
+            start_downloads()
+
+        for future, index in extract_futures.items():
+            try:
+                results[index] = future.result()
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                results[index] = exc
+
+    return results
+
+
+def _not_finished(query: FetchQuery, budget: float) -> TimeoutError:
+    return TimeoutError(f"Fetch of {query.url} did not finish within {budget}s")
+
+
+def fetch_within(queries: list[FetchQuery], budget: float) -> list[FetchResponse | Exception]:
+    """Fetch URLs concurrently within a shared ``budget`` (seconds), returning a response or exception per query.
+
+    Fetches still running at the deadline are reported as TimeoutError; they are left to finish
+    in the background, so their pages are cached for the next request. Fetches not yet started
+    (the shared executor was busy) are cancelled.
+    """
+    results: list[FetchResponse | Exception] = [_not_finished(query, budget) for query in queries]
+    futures = {_within_executor.submit(fetch, query): index for index, query in enumerate(queries)}
+    try:
+        for future in as_completed(futures, timeout=budget):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                results[futures[future]] = exc
+    except TimeoutError:
+        cancelled = sum(future.cancel() for future in futures)
+        unfinished = sum(not future.done() for future in futures)
+        logger.debug(f"{unfinished} fetches unfinished and {cancelled} not started after {budget}s")
+    return results
+
+
+def reset_executor() -> None:
+    """Replace the deep search fetch executor in a forked child; the parent's threads are not inherited."""
+    global _within_executor  # noqa: PLW0603
+    _within_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="fetch-within")
+
+
+async def async_fetch_within(queries: list[FetchQuery], budget: float) -> list[FetchResponse | Exception]:
+    """Async variant of fetch_within(); fetches still running at the deadline are cancelled."""
+    tasks = [asyncio.create_task(async_fetch(query)) for query in queries]
+    done, pending = await asyncio.wait(tasks, timeout=budget)
+    for task in pending:
+        task.cancel()
+    results: list[FetchResponse | Exception] = []
+    for query, task in zip(queries, tasks, strict=True):
+        if task not in done:
+            results.append(_not_finished(query, budget))
+            continue
+        exc = task.exception()
+        if exc is None:
+            results.append(task.result())
+        elif isinstance(exc, Exception):
+            results.append(exc)
+        else:
+            raise exc
+    return results
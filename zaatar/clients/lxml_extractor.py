@@ -0,0 +1,318 @@
+"""Single-pass content extraction: score and render readable content from one lxml tree.
+
+The readability + html2text engine parses the page, serializes the readable part back to
+HTML, then re-parses it in pure Python. This engine parses once with lxml, picks the main
+content container with readability-style paragraph scoring, and emits markdown (or plain
+text) straight from that subtree, following html2text's output conventions.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+import lxml.etree
+import lxml.html
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from lxml.html import HtmlElement
+
+# Elements that never hold readable content
+REMOVED_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "svg",
+    "form",
+    "nav",
+    "aside",
+    "footer",
+    "button",
+    "select",
+    "template",
+    "link",
+    "meta",
+)
+UNLIKELY_CANDIDATES = re.compile(
+    r"comment|sidebar|footer|menu|share|social|sponsor|advert|banner|popup|cookie|breadcrumb|related|promo",
+    re.IGNORECASE,
+)
+POSITIVE_NAMES = re.compile(r"article|body|content|entry|main|post|story|text|blog", re.IGNORECASE)
+NEGATIVE_NAMES = re.compile(
+    r"comment|meta|footer|footnote|sidebar|widget|share|social|sponsor|masthead|combx|outbrain", re.IGNORECASE
+)
+TAG_SCORES = {"div": 5, "article": 5, "pre": 3, "td": 3, "blockquote": 3, "ul": -3, "ol": -3, "th": -5}
+SCORED_TAGS = ("p", "pre", "td")
+MIN_PARAGRAPH_LENGTH = 25
+MIN_SIBLING_SCORE = 10.0
+SIBLING_SCORE_FRACTION = 0.2
+LONG_PARAGRAPH_LENGTH = 80
+MAX_PARAGRAPH_LINK_DENSITY = 0.25
+
+BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "blockquote",
+        "center",
+        "dd",
+        "details",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "summary",
+        "table",
+        "tbody",
+        "thead",
+        "tfoot",
+        "tr",
+        "ul",
+    }
+)
+INLINE_MARKUP = {"strong": "**", "b": "**", "em": "_", "i": "_", "code": "`"}
+HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+# Marks a <br> inside inline text so whitespace collapsing keeps the line break
+_LINE_BREAK = "\x00"
+_WHITESPACE = re.compile(r"[ \t\r\n\f\v]+")
+
+
+def _class_weight(element: HtmlElement) -> int:
+    weight = 0
+    for name in (element.get("class"), element.get("id")):
+        if not name:
+            continue
+        if POSITIVE_NAMES.search(name):
+            weight += 25
+        if NEGATIVE_NAMES.search(name):
+            weight -= 25
+    return weight
+
+
+def _is_unlikely(element: HtmlElement) -> bool:
+    if element.tag in ("html", "body", "article", "main"):
+        return False
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    return bool(UNLIKELY_CANDIDATES.search(names)) and not POSITIVE_NAMES.search(names)
+
+
+def _link_density(element: HtmlElement) -> float:
+    length = len(element.text_content())
+    if length == 0:
+        return 0.0
+    link_length = sum(len(link.text_content()) for link in element.iter("a"))
+    return link_length / length
+
+
+def _parse(html: str) -> HtmlElement:
+    # Parse bytes so documents with an XML encoding declaration are accepted
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    return lxml.html.document_fromstring(html.encode("utf-8", errors="replace"), parser=parser)
+
+
+def _clean(doc: HtmlElement) -> None:
+    """Remove non-content elements in place (text following them is kept)."""
+    lxml.etree.strip_elements(doc, lxml.etree.Comment, *REMOVED_TAGS, with_tail=False)
+    unlikely = [element for element in doc.iter() if isinstance(element.tag, str) and _is_unlikely(element)]
+    for element in unlikely:
+        if element.getparent() is not None:
+            element.drop_tree()
+
+
+def _score_candidates(doc: HtmlElement) -> dict[HtmlElement, float]:
+    """Score paragraph containers: each paragraph adds to its parent, and half to its grandparent."""
+    scores: dict[HtmlElement, float] = {}
+
+    def add(element: HtmlElement, score: float) -> None:
+        if element not in scores:
+            scores[element] = TAG_SCORES.get(element.tag, 0) + _class_weight(element)
+        scores[element] += score
+
+    for paragraph in doc.iter(*SCORED_TAGS):
+        text = paragraph.text_content()
+        parent = paragraph.getparent()
+        if len(text) < MIN_PARAGRAPH_LENGTH or parent is None:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        add(parent, score)
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            add(grandparent, score / 2)
+
+    return {element: score * (1 - _link_density(element)) for element, score in scores.items()}
+
+
+def _is_content_paragraph(element: HtmlElement) -> bool:
+    """Whether an unscored sibling paragraph of the best candidate reads like body text."""
+    if element.tag != "p":
+        return False
+    length = len(element.text_content())
+    density = _link_density(element)
+    if length > LONG_PARAGRAPH_LENGTH:
+        return density < MAX_PARAGRAPH_LINK_DENSITY
+    return length > 0 and density == 0 and ". " in element.text_content()
+
+
+def _content_root(doc: HtmlElement) -> list[HtmlElement]:
+    """Return the highest scoring content container, plus any siblings that look like content."""
+    scores = _score_candidates(doc)
+    if not scores:
+        body = doc.find("body")
+        return [body if body is not None else doc]
+
+    best = max(scores, key=scores.__getitem__)
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+
+    threshold = max(MIN_SIBLING_SCORE, scores[best] * SIBLING_SCORE_FRACTION)
+    return [
+        sibling
+        for sibling in parent
+        if sibling is best or scores.get(sibling, 0) >= threshold or _is_content_paragraph(sibling)
+    ]
+
+
+class _Renderer:
+    """Render an lxml subtree as markdown blocks (or plain text when ``text_only``)."""
+
+    def __init__(self, text_only: bool) -> None:
+        self.text_only = text_only
+
+    def inline(self, element: HtmlElement) -> str:
+        """Render an element's content (text, inline children, and their tails) as one line."""
+        parts = [element.text or ""]
+        for child in element:
+            if isinstance(child.tag, str):
+                parts.append(self._inline_element(child))
+            parts.append(child.tail or "")
+        return "".join(parts)
+
+    def _inline_element(self, element: HtmlElement) -> str:
+        tag = element.tag
+        if tag == "br":
+            return _LINE_BREAK
+        if tag == "img":
+            if self.text_only:
+                return ""
+            return f"![{element.get('alt', '')}]({element.get('src', '')})"
+        text = self.inline(element)
+        if self.text_only or not text.strip():
+            return text
+        if tag == "a" and element.get("href"):
+            return f"[{_collapse(text)}]({element.get('href')})"
+        markup = INLINE_MARKUP.get(tag)
+        return f"{markup}{_collapse(text)}{markup}" if markup else text
+
+    def blocks(self, element: HtmlElement) -> Iterator[str]:
+        """Yield the element's content as markdown blocks, in document order."""
+        parts = [element.text or ""]
+        for child in element:
+            if isinstance(child.tag, str) and child.tag in BLOCK_TAGS:
+                if text := _collapse("".join(parts)):
+                    yield text
+                parts.clear()
+                yield from self._block(child)
+            elif isinstance(child.tag, str):
+                parts.append(self._inline_element(child))
+            parts.append(child.tail or "")
+        if text := _collapse("".join(parts)):
+            yield text
+
+    def _block(self, element: HtmlElement) -> Iterator[str]:
+        tag = element.tag
+        if tag in HEADINGS:
+            if text := _collapse(self.inline(element)):
+                yield f"{'#' * HEADINGS[tag]} {text}"
+        elif tag in ("ul", "ol"):
+            if text := "\n".join(self._list_items(element, depth=0)):
+                yield text
+        elif tag == "pre":
+            code = element.text_content().strip("\n")
+            if code.strip():
+                yield "\n".join(f"    {line}" for line in code.splitlines())
+        elif tag == "blockquote":
+            quoted = "\n\n".join(self.blocks(element))
+            if quoted:
+                yield "\n".join(f"> {line}" if line else ">" for line in quoted.splitlines())
+        elif tag == "hr":
+            yield "* * *"
+        elif tag == "table":
+            if text := "\n".join(self._table_rows(element)):
+                yield text
+        else:
+            yield from self.blocks(element)
+
+    def _list_items(self, element: HtmlElement, depth: int) -> Iterator[str]:
+        indent = "  " * (depth + 1)
+        ordered = element.tag == "ol"
+        for index, item in enumerate(element.iterchildren("li"), start=1):
+            marker = f"{index}." if ordered else "*"
+            # Nested lists are rendered as indented items after their parent item's text
+            nested = [child for child in item if child.tag in ("ul", "ol")]
+            yield f"{indent}{marker} {self._item_text(item, nested)}"
+            for child in nested:
+                yield from self._list_items(child, depth + 1)
+
+    def _item_text(self, item: HtmlElement, nested: list[HtmlElement]) -> str:
+        parts = [item.text or ""]
+        for child in item:
+            if child in nested:
+                pass
+            elif isinstance(child.tag, str) and child.tag in BLOCK_TAGS:
+                parts.append(" " + " ".join(self.blocks(child)) + " ")
+            elif isinstance(child.tag, str):
+                parts.append(self._inline_element(child))
+            parts.append(child.tail or "")
+        return _collapse("".join(parts))
+
+    def _table_rows(self, table: HtmlElement) -> Iterator[str]:
+        for row in table.iter("tr"):
+            cells = [_collapse(self.inline(cell)) for cell in row if cell.tag in ("td", "th")]
+            if any(cells):
+                yield " | ".join(cells)
+
+
+def _collapse(text: str) -> str:
+    """Collapse whitespace runs to single spaces, keeping <br> line breaks."""
+    lines = _WHITESPACE.sub(" ", text).split(_LINE_BREAK)
+    return "\n".join(line.strip() for line in lines).strip()
+
+
+def iter_blocks(html: str, text_only: bool = False) -> Iterator[str]:
+    """Yield the page's readable content as markdown (or plain text) blocks."""
+    doc = _parse(html)
+    _clean(doc)
+    renderer = _Renderer(text_only)
+    for root in _content_root(doc):
+        yield from renderer._block(root)
+
+
+def iter_chunks(html: str, text_only: bool = False) -> Iterator[str]:
+    """Yield the output of extract() incrementally, one block (with its separator) at a time."""
+    for index, block in enumerate(iter_blocks(html, text_only)):
+        yield block if index == 0 else f"\n\n{block}"
+
+
+def extract(html: str, text_only: bool = False) -> str:
+    """Extract the page's readable content, with blocks separated by blank lines."""
+    return "".join(iter_chunks(html, text_only)).strip()
@@ -1,10 +1,56 @@
 """Ollama LLM client for search result summarization."""
 
+from __future__ import annotations
+
+import hashlib
+import json
 import logging
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
-from zaatar.settings import OLLAMA_BASE_URL, OLLAMA_MODEL, OLLAMA_TIMEOUT
+from zaatar.admission import AdmissionGate, AdmissionRejectedError
+from zaatar.cache import PersistentCache
+from zaatar.clients.backends import Backend, BackendPool
+from zaatar.clients.registry import OLLAMA, get_async_client, get_client
+from zaatar.metrics import (
+    OLLAMA_PROMPT_TOKENS,
+    OLLAMA_RESPONSE_TOKENS,
+    OLLAMA_SECONDS,
+    SUMMARIES_SHED,
+    SUMMARY_QUEUE_WAIT_SECONDS,
+)
+from zaatar.models import SummaryBudget
+from zaatar.prompt import SummaryPrompt, build_summary_prompt, estimate_tokens
+from zaatar.semantic import SemanticIndex, result_urls
+from zaatar.settings import (
+    OLLAMA_BASE_URLS,
+    OLLAMA_EJECT_ERRORS,
+    OLLAMA_EJECT_SECONDS,
+    OLLAMA_EMBED_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_MODEL,
+    OLLAMA_NUM_CTX,
+    OLLAMA_NUM_PREDICT,
+    SEMANTIC_CACHE_MAX_SIZE,
+    SEMANTIC_CACHE_MIN_URL_OVERLAP,
+    SEMANTIC_CACHE_THRESHOLD,
+    SUMMARY_CACHE_DISK_MAX_SIZE,
+    SUMMARY_CACHE_MAX_SIZE,
+    SUMMARY_CACHE_PATH,
+    SUMMARY_CACHE_TTL,
+    SUMMARY_MAX_ACTIVE,
+    SUMMARY_MAX_QUEUED,
+    SUMMARY_MAX_WAIT,
+)
+from zaatar.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+
+# Model pulls can download several GB; use a generous timeout
+PULL_TIMEOUT = 600
 
 logger = logging.getLogger(__name__)
 
@@ -16,61 +62,365 @@ SUMMARIZE_SYSTEM_PROMPT = (
     "Do not invent information beyond what the search results provide."
 )
 
+summary_cache = PersistentCache(
+    max_size=SUMMARY_CACHE_MAX_SIZE,
+    ttl=SUMMARY_CACHE_TTL,
+    path=SUMMARY_CACHE_PATH,
+    disk_max_size=SUMMARY_CACHE_DISK_MAX_SIZE,
+)
+summary_flight = SingleFlight(OLLAMA)
+# A backend gets summaries once the warm-up has pulled and loaded the model there
+ollama_backends = BackendPool(
+    OLLAMA, OLLAMA_BASE_URLS, eject_errors=OLLAMA_EJECT_ERRORS, eject_seconds=OLLAMA_EJECT_SECONDS, start_ready=False
+)
+summary_admission = AdmissionGate(OLLAMA, SUMMARY_MAX_ACTIVE, SUMMARY_MAX_QUEUED, SUMMARY_MAX_WAIT)
+semantic_summaries = SemanticIndex(
+    SEMANTIC_CACHE_MAX_SIZE, SUMMARY_CACHE_TTL, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_MIN_URL_OVERLAP
+)
+if SEMANTIC_CACHE_MAX_SIZE > 0 and not semantic_summaries.enabled:
+    logger.warning("SEMANTIC_CACHE_MAX_SIZE is set but numpy is not installed; the semantic summary cache is disabled")
 
-def _is_model_available(model: str) -> bool:
-    """Check if a model is already available locally in Ollama."""
-    url = f"{OLLAMA_BASE_URL}/api/tags"
-    with httpx.Client(timeout=OLLAMA_TIMEOUT) as client:
-        response = client.get(url)
-        response.raise_for_status()
-        data = response.json()
+
+def _is_model_available(model: str, base_url: str) -> bool:
+    """Check if a model is already available locally in the Ollama instance at base_url."""
+    url = f"{base_url}/api/tags"
+    response = get_client(OLLAMA).get(url)
+    response.raise_for_status()
+    data = response.json()
 
     local_models: list[str] = [m.get("model", "") for m in data.get("models", [])]
     return model in local_models
 
 
-def pull_model(model: str = OLLAMA_MODEL) -> None:
-    """Pull (download) the configured model from Ollama if not already available."""
-    if _is_model_available(model):
-        logger.info(f"Ollama model '{model}' is already available.")
+def _on_every_backend(model: str, step: Callable[[Backend], None]) -> None:
+    """Run ``step(backend)`` against every Ollama backend; raise only if it failed on all of them.
+
+    The steps are not routed requests, so they do not count as in flight. For the summarization
+    model, a backend gets summaries only while its last step succeeded.
+    """
+    error: httpx.HTTPError | None = None
+    succeeded = False
+    for backend in ollama_backends.backends:
+        try:
+            step(backend)
+        except httpx.HTTPError as exc:
+            logger.warning(f"Ollama backend {backend.url} failed: {exc!r}")
+            error = exc
+            ready = False
+        else:
+            succeeded = ready = True
+        if model == OLLAMA_MODEL:
+            ollama_backends.set_ready(backend, ready)
+    if not succeeded and error is not None:
+        raise error
+
+
+def _pull_on(model: str, base_url: str) -> None:
+    if _is_model_available(model, base_url):
+        logger.info(f"Ollama model '{model}' is already available on {base_url}.")
         return
 
-    url = f"{OLLAMA_BASE_URL}/api/pull"
+    url = f"{base_url}/api/pull"
     payload = {"model": model, "stream": False}
 
-    logger.info(f"Pulling Ollama model '{model}' from {OLLAMA_BASE_URL} ...")
+    logger.info(f"Pulling Ollama model '{model}' from {base_url} ...")
 
-    # Model pulls can download several GB; use a generous timeout
-    with httpx.Client(timeout=600) as client:
-        response = client.post(url, json=payload)
-        response.raise_for_status()
+    response = get_client(OLLAMA).post(url, json=payload, timeout=PULL_TIMEOUT)
+    response.raise_for_status()
 
-    logger.info(f"Ollama model '{model}' is ready.")
+    logger.info(f"Ollama model '{model}' is ready on {base_url}.")
 
 
-def summarize(query: str, results: list[dict[str, str]], model: str = OLLAMA_MODEL) -> str:
-    """Summarize search results using the configured Ollama model."""
-    formatted_results = "\n".join(f"- [{r['title']}]({r['url']}): {r['description']}" for r in results)
+def pull_model(model: str = OLLAMA_MODEL) -> None:
+    """Pull (download) the configured model on every Ollama backend where it is not already available."""
+    _on_every_backend(model, lambda backend: _pull_on(model, backend.url))
+
+
+def _warm_on(model: str, backend: Backend) -> None:
+    if model == OLLAMA_MODEL and not backend.ready:
+        # Out of routing since a failed pull or warm-up; the model may have been removed there
+        _pull_on(model, backend.url)
+    url = f"{backend.url}/api/generate"
+    # Load with the summarization num_ctx; a different context size would make Ollama reload the model
+    payload = {"model": model, "keep_alive": OLLAMA_KEEP_ALIVE, "options": {"num_ctx": OLLAMA_NUM_CTX}}
+    response = get_client(OLLAMA).post(url, json=payload)
+    response.raise_for_status()
+
 
-    prompt = (
-        f"Search query: {query}\n\n"
-        f"Search results:\n{formatted_results}\n\n"
-        "Provide a concise summary answering the query based on these results."
+def warm_model(model: str = OLLAMA_MODEL) -> None:
+    """Load the model into each backend's memory (an empty generate request) and reset its keep_alive timer."""
+    _on_every_backend(model, lambda backend: _warm_on(model, backend))
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _summary_cache_key(query: str, results: list[dict[str, str]], model: str) -> str:
+    """Fingerprint the model, system prompt, token budget, normalized query and ordered result set."""
+    normalized_query = _normalize_query(query)
+    fingerprint = json.dumps(
+        [
+            model,
+            SUMMARIZE_SYSTEM_PROMPT,
+            OLLAMA_NUM_CTX,
+            OLLAMA_NUM_PREDICT,
+            normalized_query,
+            [(r["url"], r["title"], r["description"], r.get("content")) for r in results],
+        ]
+    )
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def summary_prompt(query: str, results: list[dict[str, str]]) -> SummaryPrompt:
+    """Build the summarization prompt within the OLLAMA_NUM_CTX / OLLAMA_NUM_PREDICT budget."""
+    return build_summary_prompt(
+        query,
+        results,
+        context_tokens=OLLAMA_NUM_CTX,
+        max_tokens=OLLAMA_NUM_PREDICT,
+        reserved_tokens=estimate_tokens(SUMMARIZE_SYSTEM_PROMPT),
     )
 
-    url = f"{OLLAMA_BASE_URL}/api/generate"
-    payload = {
+
+def summary_budget(query: str, results: list[dict[str, str]]) -> SummaryBudget:
+    """Describe the token budget and trimming applied to the summarization prompt, for the response."""
+    return SummaryBudget(**summary_prompt(query, results).metadata())
+
+
+def _generate_payload(query: str, results: list[dict[str, str]], model: str, stream: bool) -> dict[str, Any]:
+    """Build the /api/generate request body."""
+    return {
         "model": model,
-        "prompt": prompt,
+        "prompt": summary_prompt(query, results).prompt,
         "system": SUMMARIZE_SYSTEM_PROMPT,
-        "stream": False,
+        "stream": stream,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {"num_ctx": OLLAMA_NUM_CTX, "num_predict": OLLAMA_NUM_PREDICT},
     }
 
-    logger.debug(f"Requesting Ollama summarization with model '{model}'")
 
-    with httpx.Client(timeout=OLLAMA_TIMEOUT) as client:
-        response = client.post(url, json=payload)
+def _observe_usage(data: dict[str, Any]) -> None:
+    """Record the token counts Ollama reports on a finished generation."""
+    if "prompt_eval_count" in data:
+        OLLAMA_PROMPT_TOKENS.observe(data["prompt_eval_count"])
+    if "eval_count" in data:
+        OLLAMA_RESPONSE_TOKENS.observe(data["eval_count"])
+
+
+def _embed_payload(text: str, model: str) -> dict[str, Any]:
+    return {"model": model, "input": text, "keep_alive": OLLAMA_KEEP_ALIVE}
+
+
+def embed(text: str, model: str = OLLAMA_EMBED_MODEL) -> list[float]:
+    """Embed text with an Ollama embedding model on the least busy backend.
+
+    Embedding failures (e.g. the embedding model missing there) do not eject the backend from summarization.
+    """
+    with ollama_backends.borrow() as backend:
+        response = get_client(OLLAMA).post(f"{backend.url}/api/embed", json=_embed_payload(text, model))
         response.raise_for_status()
-        data = response.json()
+    return response.json()["embeddings"][0]
+
+
+async def async_embed(text: str, model: str = OLLAMA_EMBED_MODEL) -> list[float]:
+    """Async variant of embed()."""
+    with ollama_backends.borrow() as backend:
+        response = await get_async_client(OLLAMA).post(f"{backend.url}/api/embed", json=_embed_payload(text, model))
+        response.raise_for_status()
+    return response.json()["embeddings"][0]
+
+
+def _query_embedding(query: str) -> list[float] | None:
+    """Embed the query for the semantic cache; None when it is disabled or the embedding fails."""
+    if not semantic_summaries.enabled:
+        return None
+    try:
+        return embed(_normalize_query(query))
+    except httpx.HTTPError as exc:
+        logger.warning(f"Query embedding failed, skipping the semantic summary cache: {exc!r}")
+        return None
+
+
+async def _async_query_embedding(query: str) -> list[float] | None:
+    """Async variant of _query_embedding()."""
+    if not semantic_summaries.enabled:
+        return None
+    try:
+        return await async_embed(_normalize_query(query))
+    except httpx.HTTPError as exc:
+        logger.warning(f"Query embedding failed, skipping the semantic summary cache: {exc!r}")
+        return None
+
+
+def _similar_summary(
+    cache_key: str, vector: list[float] | None, results: list[dict[str, str]], model: str
+) -> str | None:
+    """Return the summary of a near-duplicate query over mostly the same results, also caching it under cache_key."""
+    if vector is None:
+        return None
+    summary = semantic_summaries.lookup(vector, model, result_urls(results))
+    if summary is not None:
+        logger.debug(f"Semantic summary cache hit: {cache_key}")
+        summary_cache.set(cache_key, summary)
+    return summary
+
+
+def _store_summary(
+    cache_key: str, vector: list[float] | None, results: list[dict[str, str]], model: str, summary: str
+) -> None:
+    """Cache a generated summary, and index its query embedding for near-duplicate queries."""
+    if not summary:
+        return
+    summary_cache.set(cache_key, summary)
+    if vector is not None:
+        semantic_summaries.add(vector, model, result_urls(results), summary)
+
+
+@contextmanager
+def _admitted() -> Iterator[None]:
+    """Hold a summarization slot; raises AdmissionRejectedError when the summary is shed."""
+    try:
+        with summary_admission.admit() as waited:
+            SUMMARY_QUEUE_WAIT_SECONDS.observe(waited)
+            yield
+    except AdmissionRejectedError as exc:
+        SUMMARIES_SHED.inc(reason=exc.reason)
+        raise
+
+
+@asynccontextmanager
+async def _async_admitted() -> AsyncIterator[None]:
+    """Async variant of _admitted()."""
+    try:
+        async with summary_admission.aadmit() as waited:
+            SUMMARY_QUEUE_WAIT_SECONDS.observe(waited)
+            yield
+    except AdmissionRejectedError as exc:
+        SUMMARIES_SHED.inc(reason=exc.reason)
+        raise
+
+
+def cached_summary(query: str, results: list[dict[str, str]], model: str = OLLAMA_MODEL) -> str | None:
+    """Return the cached summary for the query and result set, if any."""
+    cached, _status = summary_cache.get(_summary_cache_key(query, results, model))
+    return cached
+
+
+def _generate(cache_key: str, query: str, results: list[dict[str, str]], model: str) -> str:
+    """Request a summary from the least busy Ollama backend and cache it, unless a near-duplicate query has one.
+
+    The query embedding and semantic lookup run before admission: a short embedding request should
+    not wait behind generations, and a near-duplicate hit needs no summarization slot at all.
+    """
+    payload = _generate_payload(query, results, model, stream=False)
+
+    vector = _query_embedding(query)
+    similar = _similar_summary(cache_key, vector, results, model)
+    if similar is not None:
+        return similar
+    with _admitted(), ollama_backends.use() as backend:
+        logger.debug(f"Requesting Ollama summarization with model '{model}' from {backend.url}")
+        with OLLAMA_SECONDS.time(stream="false"):
+            response = get_client(OLLAMA).post(f"{backend.url}/api/generate", json=payload)
+        response.raise_for_status()
+    data = response.json()
+    _observe_usage(data)
+
+    summary = data.get("response", "").strip()
+    _store_summary(cache_key, vector, results, model, summary)
+    return summary
+
+
+async def _async_generate(cache_key: str, query: str, results: list[dict[str, str]], model: str) -> str:
+    """Async variant of _generate()."""
+    payload = _generate_payload(query, results, model, stream=False)
+
+    vector = await _async_query_embedding(query)
+    similar = _similar_summary(cache_key, vector, results, model)
+    if similar is not None:
+        return similar
+    async with _async_admitted():
+        with ollama_backends.use() as backend:
+            logger.debug(f"Requesting async Ollama summarization with model '{model}' from {backend.url}")
+            with OLLAMA_SECONDS.time(stream="false"):
+                response = await get_async_client(OLLAMA).post(f"{backend.url}/api/generate", json=payload)
+            response.raise_for_status()
+    data = response.json()
+    _observe_usage(data)
+
+    summary = data.get("response", "").strip()
+    _store_summary(cache_key, vector, results, model, summary)
+    return summary
+
+
+def summarize(query: str, results: list[dict[str, str]], model: str = OLLAMA_MODEL) -> str:
+    """Summarize search results using the configured Ollama model.
+
+    Summaries are cached on the query and result set fingerprint, so repeating a search
+    with the same results does not regenerate the summary. Concurrent requests for the
+    same uncached summary share one generation. With the semantic cache enabled, a
+    near-duplicate query over mostly the same results reuses that query's summary.
+    """
+    cache_key = _summary_cache_key(query, results, model)
+    cached, _status = summary_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Summary cache hit: {cache_key}")
+        return cached
+
+    return summary_flight.do(cache_key, _generate, cache_key, query, results, model)
+
+
+async def async_summarize(query: str, results: list[dict[str, str]], model: str = OLLAMA_MODEL) -> str:
+    """Async variant of summarize() using the pooled httpx.AsyncClient; shares the summary cache."""
+    cache_key = _summary_cache_key(query, results, model)
+    cached, _status = summary_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Summary cache hit: {cache_key}")
+        return cached
+
+    return await summary_flight.ado(cache_key, _async_generate, cache_key, query, results, model)
+
+
+def summarize_stream(query: str, results: list[dict[str, str]], model: str = OLLAMA_MODEL) -> Iterator[str]:
+    """Stream summary text chunks from Ollama as they are generated.
+
+    A cached summary (or a near-duplicate query's) is yielded as a single chunk; a completed stream
+    populates the cache.
+    """
+    cache_key = _summary_cache_key(query, results, model)
+    cached, _status = summary_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Summary cache hit: {cache_key}")
+        yield cached
+        return
+
+    payload = _generate_payload(query, results, model, stream=True)
+
+    vector = _query_embedding(query)
+    similar = _similar_summary(cache_key, vector, results, model)
+    if similar is not None:
+        yield similar
+        return
+
+    chunks: list[str] = []
+    with _admitted(), ollama_backends.use() as backend, OLLAMA_SECONDS.time(stream="true"):
+        logger.debug(f"Requesting streamed Ollama summarization with model '{model}' from {backend.url}")
+        url = f"{backend.url}/api/generate"
+        with get_client(OLLAMA).stream("POST", url, json=payload) as response:
+            response.raise_for_status()
+            # Ollama streams newline-delimited JSON objects, the last one with "done": true
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                chunk = data.get("response", "")
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+                if data.get("done"):
+                    _observe_usage(data)
+                    break
 
-    return data.get("response", "").strip()
+    summary = "".join(chunks).strip()
+    _store_summary(cache_key, vector, results, model, summary)
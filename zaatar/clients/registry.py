@@ -0,0 +1,229 @@
+"""Long-lived, pooled httpx clients shared by the upstream clients."""
+
+import atexit
+import importlib.util
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from zaatar.settings import (
+    FETCH_TIMEOUT,
+    HTTP_ENABLE_HTTP2,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    OLLAMA_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+SEARXNG = "searxng"
+OLLAMA = "ollama"
+FETCHER = "fetcher"
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Per-upstream client options."""
+
+    timeout: float
+    follow_redirects: bool = False
+
+
+UPSTREAMS: dict[str, UpstreamConfig] = {
+    SEARXNG: UpstreamConfig(timeout=FETCH_TIMEOUT),
+    OLLAMA: UpstreamConfig(timeout=OLLAMA_TIMEOUT),
+    FETCHER: UpstreamConfig(timeout=FETCH_TIMEOUT, follow_redirects=True),
+}
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package (httpx[http2]) is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ClientRegistry:
+    """Holds one pooled httpx.Client per upstream, created on first use.
+
+    The async serving mode uses a parallel set of httpx.AsyncClient instances with the same
+    options; those are bound to the event loop that first uses them.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP_ENABLE_HTTP2,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not _http2_available():
+            logger.warning("HTTP_ENABLE_HTTP2 is set but 'h2' is not installed; falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self._clients: dict[str, httpx.Client] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+        self._request_counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count_request(self, name: str) -> None:
+        with self._lock:
+            self._request_counts[name] = self._request_counts.get(name, 0) + 1
+
+    def _create_client(self, name: str) -> httpx.Client:
+        config = UPSTREAMS[name]
+
+        def on_request(_request: httpx.Request) -> None:
+            self._count_request(name)
+
+        logger.debug(f"Creating pooled HTTP client for '{name}' (http2={self.http2})")
+        return httpx.Client(
+            timeout=config.timeout,
+            follow_redirects=config.follow_redirects,
+            limits=self.limits,
+            http2=self.http2,
+            event_hooks={"request": [on_request]},
+        )
+
+    def _create_async_client(self, name: str) -> httpx.AsyncClient:
+        config = UPSTREAMS[name]
+
+        async def on_request(_request: httpx.Request) -> None:
+            self._count_request(f"{name}_async")
+
+        logger.debug(f"Creating pooled async HTTP client for '{name}' (http2={self.http2})")
+        return httpx.AsyncClient(
+            timeout=config.timeout,
+            follow_redirects=config.follow_redirects,
+            limits=self.limits,
+            http2=self.http2,
+            event_hooks={"request": [on_request]},
+        )
+
+    def get(self, name: str) -> httpx.Client:
+        """Return the shared client for the given upstream, creating it if needed."""
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._clients.get(name)
+            if client is None:
+                client = self._create_client(name)
+                self._clients[name] = client
+        return client
+
+    def get_async(self, name: str) -> httpx.AsyncClient:
+        """Return the shared async client for the given upstream, creating it if needed."""
+        client = self._async_clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            client = self._async_clients.get(name)
+            if client is None:
+                client = self._create_async_client(name)
+                self._async_clients[name] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close all pooled async clients and their connections."""
+        with self._lock:
+            clients = list(self._async_clients.values())
+            self._async_clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def close(self) -> None:
+        """Close all pooled clients and their connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return connection pool usage per upstream client (async clients suffixed ``_async``)."""
+        with self._lock:
+            clients: dict[str, httpx.Client | httpx.AsyncClient] = dict(self._clients)
+            clients.update({f"{name}_async": client for name, client in self._async_clients.items()})
+            request_counts = dict(self._request_counts)
+
+        stats: dict[str, dict[str, Any]] = {}
+        for name, client in clients.items():
+            pool = getattr(client._transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            pending = list(getattr(pool, "_requests", []))
+            idle = sum(1 for c in connections if c.is_idle())
+            queued = sum(1 for r in pending if r.is_queued())
+            stats[name] = {
+                "requests_total": request_counts.get(name, 0),
+                "connections_active": len(connections) - idle,
+                "connections_idle": idle,
+                "requests_active": len(pending) - queued,
+                "requests_queued": queued,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "http2": self.http2,
+            }
+        return stats
+
+
+_registry: ClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def configure_clients(registry: ClientRegistry | None = None) -> ClientRegistry:
+    """Install the process-wide client registry, closing any previous one."""
+    global _registry  # noqa: PLW0603
+    with _registry_lock:
+        previous = _registry
+        _registry = registry or ClientRegistry()
+    if previous is not None and previous is not _registry:
+        previous.close()
+    return _registry
+
+
+def get_registry() -> ClientRegistry:
+    """Return the process-wide client registry, creating a default one if needed."""
+    global _registry  # noqa: PLW0603
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ClientRegistry()
+    return _registry
+
+
+def get_client(name: str) -> httpx.Client:
+    """Return the shared pooled client for the given upstream."""
+    return get_registry().get(name)
+
+
+def get_async_client(name: str) -> httpx.AsyncClient:
+    """Return the shared pooled async client for the given upstream."""
+    return get_registry().get_async(name)
+
+
+def reset_clients() -> None:
+    """Install a fresh registry in a forked child process.
+
+    The inherited clients are dropped without closing them: their connections belong to the
+    parent process, and closing them here would close the parent's sockets too.
+    """
+    global _registry, _registry_lock  # noqa: PLW0603
+    _registry_lock = threading.Lock()
+    _registry = ClientRegistry()
+
+
+def close_clients() -> None:
+    """Close the process-wide client registry (shutdown hook)."""
+    if _registry is not None:
+        _registry.close()
+
+
+atexit.register(close_clients)
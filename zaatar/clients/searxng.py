@@ -1,16 +1,74 @@
 """SearXNG HTTP client with parameter mapping."""
 
+from __future__ import annotations
+
+import asyncio
+import json
 import logging
-from typing import Any
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
-from zaatar.definitions import FRESHNESS_TO_TIME_RANGE
+from zaatar.cache import CacheStatus, TTLCache
+from zaatar.clients.backends import BackendPool, HedgePolicy
+from zaatar.clients.registry import SEARXNG, get_async_client, get_client
+from zaatar.definitions import FRESHNESS_CACHE_TTL, FRESHNESS_TO_TIME_RANGE
+from zaatar.functions import canonical_url
+from zaatar.metrics import SEARXNG_SECONDS
 from zaatar.models import SearchQuery, SearchResponse, SearchResult, SearchResultsWeb
-from zaatar.settings import FETCH_TIMEOUT, SEARXNG_BASE_URL, SEARXNG_ENGINES, SEARXNG_SAFESEARCH
+from zaatar.settings import (
+    HTTP_MAX_CONNECTIONS,
+    SEARCH_CACHE_MAX_SIZE,
+    SEARCH_CACHE_STALE_TTL,
+    SEARCH_CACHE_TTL,
+    SEARXNG_BASE_URLS,
+    SEARXNG_EJECT_ERRORS,
+    SEARXNG_EJECT_SECONDS,
+    SEARXNG_ENGINES,
+    SEARXNG_HEDGE,
+    SEARXNG_HEDGE_MAX_RATIO,
+    SEARXNG_HEDGE_MIN_DELAY,
+    SEARXNG_HEDGE_PERCENTILE,
+    SEARXNG_PAGE_SIZE,
+    SEARXNG_SAFESEARCH,
+)
+from zaatar.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from zaatar.clients.backends import Backend
 
 logger = logging.getLogger(__name__)
 
+search_cache = TTLCache(max_size=SEARCH_CACHE_MAX_SIZE, stale_ttl=SEARCH_CACHE_STALE_TTL)
+search_flight = SingleFlight(SEARXNG)
+searxng_backends = BackendPool(
+    SEARXNG,
+    SEARXNG_BASE_URLS,
+    eject_errors=SEARXNG_EJECT_ERRORS,
+    eject_seconds=SEARXNG_EJECT_SECONDS,
+    latency_aware=True,
+)
+searxng_hedging = HedgePolicy(
+    searxng_backends,
+    enabled=SEARXNG_HEDGE,
+    percentile=SEARXNG_HEDGE_PERCENTILE,
+    min_delay=SEARXNG_HEDGE_MIN_DELAY,
+    max_ratio=SEARXNG_HEDGE_MAX_RATIO,
+)
+
+# Background revalidation of stale cache entries
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="searxng-refresh")
+_refreshing: set[str] = set()
+_refreshing_lock = threading.Lock()
+
+# Hedged searches run both requests off the caller's thread, and multi-page searches request pages after the
+# first concurrently; no more can be in flight than the client pool allows
+_hedge_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="searxng-hedge")
+_page_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="searxng-page")
+
 
 def _build_searxng_params(query: SearchQuery) -> dict[str, Any]:
     """Build SearXNG query parameters from a SearchQuery model."""
@@ -34,26 +92,311 @@ def _build_searxng_params(query: SearchQuery) -> dict[str, Any]:
     return params
 
 
-def search(query: SearchQuery) -> SearchResponse:
-    """Execute a search against SearXNG and return normalized results."""
-    params = _build_searxng_params(query)
-    url = f"{SEARXNG_BASE_URL}/search"
+def _cache_key(params: dict[str, Any], count: int) -> str:
+    """Build a cache key from the SearXNG parameters and result count."""
+    normalized = {**params, "q": " ".join(str(params["q"]).split())}
+    return json.dumps({"params": normalized, "count": count}, sort_keys=True)
 
-    logger.debug(f"SearXNG request: {url} params={params}")
 
-    with httpx.Client(timeout=FETCH_TIMEOUT) as client:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+def _cache_ttl(query: SearchQuery) -> int:
+    """Return the freshness-dependent cache TTL for a query."""
+    if query.freshness:
+        return FRESHNESS_CACHE_TTL.get(query.freshness, SEARCH_CACHE_TTL)
+    return SEARCH_CACHE_TTL
 
+
+def _parse_results(data: dict[str, Any]) -> list[SearchResult]:
+    """Normalize the results of a SearXNG JSON response."""
     raw_results: list[dict[str, Any]] = data.get("results", [])
-    results = [
+    return [
         SearchResult(
             title=r.get("title", ""),
             url=r.get("url", ""),
             description=r.get("content", ""),
         )
-        for r in raw_results[: query.count]
+        for r in raw_results
+    ]
+
+
+def _page_count(count: int) -> int:
+    """SearXNG pages needed for ``count`` results."""
+    return max(1, math.ceil(count / SEARXNG_PAGE_SIZE))
+
+
+def _page_params(params: dict[str, Any], page: int) -> dict[str, Any]:
+    return params if page == 1 else {**params, "pageno": page}
+
+
+def _merge_pages(pages: list[list[SearchResult]], count: int) -> SearchResponse:
+    """Concatenate pages in rank order, dropping repeats of a canonical URL, and keep ``count`` results."""
+    seen: set[str] = set()
+    results: list[SearchResult] = []
+    for page in pages:
+        for result in page:
+            key = canonical_url(result.url)
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append(result)
+    return SearchResponse(web=SearchResultsWeb(results=results[:count]))
+
+
+def _get_results(backend: Backend, params: dict[str, Any]) -> list[SearchResult]:
+    """Request results from one SearXNG instance."""
+    url = f"{backend.url}/search"
+
+    logger.debug(f"SearXNG request: {url} params={params}")
+
+    with searxng_backends.track(backend):
+        with SEARXNG_SECONDS.time():
+            response = get_client(SEARXNG).get(url, params=params)
+        response.raise_for_status()
+    return _parse_results(response.json())
+
+
+async def _async_get_results(backend: Backend, params: dict[str, Any]) -> list[SearchResult]:
+    """Request results from one SearXNG instance with the async client."""
+    url = f"{backend.url}/search"
+
+    logger.debug(f"SearXNG async request: {url} params={params}")
+
+    with searxng_backends.track(backend):
+        with SEARXNG_SECONDS.time():
+            response = await get_async_client(SEARXNG).get(url, params=params)
+        response.raise_for_status()
+    return _parse_results(response.json())
+
+
+def _hedge_backend(primary: Backend) -> Backend | None:
+    """A second instance for a slow or failed request, if the hedge budget allows one."""
+    if not searxng_hedging.allow():
+        return None
+    backend = searxng_backends.acquire_other({primary.url})
+    if backend is not None:
+        logger.debug(f"Hedging SearXNG request to {backend.url}")
+    return backend
+
+
+def _fetch_page(params: dict[str, Any]) -> list[SearchResult]:
+    """Request one page of results from SearXNG.
+
+    The search goes to the instance with the lowest moving-average latency. If it has not answered
+    within the hedge delay (or failed sooner), it is also sent to a second instance and the first
+    successful answer is used.
+    """
+    primary = searxng_backends.acquire()
+    delay = searxng_hedging.delay()
+    if delay is None:
+        return _get_results(primary, params)
+
+    first = _hedge_executor.submit(_get_results, primary, params)
+    done, _pending = wait([first], timeout=delay)
+    if done and first.exception() is None:
+        return first.result()
+
+    futures = [first]
+    hedge = None
+    backup = _hedge_backend(primary)
+    if backup is not None:
+        hedge = _hedge_executor.submit(_get_results, backup, params)
+        futures.append(hedge)
+
+    # The slower request is left to finish in the background; its latency still counts for its instance
+    errors: list[httpx.HTTPError] = []
+    for future in as_completed(futures):
+        try:
+            result = future.result()
+        except httpx.HTTPError as exc:
+            errors.append(exc)
+            continue
+        if future is hedge:
+            searxng_hedging.record_win()
+        return result
+    raise errors[-1]
+
+
+async def _async_fetch_page(params: dict[str, Any]) -> list[SearchResult]:
+    """Async variant of _fetch_page(); the slower of two hedged requests is cancelled."""
+    primary = searxng_backends.acquire()
+    delay = searxng_hedging.delay()
+    if delay is None:
+        return await _async_get_results(primary, params)
+
+    # Tasks start before this coroutine resumes, so a cancelled one always releases its backend
+    first = asyncio.create_task(_async_get_results(primary, params))
+    tasks = {first}
+    try:
+        done, _pending = await asyncio.wait(tasks, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+
+        hedge = None
+        backup = _hedge_backend(primary)
+        if backup is not None:
+            hedge = asyncio.create_task(_async_get_results(backup, params))
+            tasks.add(hedge)
+
+        errors: list[BaseException] = []
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    if task is hedge:
+                        searxng_hedging.record_win()
+                    return task.result()
+                if not isinstance(error, httpx.HTTPError):
+                    raise error
+                errors.append(error)
+        raise errors[-1]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _merge_fetched(pages: list[list[SearchResult] | BaseException], count: int) -> tuple[SearchResponse, bool]:
+    """Merge fetched pages up to the first failed one; the first page's error is raised."""
+    if isinstance(pages[0], BaseException):
+        raise pages[0]
+    fetched: list[list[SearchResult]] = []
+    for number, page in enumerate(pages, start=1):
+        if isinstance(page, BaseException):
+            logger.warning(f"SearXNG page {number} failed; returning the first {number - 1} pages: {page!r}")
+            return _merge_pages(fetched, count), False
+        fetched.append(page)
+    return _merge_pages(fetched, count), True
+
+
+def _fetch_results(params: dict[str, Any], count: int) -> tuple[SearchResponse, bool]:
+    """Request ``count`` results from SearXNG, bypassing the cache; returns ``(result, complete)``.
+
+    When ``count`` spans several SearXNG pages they are requested concurrently (the first in the
+    calling thread) and merged in rank order. If a later page fails, the pages before it are
+    returned with ``complete`` False.
+    """
+    futures = [
+        _page_executor.submit(_fetch_page, _page_params(params, page)) for page in range(2, _page_count(count) + 1)
     ]
+    pages: list[list[SearchResult] | BaseException] = [_fetch_page(params)]
+    for future in futures:
+        try:
+            pages.append(future.result())
+        except httpx.HTTPError as exc:
+            pages.append(exc)
+    return _merge_fetched(pages, count)
+
+
+async def _async_fetch_results(params: dict[str, Any], count: int) -> tuple[SearchResponse, bool]:
+    """Async variant of _fetch_results()."""
+    pages = await asyncio.gather(
+        *(_async_fetch_page(_page_params(params, page)) for page in range(1, _page_count(count) + 1)),
+        return_exceptions=True,
+    )
+    for page in pages:
+        if isinstance(page, BaseException) and not isinstance(page, httpx.HTTPError):
+            raise page
+    return _merge_fetched(pages, count)
+
+
+def _store(key: str, query: SearchQuery, result: SearchResponse, complete: bool) -> None:
+    """Cache a fetched result, unless pages of it are missing."""
+    if complete:
+        search_cache.set(key, result.model_copy(deep=True), _cache_ttl(query))
+
+
+def _refresh(key: str, query: SearchQuery, params: dict[str, Any]) -> None:
+    """Re-fetch a stale cache entry."""
+    try:
+        result, complete = _fetch_results(params, query.count)
+        _store(key, query, result, complete)
+    except Exception:
+        logger.exception("Background SearXNG cache refresh failed")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _schedule_refresh(key: str, query: SearchQuery, params: dict[str, Any]) -> None:
+    """Revalidate a stale entry in the background, at most once per key at a time."""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, key, query, params)
+
+
+def reset_executors() -> None:
+    """Replace the refresh, hedge and page executors in a forked child; the parent's threads are not inherited."""
+    global _refresh_executor, _refreshing_lock, _hedge_executor, _page_executor  # noqa: PLW0603
+    _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="searxng-refresh")
+    _hedge_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="searxng-hedge")
+    _page_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONNECTIONS, thread_name_prefix="searxng-page")
+    _refreshing_lock = threading.Lock()
+    _refreshing.clear()
+
+
+def _cached_result(key: str, query: SearchQuery, params: dict[str, Any]) -> SearchResponse | None:
+    """Return a copy of a cached result, scheduling a refresh if it is stale."""
+    cached, status = search_cache.get(key)
+    if cached is None:
+        return None
+    logger.debug(f"SearXNG cache {status}: {key}")
+    if status is CacheStatus.STALE:
+        _schedule_refresh(key, query, params)
+    # Callers attach summaries to the response; never hand out the cached instance
+    result = cached.model_copy(deep=True)
+    result._cache_status = status
+    return result
+
+
+def _fetch_and_store(key: str, query: SearchQuery, params: dict[str, Any]) -> SearchResponse:
+    """Request results from SearXNG and cache them."""
+    result, complete = _fetch_results(params, query.count)
+    _store(key, query, result, complete)
+    return result
+
+
+async def _async_fetch_and_store(key: str, query: SearchQuery, params: dict[str, Any]) -> SearchResponse:
+    """Request results from SearXNG with the async client and cache them."""
+    result, complete = await _async_fetch_results(params, query.count)
+    _store(key, query, result, complete)
+    return result
+
+
+def _own_copy(shared: SearchResponse) -> SearchResponse:
+    """Copy a (possibly coalesced) upstream result for one caller."""
+    result = shared.model_copy(deep=True)
+    result._cache_status = CacheStatus.MISS if search_cache.enabled else CacheStatus.BYPASS
+    return result
+
+
+def search(query: SearchQuery) -> SearchResponse:
+    """Execute a search against SearXNG and return normalized results.
+
+    Results are cached on the SearXNG parameters and count; stale entries are served
+    immediately while being refreshed in the background. Concurrent identical searches
+    that miss the cache share one SearXNG request.
+    """
+    params = _build_searxng_params(query)
+    key = _cache_key(params, query.count)
+
+    if search_cache.enabled:
+        result = _cached_result(key, query, params)
+        if result is not None:
+            return result
+
+    return _own_copy(search_flight.do(key, _fetch_and_store, key, query, params))
+
+
+async def async_search(query: SearchQuery) -> SearchResponse:
+    """Async variant of search() using the pooled httpx.AsyncClient; shares the result cache."""
+    params = _build_searxng_params(query)
+    key = _cache_key(params, query.count)
+
+    if search_cache.enabled:
+        result = _cached_result(key, query, params)
+        if result is not None:
+            return result
 
-    return SearchResponse(web=SearchResultsWeb(results=results))
+    return _own_copy(await search_flight.ado(key, _async_fetch_and_store, key, query, params))
@@ -0,0 +1,81 @@
+"""Deep search: fetch the top results' pages and attach their text for the response and the summary."""
+
+import logging
+import time
+
+import httpx
+
+from zaatar.clients.extraction import ExtractionAbortedError
+from zaatar.clients.fetcher import FetchError, async_fetch_within, fetch_within
+from zaatar.clients.registry import FETCHER
+from zaatar.metrics import count_upstream_error
+from zaatar.models import DeepSearch, FetchQuery, FetchResponse, SearchResponse
+from zaatar.settings import DEEP_SEARCH_EXTRACT_MODE, DEEP_SEARCH_MAX_CHARS, DEEP_SEARCH_RESULTS, DEEP_SEARCH_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+def _queries(result: SearchResponse) -> list[FetchQuery]:
+    return [
+        FetchQuery(url=r.url, extractMode=DEEP_SEARCH_EXTRACT_MODE, maxChars=DEEP_SEARCH_MAX_CHARS)
+        for r in result.web.results[:DEEP_SEARCH_RESULTS]
+    ]
+
+
+def _error_message(outcome: Exception) -> str:
+    """Describe a failed page the way /web_fetch would."""
+    if isinstance(outcome, TimeoutError):
+        return "Timed out"
+    if isinstance(outcome, (FetchError, ExtractionAbortedError)):
+        return str(outcome)
+    if isinstance(outcome, httpx.HTTPStatusError):
+        return f"Upstream error: {outcome.response.status_code}"
+    if isinstance(outcome, httpx.ConnectError):
+        return "Cannot connect to target URL"
+    return f"Fetch failed: {type(outcome).__name__}"
+
+
+def _attach(result: SearchResponse, outcomes: list[FetchResponse | Exception], started: float) -> None:
+    """Set each fetched result's content (or content_error) and the response's deep summary."""
+    fetched = failed = timed_out = 0
+    for search_result, outcome in zip(result.web.results, outcomes, strict=False):
+        if isinstance(outcome, FetchResponse):
+            search_result.content = outcome.content
+            fetched += 1
+            continue
+        search_result.content_error = _error_message(outcome)
+        if isinstance(outcome, TimeoutError):
+            timed_out += 1
+            continue
+        logger.warning(f"Deep search fetch failed for {search_result.url}: {outcome!r}")
+        if isinstance(outcome, httpx.HTTPError):
+            count_upstream_error(FETCHER, outcome)
+        failed += 1
+    result.deep = DeepSearch(
+        pages_requested=len(outcomes),
+        pages_fetched=fetched,
+        pages_failed=failed,
+        pages_timed_out=timed_out,
+        seconds=round(time.perf_counter() - started, 3),
+    )
+
+
+def deepen(result: SearchResponse) -> None:
+    """Fetch the top DEEP_SEARCH_RESULTS results concurrently within DEEP_SEARCH_TIMEOUT and attach their text.
+
+    Pages that fail or miss the deadline are reported per result instead of failing the search.
+    """
+    queries = _queries(result)
+    if not queries:
+        return
+    started = time.perf_counter()
+    _attach(result, fetch_within(queries, DEEP_SEARCH_TIMEOUT), started)
+
+
+async def async_deepen(result: SearchResponse) -> None:
+    """Async variant of deepen()."""
+    queries = _queries(result)
+    if not queries:
+        return
+    started = time.perf_counter()
+    _attach(result, await async_fetch_within(queries, DEEP_SEARCH_TIMEOUT), started)
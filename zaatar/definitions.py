@@ -1,5 +1,11 @@
 """Constants and mappings for zaatar search API."""
 
+from typing import Literal, get_args
+
+# web_fetch extraction modes: readability + html2text, or the single-pass lxml engine
+ExtractMode = Literal["markdown", "text", "lxml-markdown", "lxml-text"]
+EXTRACT_MODES: tuple[str, ...] = get_args(ExtractMode)
+
 # Freshness parameter to SearXNG time_range mapping
 FRESHNESS_TO_TIME_RANGE: dict[str, str] = {
     "pd": "day",
@@ -8,5 +14,34 @@ FRESHNESS_TO_TIME_RANGE: dict[str, str] = {
     "py": "year",
 }
 
+# Search result cache TTL (seconds) per freshness filter; narrower windows go stale sooner
+FRESHNESS_CACHE_TTL: dict[str, int] = {
+    "pd": 60,
+    "pw": 600,
+    "pm": 1800,
+    "py": 3600,
+}
+
+# Heuristic freshness for fetched pages without explicit expiry (RFC 9111 section 4.2.2):
+# a fraction of the time since Last-Modified, capped (seconds)
+HEURISTIC_FRESHNESS_FRACTION: float = 0.1
+HEURISTIC_FRESHNESS_MAX: int = 86400
+
+# Readable HTML is fed to html2text in slices of about this many characters, so conversion
+# can stop once a fetch's maxChars budget is met
+HTML2TEXT_FEED_CHARS: int = 8192
+
+# Rough characters per token, for estimating prompt size without a model-specific tokenizer
+CHARS_PER_TOKEN: int = 4
+
 # Allowed URL schemes for web_fetch
 ALLOWED_SCHEMES: frozenset[str] = frozenset({"http", "https"})
+
+# Non text/* content types web_fetch accepts (anything "+xml" is accepted as well)
+TEXT_CONTENT_TYPES: frozenset[str] = frozenset(
+    {
+        "application/xhtml+xml",
+        "application/xml",
+        "application/json",
+    }
+)
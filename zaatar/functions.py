@@ -0,0 +1,10 @@
+"""Utility functions."""
+
+from urllib.parse import urlsplit
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL for duplicate detection: ignore the scheme, ``www.``, a trailing slash and the fragment."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower().removeprefix('www.')}{path}?{parts.query}"
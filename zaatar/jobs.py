@@ -0,0 +1,221 @@
+"""Background jobs: a bounded queue worked by a fixed pool of threads, with results kept for a TTL."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from zaatar.admission import AdmissionRejectedError
+from zaatar.cache import TTLCache
+from zaatar.clients.ollama import cached_summary, summarize
+from zaatar.models import JobStatus
+from zaatar.settings import (
+    SUMMARY_JOB_MAX_SIZE,
+    SUMMARY_JOB_MAX_WAITERS,
+    SUMMARY_JOB_QUEUE_SIZE,
+    SUMMARY_JOB_TTL,
+    SUMMARY_JOB_WORKERS,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# Pending jobs are kept this long (seconds) before they can expire unfinished
+PENDING_JOB_TTL = 3600
+
+
+class JobError(Exception):
+    """Raised by a job function to fail the job with a client-facing message."""
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a full queue."""
+
+
+@dataclass
+class Job:
+    id: str
+    status: JobStatus = JobStatus.PENDING
+    result: Any = None
+    error: str | None = None
+    finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the job finishes or ``timeout`` seconds pass; return whether it finished."""
+        return self.finished.wait(timeout)
+
+
+class JobQueue:
+    """A bounded job queue worked by ``workers`` threads, started on first submit.
+
+    Jobs are looked up by id until ``result_ttl`` seconds after they finish; ``max_size``
+    bounds how many jobs are tracked (least recently used are dropped first). At most
+    ``max_waiters`` callers block in wait() at once (None for no limit).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int,
+        max_queued: int,
+        result_ttl: float,
+        max_size: int,
+        *,
+        max_waiters: int | None = None,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self.max_waiters = max_waiters
+        self._queue: queue.Queue[tuple[Job, Callable[..., Any], tuple[Any, ...]]] = queue.Queue(maxsize=max_queued)
+        self._jobs = TTLCache(max_size=max_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.waiting = 0
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"{self.name}-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            job, func, args = self._queue.get()
+            with self._lock:
+                self.running += 1
+            job.status = JobStatus.RUNNING
+            try:
+                job.result = func(*args)
+                job.status = JobStatus.DONE
+            except JobError as exc:
+                job.error = str(exc)
+                job.status = JobStatus.FAILED
+            except Exception as exc:
+                logger.exception(f"{self.name} job {job.id} failed")
+                job.error = f"Job failed: {type(exc).__name__}"
+                job.status = JobStatus.FAILED
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    if job.status == JobStatus.DONE:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                self._jobs.set(job.id, job, self.result_ttl)
+                job.finished.set()
+                self._queue.task_done()
+
+    def submit(self, func: Callable[..., Any], *args: object) -> Job:
+        """Queue ``func(*args)`` and return its job; raise QueueFullError if the queue is full."""
+        self._start_workers()
+        job = Job(id=uuid.uuid4().hex)
+        self._jobs.set(job.id, job, max(PENDING_JOB_TTL, self.result_ttl))
+        try:
+            self._queue.put_nowait((job, func, args))
+        except queue.Full:
+            self._jobs.delete(job.id)
+            with self._lock:
+                self.rejected += 1
+            msg = f"{self.name} queue is full"
+            raise QueueFullError(msg) from None
+        return job
+
+    def after_fork(self) -> None:
+        """Drop the parent's worker threads and queue in a forked child; workers restart on submit."""
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+        self.running = 0
+        self.waiting = 0
+
+    def wait(self, job: Job, timeout: float) -> bool:
+        """Block until ``job`` finishes or ``timeout`` seconds pass; return whether it finished.
+
+        When ``max_waiters`` callers are already waiting, return at once instead, so long-polls
+        cannot hold every server thread.
+        """
+        with self._lock:
+            if self.max_waiters is not None and self.waiting >= self.max_waiters:
+                return job.finished.is_set()
+            self.waiting += 1
+        try:
+            return job.wait(timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a tracked job, or None if it is unknown or expired."""
+        job, _status = self._jobs.get(job_id)
+        return job
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "running": self.running,
+                "waiting": self.waiting,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+summary_jobs = JobQueue(
+    name="summary",
+    workers=SUMMARY_JOB_WORKERS,
+    max_queued=SUMMARY_JOB_QUEUE_SIZE,
+    result_ttl=SUMMARY_JOB_TTL,
+    max_size=SUMMARY_JOB_MAX_SIZE,
+    max_waiters=SUMMARY_JOB_MAX_WAITERS,
+)
+
+
+def _summarize_job(query: str, results: list[dict[str, str]]) -> str:
+    try:
+        return summarize(query, results)
+    except httpx.ConnectError as exc:
+        logger.exception("Cannot connect to Ollama")
+        msg = "Summarization service unavailable"
+        raise JobError(msg) from exc
+    except httpx.HTTPStatusError as exc:
+        logger.exception("Ollama request failed")
+        msg = f"Summarization error: {exc.response.status_code}"
+        raise JobError(msg) from exc
+    except AdmissionRejectedError as exc:
+        logger.warning(f"Deferred summary skipped: {exc.reason}")
+        msg = f"Summary skipped: {exc.reason}"
+        raise JobError(msg) from exc
+
+
+def defer_summary(query: str, results: list[dict[str, str]]) -> tuple[str | None, str | None]:
+    """Return ``(summary, None)`` if the summary is cached, else queue it and return ``(None, summary_id)``.
+
+    Returns ``(None, None)`` when the summary queue is full.
+    """
+    summary = cached_summary(query, results)
+    if summary is not None:
+        return summary, None
+    try:
+        job = summary_jobs.submit(_summarize_job, query, results)
+    except QueueFullError:
+        logger.warning("Summary queue is full; returning results without a summary")
+        return None, None
+    return None, job.id
@@ -0,0 +1,248 @@
+"""In-process counters and histograms, rendered in the Prometheus text exposition format."""
+
+from __future__ import annotations
+
+import abc
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+# Upper bounds (seconds) for upstream and route latencies; LLM generation can take minutes
+LATENCY_BUCKETS: tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Extraction CPU time is far shorter than network latency
+CPU_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 15)
+BYTES_BUCKETS: tuple[float, ...] = tuple(float(2**power) for power in range(10, 25, 2))
+TOKEN_BUCKETS: tuple[float, ...] = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True))
+    return f"{{{pairs}}}"
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            msg = f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Yield the metric's sample lines, without the HELP and TYPE header."""
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{sample}\n" for sample in self._samples())
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, optionally per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {} if labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative ``le`` buckets, optionally per label set."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._series: dict[LabelValues, _HistogramSeries] = {} if labelnames else {(): self._new_series()}
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(len(self.buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._new_series()
+            series.buckets[index] += 1
+            series.count += 1
+            series.sum += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the block, including when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            return series.count if series is not None else 0
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(series.buckets), series.count, series.sum) for key, series in sorted(self._series.items())
+            ]
+        bucket_names = (*self.labelnames, "le")
+        for key, buckets, count, total in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, buckets, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(bucket_names, (*key, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class MetricsRegistry:
+    """The set of metrics exposed by /metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            msg = f"Metric {metric.name} is already registered"
+            raise ValueError(msg)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.register(
+    Histogram(
+        "zaatar_request_duration_seconds",
+        "End-to-end route latency, until the response (or the first byte of a stream) is ready.",
+        LATENCY_BUCKETS,
+        labelnames=("route", "method", "status"),
+    )
+)
+SEARXNG_SECONDS = registry.register(
+    Histogram("zaatar_searxng_request_duration_seconds", "SearXNG search request latency.", LATENCY_BUCKETS)
+)
+OLLAMA_SECONDS = registry.register(
+    Histogram(
+        "zaatar_ollama_request_duration_seconds",
+        "Ollama summary generation latency.",
+        LATENCY_BUCKETS,
+        labelnames=("stream",),
+    )
+)
+OLLAMA_PROMPT_TOKENS = registry.register(
+    Histogram("zaatar_ollama_prompt_tokens", "Prompt tokens evaluated per Ollama generation.", TOKEN_BUCKETS)
+)
+OLLAMA_RESPONSE_TOKENS = registry.register(
+    Histogram("zaatar_ollama_response_tokens", "Response tokens generated per Ollama generation.", TOKEN_BUCKETS)
+)
+FETCH_DOWNLOAD_SECONDS = registry.register(
+    Histogram(
+        "zaatar_fetch_download_duration_seconds",
+        "Time to download (or revalidate) a fetched page.",
+        LATENCY_BUCKETS,
+    )
+)
+FETCH_DOWNLOAD_BYTES = registry.register(
+    Histogram("zaatar_fetch_download_bytes", "Decompressed body bytes read per fetched page.", BYTES_BUCKETS)
+)
+EXTRACTION_CPU_SECONDS = registry.register(
+    Histogram(
+        "zaatar_extraction_cpu_seconds",
+        "CPU time spent extracting content from a page.",
+        CPU_BUCKETS,
+        labelnames=("mode",),
+    )
+)
+SUMMARY_QUEUE_WAIT_SECONDS = registry.register(
+    Histogram(
+        "zaatar_summary_queue_wait_seconds",
+        "Time a summary waited for an admission slot before generation.",
+        LATENCY_BUCKETS,
+    )
+)
+SUMMARIES_SHED = registry.register(
+    Counter(
+        "zaatar_summaries_shed_total",
+        "Summaries skipped by admission control, by reason (queue_full, wait_exceeded).",
+        labelnames=("reason",),
+    )
+)
+UPSTREAM_ERRORS = registry.register(
+    Counter(
+        "zaatar_upstream_errors_total",
+        "Upstream failures returned to clients, by upstream and error class.",
+        labelnames=("upstream", "error"),
+    )
+)
+
+
+def count_upstream_error(upstream: str, exc: BaseException) -> None:
+    """Count a failure of ``upstream`` that a route is about to report to the client."""
+    UPSTREAM_ERRORS.inc(upstream=upstream, error=type(exc).__name__)
@@ -1,10 +1,20 @@
 """Pydantic models for request validation and response serialization."""
 
+from enum import StrEnum
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from zaatar.settings import DEFAULT_SEARCH_COUNT, FETCH_MAX_CHARS, MAX_SEARCH_COUNT
+from zaatar.admission import ShedReason
+from zaatar.definitions import ExtractMode
+from zaatar.settings import (
+    DEFAULT_SEARCH_COUNT,
+    FETCH_BATCH_MAX_SIZE,
+    FETCH_MAX_CHARS,
+    MAX_SEARCH_COUNT,
+    SEARCH_BATCH_MAX_SIZE,
+    SUMMARY_JOB_MAX_WAIT,
+)
 
 # --- Search Models ---
 
@@ -27,6 +37,20 @@ class SearchQuery(BaseModel):
         description='Freshness filter: "pd" (past day), "pw" (past week), "pm" (past month), "py" (past year)',
     )
     summarize: bool = Field(default=True, description="Summarize results using the configured LLM")
+    defer_summary: bool = Field(
+        default=False,
+        description=(
+            "Return results immediately and compute the summary in the background; "
+            "fetch it from /web_search/summary/{summary_id}"
+        ),
+    )
+    depth: Literal["basic", "deep"] = Field(
+        default="basic",
+        description=(
+            '"deep" also fetches the top results\' pages concurrently, adds their text to the results '
+            "and summarizes from it"
+        ),
+    )
 
 
 class SearchResult(BaseModel):
@@ -35,6 +59,8 @@ class SearchResult(BaseModel):
     title: str
     url: str
     description: str
+    content: str | None = Field(default=None, description="Extracted page text (depth=deep), truncated")
+    content_error: str | None = Field(default=None, description="Why the page text is missing (depth=deep)")
 
 
 class SearchResultsWeb(BaseModel):
@@ -43,11 +69,110 @@ class SearchResultsWeb(BaseModel):
     results: list[SearchResult]
 
 
+class SummaryBudget(BaseModel):
+    """How the summarization prompt was fitted to the model's context window (token counts are estimates)."""
+
+    context_tokens: int = Field(description="Context window requested from Ollama (num_ctx)")
+    max_tokens: int = Field(description="Most tokens the summary may generate (num_predict)")
+    prompt_budget_tokens: int = Field(description="Tokens available for the prompt")
+    prompt_tokens_estimate: int = Field(description="Estimated prompt tokens")
+    results_used: int = Field(description="Results included in the prompt")
+    duplicates_dropped: int = Field(description="Duplicate results left out")
+    results_dropped: int = Field(description="Lowest-ranked results left out to fit the budget")
+    chars_trimmed: int = Field(description="Description and page text characters cut to fit the budget")
+
+
+class DeepSearch(BaseModel):
+    """Outcome of fetching the top results' pages (depth=deep)."""
+
+    pages_requested: int
+    pages_fetched: int
+    pages_failed: int = Field(description="Pages that could not be fetched or extracted")
+    pages_timed_out: int = Field(description="Pages not fetched within DEEP_SEARCH_TIMEOUT seconds")
+    seconds: float = Field(description="Time spent fetching, bounded by DEEP_SEARCH_TIMEOUT")
+
+
 class SearchResponse(BaseModel):
     """Top-level search response matching Brave API structure."""
 
     web: SearchResultsWeb
     summary: str | None = Field(default=None, description="LLM-generated summary of search results")
+    deep: DeepSearch | None = Field(default=None, description="Page fetch outcome (depth=deep)")
+    summary_budget: SummaryBudget | None = Field(
+        default=None, description="Token budget of the summarization prompt (summarize=true)"
+    )
+    summary_id: str | None = Field(
+        default=None,
+        description="Deferred summary job id (defer_summary=true), for /web_search/summary/{summary_id}",
+    )
+    summary_skipped: ShedReason | None = Field(
+        default=None,
+        description=(
+            "Why results are returned without the requested summary: the summarization queue was full, "
+            "or no summarization slot freed up within SUMMARY_MAX_WAIT seconds"
+        ),
+    )
+
+    # Result cache outcome, reported as the X-Cache response header (not serialized)
+    _cache_status: str | None = PrivateAttr(default=None)
+
+
+class SummaryPath(BaseModel):
+    """Path parameters for the deferred summary endpoint."""
+
+    summary_id: str = Field(..., description="summary_id returned by /web_search with defer_summary=true")
+
+
+class SummaryWaitQuery(BaseModel):
+    """Query parameters for the deferred summary endpoint."""
+
+    wait: float = Field(
+        default=0,
+        ge=0,
+        le=SUMMARY_JOB_MAX_WAIT,
+        description="Seconds to wait for the summary to finish before responding (long-polling)",
+    )
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class SummaryJobResponse(BaseModel):
+    """State of a deferred summary."""
+
+    summary_id: str
+    status: JobStatus
+    summary: str | None = None
+    error: str | None = None
+
+
+class SearchBatchQuery(BaseModel):
+    """Request body for the web_search batch endpoint."""
+
+    queries: list[SearchQuery] = Field(
+        ...,
+        min_length=1,
+        max_length=SEARCH_BATCH_MAX_SIZE,
+        description="Searches to run concurrently",
+    )
+
+
+class SearchBatchItem(BaseModel):
+    """Outcome of one search in a batch: a response or an error."""
+
+    status: int = Field(description="HTTP status the equivalent /web_search call would have returned")
+    response: SearchResponse | None = None
+    error: str | None = None
+
+
+class SearchBatchResponse(BaseModel):
+    """Batch search results, in input order."""
+
+    results: list[SearchBatchItem]
 
 
 # --- Fetch Models ---
@@ -57,9 +182,12 @@ class FetchQuery(BaseModel):
     """Query parameters for web_fetch endpoint."""
 
     url: str = Field(..., description="URL to fetch (http or https)")
-    extractMode: Literal["markdown", "text"] = Field(  # noqa: N815
+    extractMode: ExtractMode = Field(  # noqa: N815
         default="markdown",
-        description='Extraction mode: "markdown" or "text"',
+        description=(
+            'Extraction mode: "markdown" or "text" (readability + html2text), or "lxml-markdown" / "lxml-text" '
+            "(faster single-pass lxml engine)"
+        ),
     )
     maxChars: int | None = Field(  # noqa: N815
         default=None,
@@ -74,3 +202,175 @@ class FetchResponse(BaseModel):
     content: str
     extract_mode: str
     content_length: int
+    bytes_read: int = Field(default=0, description="Bytes of the (decompressed) body that were downloaded")
+    truncated: bool = Field(default=False, description="True if the download stopped at the byte budget")
+
+    # Fetch cache outcome, reported as the X-Cache response header (not serialized)
+    _cache_status: str | None = PrivateAttr(default=None)
+
+
+class FetchBatchQuery(BaseModel):
+    """Request body for the web_fetch batch endpoint."""
+
+    queries: list[FetchQuery] = Field(
+        ...,
+        min_length=1,
+        max_length=FETCH_BATCH_MAX_SIZE,
+        description="URLs to fetch concurrently",
+    )
+
+
+class FetchBatchItem(BaseModel):
+    """Outcome of one fetch in a batch: a response or an error."""
+
+    status: int = Field(description="HTTP status the equivalent /web_fetch call would have returned")
+    response: FetchResponse | None = None
+    error: str | None = None
+
+
+class FetchBatchResponse(BaseModel):
+    """Batch fetch results, in input order."""
+
+    results: list[FetchBatchItem]
+
+
+# --- Status Models ---
+
+
+class HttpPoolStats(BaseModel):
+    """Connection pool usage for a shared upstream HTTP client."""
+
+    requests_total: int = Field(description="Requests sent since the client was created")
+    connections_active: int = Field(description="Connections currently serving a request")
+    connections_idle: int = Field(description="Keep-alive connections available for reuse")
+    requests_active: int = Field(description="Requests currently assigned to a connection")
+    requests_queued: int = Field(description="Requests waiting for a free connection")
+    max_connections: int | None
+    max_keepalive_connections: int | None
+    http2: bool
+
+
+class ExtractionPoolStats(BaseModel):
+    """Usage of the content extraction process pool."""
+
+    workers: int = Field(description="Configured worker processes (0 extracts in the request thread)")
+    workers_started: int = Field(description="Worker processes currently running")
+    active: int = Field(description="Pages currently being extracted")
+    queued: int = Field(description="Pages waiting for a free worker")
+    completed: int
+    failed: int = Field(description="Extractions that raised, timed out, or lost their worker")
+    timeouts: int = Field(description="Extractions killed for exceeding EXTRACTION_TIMEOUT")
+    restarts: int = Field(description="Worker processes replaced after a timeout or crash")
+
+
+class JobQueueStats(BaseModel):
+    """Usage of a background job queue."""
+
+    workers: int
+    queued: int = Field(description="Jobs waiting for a worker")
+    running: int
+    waiting: int = Field(description="Requests long-polling a job")
+    completed: int
+    failed: int
+    rejected: int = Field(description="Jobs refused because the queue was full")
+
+
+class AdmissionStats(BaseModel):
+    """Summarization admission control (SUMMARY_MAX_ACTIVE / SUMMARY_MAX_QUEUED / SUMMARY_MAX_WAIT)."""
+
+    max_active: int
+    max_queued: int
+    max_wait: float
+    active: int = Field(description="Summaries being generated")
+    queued: int = Field(description="Summaries waiting for a slot")
+    admitted: int
+    shed_queue_full: int = Field(description="Summaries skipped because the queue was full")
+    shed_wait_exceeded: int = Field(description="Summaries skipped after waiting SUMMARY_MAX_WAIT seconds")
+
+
+class SemanticCacheStats(BaseModel):
+    """Semantic summary cache (SEMANTIC_CACHE_MAX_SIZE; needs numpy)."""
+
+    enabled: bool
+    max_size: int
+    entries: int = Field(description="Unexpired indexed queries")
+    hits: int = Field(description="Summaries reused for a near-duplicate query")
+    misses: int = Field(description="Lookups with no query similar enough")
+    low_overlap: int = Field(description="Similar queries not reused because too few result URLs were shared")
+    evictions: int = Field(description="Unexpired entries overwritten because the index was full")
+
+
+class CoalescingStats(BaseModel):
+    """Single-flight counters for one kind of upstream call."""
+
+    executions: int = Field(description="Upstream calls actually made")
+    coalesced: int = Field(description="Calls that shared an identical in-flight call instead")
+    in_flight: int
+
+
+class BackendStats(BaseModel):
+    """Routing counters for one upstream instance (Ollama or SearXNG)."""
+
+    ready: bool = Field(description="Gets requests; an Ollama instance is ready once its model is pulled and loaded")
+    in_flight: int = Field(description="Requests currently sent to this instance")
+    requests_total: int
+    errors_total: int = Field(description="Connection errors, timeouts and 5xx/404 responses")
+    consecutive_errors: int
+    ejected: bool = Field(description="Skipped for routing after *_EJECT_ERRORS consecutive errors")
+    ejected_for_seconds: float = Field(description="Seconds until an ejected instance is tried again")
+    latency_ewma_ms: float | None = Field(default=None, description="Moving average of successful request time")
+
+
+class HedgingStats(BaseModel):
+    """Hedged SearXNG requests (SEARXNG_HEDGE)."""
+
+    enabled: bool = Field(description="Hedging is on and two or more instances are configured")
+    delay_seconds: float | None = Field(
+        default=None, description="Current hedge delay (recent SEARXNG_HEDGE_PERCENTILE latency); unset until measured"
+    )
+    requests: int = Field(description="Searches sent to SearXNG")
+    hedged: int = Field(description="Searches also sent to a second instance")
+    hedge_wins: int = Field(description="Hedged searches answered first by the second instance")
+
+
+class ModelState(StrEnum):
+    PENDING = "pending"
+    PULLING = "pulling"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class ModelStatus(BaseModel):
+    """Background pull/warm-up state of the summarization model."""
+
+    model: str
+    state: ModelState = Field(
+        description="`ready` once the model is pulled and loaded; `failed` is retried in the background"
+    )
+    error: str | None = Field(default=None, description="Last pull or warm-up error")
+    last_warmed_at: float | None = Field(default=None, description="Unix time of the last successful warm ping")
+
+
+class HealthResponse(BaseModel):
+    """Service health: search is served as soon as the process is up; summarization once the model is ready."""
+
+    status: Literal["ok"] = "ok"
+    summarization_ready: bool
+    summarization: ModelStatus
+
+
+class StatusResponse(BaseModel):
+    """Runtime statistics for sizing and monitoring the service."""
+
+    http_pools: dict[str, HttpPoolStats] = Field(description="Pool usage per upstream (searxng, ollama, fetcher)")
+    extraction: ExtractionPoolStats
+    summary_jobs: JobQueueStats = Field(description="Deferred summary queue (defer_summary=true)")
+    summary_admission: AdmissionStats = Field(description="Summaries generated, queued and shed")
+    semantic_cache: SemanticCacheStats
+    coalescing: dict[str, CoalescingStats] = Field(
+        description="Request coalescing per call type (searxng, fetcher, extraction, ollama)"
+    )
+    ollama_backends: dict[str, BackendStats] = Field(description="Summarization routing per Ollama URL")
+    searxng_backends: dict[str, BackendStats] = Field(description="Search routing per SearXNG URL")
+    searxng_hedging: HedgingStats
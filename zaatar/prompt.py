@@ -0,0 +1,136 @@
+"""Summarization prompt construction within a token budget."""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from zaatar.definitions import CHARS_PER_TOKEN
+from zaatar.functions import canonical_url
+
+ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text from its length (no tokenizer is available for every model)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class SummaryPrompt:
+    """A prompt fitted to a token budget, with the numbers that shaped it."""
+
+    prompt: str
+    context_tokens: int
+    max_tokens: int
+    prompt_budget_tokens: int
+    prompt_tokens_estimate: int
+    results_used: int
+    duplicates_dropped: int
+    results_dropped: int
+    chars_trimmed: int
+
+    def metadata(self) -> dict[str, Any]:
+        """Everything but the prompt text."""
+        return {key: value for key, value in asdict(self).items() if key != "prompt"}
+
+
+def dedupe_results(results: list[dict[str, str]]) -> list[dict[str, str]]:
+    """Drop results whose URL (ignoring scheme, ``www.``, trailing slash and fragment) or description repeats."""
+    seen_urls: set[str] = set()
+    seen_descriptions: set[str] = set()
+    unique = []
+    for result in results:
+        url_key = canonical_url(result["url"])
+        description_key = " ".join(result["description"].lower().split())
+        if url_key in seen_urls or (description_key and description_key in seen_descriptions):
+            continue
+        seen_urls.add(url_key)
+        seen_descriptions.add(description_key)
+        unique.append(result)
+    return unique
+
+
+def _header(query: str) -> str:
+    return f"Search query: {query}\n\nSearch results:\n"
+
+
+FOOTER = "\n\nProvide a concise summary answering the query based on these results."
+
+
+def _result_line(result: dict[str, str], description: str) -> str:
+    return f"- [{result['title']}]({result['url']}): {description}"
+
+
+def _result_text(result: dict[str, str]) -> str:
+    """A result's description, followed by its page text (on one line) when the page was fetched."""
+    content = result.get("content")
+    if not content:
+        return result["description"]
+    return f"{result['description']} Page text: {' '.join(content.split())}"
+
+
+def _trim(text: str, max_chars: int) -> str:
+    """Cut text to at most ``max_chars`` characters, at a word boundary where one is close."""
+    if len(text) <= max_chars:
+        return text
+    if max_chars <= len(ELLIPSIS):
+        return ""
+    cut = text[: max_chars - len(ELLIPSIS)]
+    space = cut.rfind(" ")
+    if space > len(cut) // 2:
+        cut = cut[:space]
+    return cut.rstrip() + ELLIPSIS
+
+
+def _render(query: str, results: list[dict[str, str]], descriptions: list[str]) -> str:
+    lines = "\n".join(
+        _result_line(result, description) for result, description in zip(results, descriptions, strict=True)
+    )
+    return f"{_header(query)}{lines}{FOOTER}"
+
+
+def build_summary_prompt(
+    query: str,
+    results: list[dict[str, str]],
+    context_tokens: int,
+    max_tokens: int,
+    reserved_tokens: int = 0,
+) -> SummaryPrompt:
+    """Format the query and results into a prompt that fits the context window.
+
+    The prompt may use ``context_tokens - max_tokens - reserved_tokens`` (estimated) tokens, leaving
+    room for the generated summary and the system prompt. Duplicate results are dropped; if the
+    result lines still do not fit, every description (with its page text, if fetched) is shortened
+    by the same proportion, and if titles and URLs alone overflow, the lowest-ranked results are
+    dropped.
+    """
+    budget_tokens = max(context_tokens - max_tokens - reserved_tokens, 0)
+    budget_chars = budget_tokens * CHARS_PER_TOKEN
+    unique = dedupe_results(results)
+    used = list(unique)
+
+    def fixed_chars(kept: list[dict[str, str]]) -> int:
+        return len(_render(query, kept, [""] * len(kept)))
+
+    while len(used) > 1 and fixed_chars(used) > budget_chars:
+        used.pop()
+
+    descriptions = [_result_text(result) for result in used]
+    available = budget_chars - fixed_chars(used)
+    total = sum(len(description) for description in descriptions)
+    if total > available:
+        ratio = max(available, 0) / total
+        descriptions = [_trim(description, int(len(description) * ratio)) for description in descriptions]
+
+    prompt = _render(query, used, descriptions)
+    return SummaryPrompt(
+        prompt=prompt,
+        context_tokens=context_tokens,
+        max_tokens=max_tokens,
+        prompt_budget_tokens=budget_tokens,
+        prompt_tokens_estimate=estimate_tokens(prompt),
+        results_used=len(used),
+        duplicates_dropped=len(results) - len(unique),
+        results_dropped=len(unique) - len(used),
+        chars_trimmed=sum(len(_result_text(r)) for r in used) - sum(len(d) for d in descriptions),
+    )
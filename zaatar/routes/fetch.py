@@ -5,8 +5,11 @@ import logging
 import httpx
 from flask_openapi3 import APIBlueprint, Tag
 
-from zaatar.clients.fetcher import FetchError, fetch
-from zaatar.models import FetchQuery, FetchResponse
+from zaatar.clients.extraction import ExtractionAbortedError
+from zaatar.clients.fetcher import FetchError, fetch, fetch_batch
+from zaatar.clients.registry import FETCHER
+from zaatar.metrics import count_upstream_error
+from zaatar.models import FetchBatchItem, FetchBatchQuery, FetchBatchResponse, FetchQuery, FetchResponse
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +29,52 @@ def web_fetch(query: FetchQuery):
         result = fetch(query)
     except FetchError as exc:
         return {"error": str(exc)}, 400
+    except ExtractionAbortedError as exc:
+        return {"error": str(exc)}, 504
     except httpx.HTTPStatusError as exc:
         logger.exception("Fetch failed")
+        count_upstream_error(FETCHER, exc)
         return {"error": f"Upstream error: {exc.response.status_code}"}, 502
-    except httpx.ConnectError:
+    except httpx.ConnectError as exc:
         logger.exception("Cannot connect to %s", query.url)
+        count_upstream_error(FETCHER, exc)
         return {"error": "Cannot connect to target URL"}, 502
 
-    return result.model_dump()
+    headers = {"X-Cache": result._cache_status} if result._cache_status else {}
+    return result.model_dump(), 200, headers
+
+
+def _batch_item(query: FetchQuery, outcome: FetchResponse | Exception) -> FetchBatchItem:
+    """Map a batch outcome to the status and error /web_fetch would have returned."""
+    if isinstance(outcome, FetchResponse):
+        return FetchBatchItem(status=200, response=outcome)
+    if isinstance(outcome, FetchError):
+        return FetchBatchItem(status=400, error=str(outcome))
+    if isinstance(outcome, ExtractionAbortedError):
+        return FetchBatchItem(status=504, error=str(outcome))
+    if isinstance(outcome, httpx.HTTPError):
+        count_upstream_error(FETCHER, outcome)
+    if isinstance(outcome, httpx.HTTPStatusError):
+        logger.warning(f"Fetch failed for {query.url}: {outcome.response.status_code}")
+        return FetchBatchItem(status=502, error=f"Upstream error: {outcome.response.status_code}")
+    if isinstance(outcome, httpx.ConnectError):
+        logger.warning(f"Cannot connect to {query.url}")
+        return FetchBatchItem(status=502, error="Cannot connect to target URL")
+    logger.error(f"Fetch failed for {query.url}", exc_info=outcome)
+    return FetchBatchItem(status=502, error=f"Fetch failed: {type(outcome).__name__}")
+
+
+@fetch_bp.post(
+    "/web_fetch/batch",
+    summary="Fetch web content (batch)",
+    description=(
+        "Fetch several URLs concurrently, with a global and a per-host concurrency limit. Each item takes the "
+        "same parameters as `/web_fetch`; results are returned in input order with per-item errors."
+    ),
+    responses={200: FetchBatchResponse},
+)
+def web_fetch_batch(body: FetchBatchQuery):
+    """Fetch several URLs concurrently and extract their content."""
+    outcomes = fetch_batch(body.queries)
+    items = [_batch_item(query, outcome) for query, outcome in zip(body.queries, outcomes, strict=True)]
+    return FetchBatchResponse(results=items).model_dump(exclude_none=True)
@@ -0,0 +1,43 @@
+"""Health and readiness endpoints."""
+
+import logging
+
+from flask_openapi3 import APIBlueprint, Tag
+
+from zaatar.models import HealthResponse
+from zaatar.warmup import model_warmer
+
+logger = logging.getLogger(__name__)
+
+tag = Tag(name="Status", description="Runtime statistics")
+health_bp = APIBlueprint("health", __name__, abp_tags=[tag])
+
+
+def _health() -> HealthResponse:
+    return HealthResponse(summarization_ready=model_warmer.ready, summarization=model_warmer.status())
+
+
+@health_bp.get(
+    "/health",
+    summary="Service health",
+    description=(
+        "Liveness: always 200 once the process serves requests. Search works immediately; "
+        "`summarization_ready` reports whether the Ollama model has been pulled and loaded in the background."
+    ),
+    responses={200: HealthResponse},
+)
+def health():
+    """Report liveness and the summarization model state."""
+    return _health().model_dump()
+
+
+@health_bp.get(
+    "/health/ready",
+    summary="Summarization readiness",
+    description="200 once the Ollama model is pulled and loaded, 503 until then (or while it is failing).",
+    responses={200: HealthResponse, 503: HealthResponse},
+)
+def health_ready():
+    """Report whether summarization is ready, as the HTTP status."""
+    result = _health()
+    return result.model_dump(), 200 if result.summarization_ready else 503
@@ -0,0 +1,30 @@
+"""Prometheus metrics endpoint."""
+
+import logging
+
+from flask import Response
+from flask_openapi3 import APIBlueprint, Tag
+
+from zaatar.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+tag = Tag(name="Status", description="Runtime statistics")
+metrics_bp = APIBlueprint("metrics", __name__, abp_tags=[tag])
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_bp.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description=(
+        "Latency histograms per stage (route, SearXNG, Ollama, fetch download, extraction CPU time), "
+        "Ollama token counts, fetch sizes and upstream error counters, in the Prometheus text format"
+    ),
+    responses={200: {"description": "Metrics", "content": {"text/plain": {"schema": {"type": "string"}}}}},
+)
+def metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    return Response(registry.render(), content_type=CONTENT_TYPE)
@@ -1,13 +1,37 @@
 """Web search endpoint."""
 
+from __future__ import annotations
+
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 import httpx
+from flask import Response
 from flask_openapi3 import APIBlueprint, Tag
 
-from zaatar.clients.ollama import summarize
+from zaatar.admission import AdmissionRejectedError, ShedReason
+from zaatar.clients.ollama import summarize, summarize_stream, summary_budget
+from zaatar.clients.registry import OLLAMA, SEARXNG
 from zaatar.clients.searxng import search
-from zaatar.models import SearchQuery, SearchResponse
+from zaatar.deep import deepen
+from zaatar.jobs import defer_summary, summary_jobs
+from zaatar.metrics import count_upstream_error
+from zaatar.models import (
+    SearchBatchItem,
+    SearchBatchQuery,
+    SearchBatchResponse,
+    SearchQuery,
+    SearchResponse,
+    SummaryJobResponse,
+    SummaryPath,
+    SummaryWaitQuery,
+)
+from zaatar.settings import SEARCH_BATCH_CONCURRENCY
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +39,61 @@ tag = Tag(name="Search", description="Web search operations")
 search_bp = APIBlueprint("search", __name__, abp_tags=[tag])
 
 
+# Upstream failures the search routes report as 502: httpx errors and undecodable responses
+UPSTREAM_ERRORS = (httpx.HTTPError, ValueError)
+
+# Client-facing name of each upstream, and the error when it cannot be reached
+_SERVICES = {
+    SEARXNG: ("Search engine", "Search engine unavailable"),
+    OLLAMA: ("Summarization", "Summarization service unavailable"),
+}
+
+
+def upstream_error(upstream: str, exc: Exception) -> str:
+    """Log and count a SearXNG or Ollama failure, returning the error message for the client."""
+    count_upstream_error(upstream, exc)
+    name, unavailable = _SERVICES[upstream]
+    if isinstance(exc, httpx.HTTPStatusError):
+        logger.error(f"{upstream} request failed", exc_info=exc)
+        return f"{name} error: {exc.response.status_code}"
+    if isinstance(exc, httpx.ConnectError):
+        logger.error(f"Cannot connect to {upstream}", exc_info=exc)
+        return unavailable
+    if isinstance(exc, httpx.TimeoutException):
+        logger.error(f"{upstream} request timed out", exc_info=exc)
+        return f"{name} timed out"
+    logger.error(f"{upstream} request failed", exc_info=exc)
+    return f"{name} failed: {type(exc).__name__}"
+
+
+def _run_search(query: SearchQuery) -> tuple[SearchResponse | None, str | None]:
+    """Search and optionally summarize, returning ``(result, None)`` or ``(None, error)``."""
+    try:
+        result = search(query)
+    except UPSTREAM_ERRORS as exc:
+        return None, upstream_error(SEARXNG, exc)
+
+    if query.depth == "deep":
+        deepen(result)
+    if query.summarize and result.web.results:
+        results_for_llm = [r.model_dump() for r in result.web.results]
+        result.summary_budget = summary_budget(query.query, results_for_llm)
+        if query.defer_summary:
+            result.summary, result.summary_id = defer_summary(query.query, results_for_llm)
+            if result.summary is None and result.summary_id is None:
+                result.summary_skipped = ShedReason.QUEUE_FULL
+            return result, None
+        try:
+            result.summary = summarize(query.query, results_for_llm)
+        except AdmissionRejectedError as exc:
+            logger.warning(f"Summary skipped under load: {exc.reason}")
+            result.summary_skipped = exc.reason
+        except UPSTREAM_ERRORS as exc:
+            return None, upstream_error(OLLAMA, exc)
+
+    return result, None
+
+
 @search_bp.get(
     "/web_search",
     summary="Search the web",
@@ -23,24 +102,113 @@ search_bp = APIBlueprint("search", __name__, abp_tags=[tag])
 )
 def web_search(query: SearchQuery):
     """Execute a web search and return results, optionally summarized."""
+    result, error = _run_search(query)
+    if result is None:
+        return {"error": error}, 502
+
+    headers = {"X-Cache": result._cache_status} if result._cache_status else {}
+    return result.model_dump(exclude_none=True), 200, headers
+
+
+@search_bp.get(
+    "/web_search/summary/<summary_id>",
+    summary="Get a deferred summary",
+    description=(
+        "Return the state of a summary started by `/web_search` with `defer_summary=true`. With `wait`, "
+        "the request is held until the summary finishes or `wait` seconds pass (long-polling); when "
+        "`SUMMARY_JOB_MAX_WAITERS` requests are already waiting, the current state is returned at once. "
+        "Finished summaries are kept for `SUMMARY_JOB_TTL` seconds."
+    ),
+    responses={200: SummaryJobResponse},
+)
+def web_search_summary(path: SummaryPath, query: SummaryWaitQuery):
+    """Return a deferred summary, optionally waiting for it to finish."""
+    job = summary_jobs.get(path.summary_id)
+    if job is None:
+        return {"error": "Unknown or expired summary_id"}, 404
+
+    if query.wait > 0:
+        summary_jobs.wait(job, query.wait)
+    result = SummaryJobResponse(summary_id=job.id, status=job.status, summary=job.result, error=job.error)
+    return result.model_dump(exclude_none=True)
+
+
+def _batch_item(query: SearchQuery) -> SearchBatchItem:
+    """Run one batch search; any failure is reported on its item instead of failing the batch."""
     try:
-        result = search(query)
-    except httpx.HTTPStatusError as exc:
-        logger.exception("SearXNG request failed")
-        return {"error": f"Search engine error: {exc.response.status_code}"}, 502
-    except httpx.ConnectError:
-        logger.exception("Cannot connect to SearXNG")
-        return {"error": "Search engine unavailable"}, 502
+        result, error = _run_search(query)
+    except Exception as exc:  # noqa: BLE001 - reported per item
+        logger.exception(f"Batch search failed for '{query.query}'")
+        return SearchBatchItem(status=502, error=f"Search failed: {type(exc).__name__}")
+    if result is None:
+        return SearchBatchItem(status=502, error=error)
+    return SearchBatchItem(status=200, response=result)
 
-    if query.summarize and result.web.results:
+
+@search_bp.post(
+    "/web_search/batch",
+    summary="Search the web (batch)",
+    description=(
+        "Run several web searches concurrently. Each item takes the same parameters as `/web_search` "
+        "(including per-item `summarize`); results are returned in input order with per-item errors."
+    ),
+    responses={200: SearchBatchResponse},
+)
+def web_search_batch(body: SearchBatchQuery):
+    """Execute several web searches concurrently."""
+    max_workers = min(SEARCH_BATCH_CONCURRENCY, len(body.queries))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-batch") as executor:
+        items = list(executor.map(_batch_item, body.queries))
+
+    return SearchBatchResponse(results=items).model_dump(exclude_none=True)
+
+
+def _sse_event(event: str, data: dict[str, Any]) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_events(query: SearchQuery, result: SearchResponse) -> Iterator[str]:
+    """Yield the search results, then summary chunks as Ollama generates them."""
+    summarizing = query.summarize and bool(result.web.results)
+    results_for_llm = [r.model_dump() for r in result.web.results]
+    if summarizing:
+        result.summary_budget = summary_budget(query.query, results_for_llm)
+    yield _sse_event("results", result.model_dump(exclude_none=True))
+
+    if summarizing:
         try:
-            results_for_llm = [r.model_dump() for r in result.web.results]
-            result.summary = summarize(query.query, results_for_llm)
-        except httpx.ConnectError:
-            logger.exception("Cannot connect to Ollama")
-            return {"error": "Summarization service unavailable"}, 502
-        except httpx.HTTPStatusError as exc:
-            logger.exception("Ollama request failed")
-            return {"error": f"Summarization error: {exc.response.status_code}"}, 502
+            for chunk in summarize_stream(query.query, results_for_llm):
+                yield _sse_event("summary", {"delta": chunk})
+        except AdmissionRejectedError as exc:
+            logger.warning(f"Streamed summary skipped under load: {exc.reason}")
+            yield _sse_event("summary_skipped", {"reason": exc.reason})
+        except UPSTREAM_ERRORS as exc:
+            yield _sse_event("error", {"error": upstream_error(OLLAMA, exc)})
+            return
 
-    return result.model_dump(exclude_none=True)
+    yield _sse_event("done", {})
+
+
+@search_bp.get(
+    "/web_search/stream",
+    summary="Search the web (streamed)",
+    description=(
+        "Search the web and stream the response as Server-Sent Events: a `results` event with the search "
+        "results, `summary` events with LLM summary text deltas, then `done` (or `error`)."
+    ),
+    responses={200: {"description": "Event stream", "content": {"text/event-stream": {"schema": {"type": "string"}}}}},
+)
+def web_search_stream(query: SearchQuery):
+    """Execute a web search, streaming results first and the summary as it is generated."""
+    try:
+        result = search(query)
+    except UPSTREAM_ERRORS as exc:
+        return {"error": upstream_error(SEARXNG, exc)}, 502
+
+    if query.depth == "deep":
+        deepen(result)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    if result._cache_status:
+        headers["X-Cache"] = result._cache_status
+    return Response(_stream_events(query, result), mimetype="text/event-stream", headers=headers)
@@ -0,0 +1,47 @@
+"""Runtime status endpoint."""
+
+import logging
+
+from flask_openapi3 import APIBlueprint, Tag
+
+from zaatar.clients.extraction import extraction_pool
+from zaatar.clients.ollama import ollama_backends, semantic_summaries, summary_admission
+from zaatar.clients.registry import get_registry
+from zaatar.clients.searxng import searxng_backends, searxng_hedging
+from zaatar.jobs import summary_jobs
+from zaatar.models import StatusResponse
+from zaatar.singleflight import coalescing_stats
+
+logger = logging.getLogger(__name__)
+
+tag = Tag(name="Status", description="Runtime statistics")
+status_bp = APIBlueprint("status", __name__, abp_tags=[tag])
+
+
+@status_bp.get(
+    "/status",
+    summary="Runtime statistics",
+    description=(
+        "Report shared HTTP client pool usage per upstream, extraction pool and summary queue depth, "
+        "summarization admission (queue depth and shed counts), semantic summary cache counters, "
+        "request coalescing counters, and per-instance Ollama and SearXNG routing and hedging counters"
+    ),
+    responses={200: StatusResponse},
+)
+def status():
+    """Return runtime statistics."""
+    # The stats() methods return plain dicts; model_validate() builds the nested response models from them
+    result = StatusResponse.model_validate(
+        {
+            "http_pools": get_registry().stats(),
+            "extraction": extraction_pool.stats(),
+            "summary_jobs": summary_jobs.stats(),
+            "summary_admission": summary_admission.stats(),
+            "semantic_cache": semantic_summaries.stats(),
+            "coalescing": coalescing_stats(),
+            "ollama_backends": ollama_backends.stats(),
+            "searxng_backends": searxng_backends.stats(),
+            "searxng_hedging": searxng_hedging.stats(),
+        }
+    )
+    return result.model_dump()
@@ -0,0 +1,184 @@
+"""Semantic summary cache: reuse a summary for a near-duplicate query over mostly the same results."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from zaatar.functions import canonical_url
+
+try:
+    import numpy as np
+except ImportError:  # Optional: pip install zaatar[semantic-cache]
+    np = None
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy import float32
+    from numpy.typing import NDArray
+
+
+def result_urls(results: list[dict[str, str]]) -> frozenset[str]:
+    return frozenset(canonical_url(result["url"]) for result in results)
+
+
+def url_overlap(cached: frozenset[str], current: frozenset[str]) -> float:
+    """Share of the current results' URLs that a cached summary was also built from."""
+    if not current:
+        return 0.0
+    return len(cached & current) / len(current)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    namespace: str
+    urls: frozenset[str]
+    summary: str
+
+
+class SemanticIndex:
+    """Top-1 cosine lookup over past query embeddings, each mapped to a summary and the URLs it summarized.
+
+    Embeddings are L2-normalized into the rows of a float32 matrix of ``max_size`` rows, so a
+    lookup is one matrix-vector product. A lookup hits when the most similar live row of the same
+    ``namespace`` (the model) scores at least ``threshold`` and at least ``min_url_overlap`` of the
+    current results' URLs were summarized for it. Rows expire after ``ttl`` seconds; when the
+    index is full an expired row, or else the least recently used one, is overwritten. Needs numpy;
+    without it (or with ``max_size`` 0) the index is disabled.
+    """
+
+    def __init__(self, max_size: int, ttl: float, threshold: float, min_url_overlap: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self.min_url_overlap = min_url_overlap
+        self._reset()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and np is not None
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        # Allocated on the first add, once the embedding size is known
+        self._dimensions: int | None = None
+        self._matrix: Any = None
+        self._expires_at: Any = None
+        self._used_at: Any = None
+        self._namespace_ids: Any = None
+        self._namespaces: dict[str, int] = {}
+        self._entries: list[_Entry] = []
+        self.hits = 0
+        self.misses = 0
+        self.low_overlap = 0
+        self.evictions = 0
+
+    def _normalize(self, vector: Sequence[float]) -> NDArray[float32] | None:
+        """Return the vector as a unit-length float32 array, or None if it cannot be compared."""
+        assert np is not None
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        if array.ndim != 1 or norm == 0.0:
+            return None
+        if array.shape[0] != self._dimensions:
+            return None
+        return array / norm
+
+    def lookup(self, vector: Sequence[float], namespace: str, urls: frozenset[str]) -> str | None:
+        """Return the summary cached for the most similar query, if it is similar enough and shares the results."""
+        if not self.enabled:
+            return None
+        assert np is not None
+        now = time.monotonic()
+        with self._lock:
+            query = self._normalize(vector)
+            namespace_id = self._namespaces.get(namespace)
+            if query is None or namespace_id is None:
+                self.misses += 1
+                return None
+            size = len(self._entries)
+            scores = self._matrix[:size] @ query
+            live = (self._expires_at[:size] > now) & (self._namespace_ids[:size] == namespace_id)
+            scores = np.where(live, scores, -np.inf)
+            row = int(np.argmax(scores))
+            if scores[row] < self.threshold:
+                self.misses += 1
+                return None
+            entry = self._entries[row]
+            if url_overlap(entry.urls, urls) < self.min_url_overlap:
+                self.low_overlap += 1
+                return None
+            self._used_at[row] = now
+            self.hits += 1
+            return entry.summary
+
+    def _allocate(self, dimensions: int) -> None:
+        assert np is not None
+        self._dimensions = dimensions
+        self._matrix = np.zeros((self.max_size, dimensions), dtype=np.float32)
+        self._expires_at = np.zeros(self.max_size, dtype=np.float64)
+        self._used_at = np.zeros(self.max_size, dtype=np.float64)
+        self._namespace_ids = np.zeros(self.max_size, dtype=np.int32)
+
+    def _free_row(self, now: float) -> int:
+        """Pick the row for a new entry (lock held): the next unused one, else an expired or the least recently used."""
+        if len(self._entries) < self.max_size:
+            return len(self._entries)
+        assert np is not None
+        expired = np.flatnonzero(self._expires_at <= now)
+        if expired.size:
+            return int(expired[0])
+        self.evictions += 1
+        return int(np.argmin(self._used_at))
+
+    def add(self, vector: Sequence[float], namespace: str, urls: frozenset[str], summary: str) -> None:
+        """Index a query embedding with the summary generated for it and the URLs it summarized."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._dimensions is None:
+                self._allocate(len(vector))
+            query = self._normalize(vector)
+            if query is None:
+                return
+            namespace_id = self._namespaces.setdefault(namespace, len(self._namespaces))
+            row = self._free_row(now)
+            self._matrix[row] = query
+            self._expires_at[row] = now + self.ttl
+            self._used_at[row] = now
+            self._namespace_ids[row] = namespace_id
+            entry = _Entry(namespace, urls, summary)
+            if row == len(self._entries):
+                self._entries.append(entry)
+            else:
+                self._entries[row] = entry
+
+    def after_fork(self) -> None:
+        """Replace the lock in a forked child; the inherited index stays usable."""
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            size = len(self._entries)
+            live = 0 if self._expires_at is None else int((self._expires_at[:size] > now).sum())
+            return {
+                "enabled": self.enabled,
+                "max_size": self.max_size,
+                "entries": live,
+                "hits": self.hits,
+                "misses": self.misses,
+                "low_overlap": self.low_overlap,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,108 @@
+"""Production entry point: uv run python -m zaatar.server (requires the ``server`` extra).
+
+Runs create_app() under gunicorn with threaded workers. The app is loaded in the master before
+forking, so workers share the imported modules copy-on-write; per-process state (HTTP clients,
+executors, the extraction pool, job threads, model warm-up) is reset in each worker after the fork. On SIGTERM
+workers stop accepting connections and finish in-flight requests for up to SERVER_GRACEFUL_TIMEOUT
+seconds.
+"""
+
+import logging
+from typing import Any
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+from zaatar.app import create_app
+from zaatar.clients.extraction import extraction_pool
+from zaatar.clients.fetcher import reset_executor as reset_fetch_executor
+from zaatar.clients.ollama import ollama_backends, semantic_summaries, summary_admission, summary_cache
+from zaatar.clients.registry import close_clients, reset_clients
+from zaatar.clients.searxng import reset_executors, searxng_backends, searxng_hedging
+from zaatar.jobs import summary_jobs
+from zaatar.settings import (
+    FLASK_HOST,
+    FLASK_PORT,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_KEEPALIVE,
+    SERVER_THREADS,
+    SERVER_TIMEOUT,
+    SERVER_WORKERS,
+)
+from zaatar.singleflight import reset_after_fork as reset_single_flights
+from zaatar.warmup import model_warmer
+
+logger = logging.getLogger(__name__)
+
+
+def post_fork(_server: Arbiter, worker: Worker) -> None:
+    """Give a new worker its own clients, executors and pools instead of the master's."""
+    reset_clients()
+    reset_executors()
+    reset_fetch_executor()
+    reset_single_flights()
+    extraction_pool.after_fork()
+    summary_jobs.after_fork()
+    summary_cache.after_fork()
+    ollama_backends.after_fork()
+    searxng_backends.after_fork()
+    searxng_hedging.after_fork()
+    summary_admission.after_fork()
+    semantic_summaries.after_fork()
+    # Each worker reports its own readiness, so each tracks the model; Ollama shares one pull
+    model_warmer.after_fork()
+    model_warmer.start()
+    logger.debug(f"Worker {worker.pid} initialized")
+
+
+def worker_exit(_server: Arbiter, worker: Worker) -> None:
+    """Stop the worker's extraction processes and close its connections once it has drained."""
+    model_warmer.stop()
+    extraction_pool.close()
+    close_clients()
+    logger.debug(f"Worker {worker.pid} exited")
+
+
+def gunicorn_options() -> dict[str, Any]:
+    """Gunicorn settings derived from zaatar.settings."""
+    return {
+        "bind": f"{FLASK_HOST}:{FLASK_PORT}",
+        "workers": SERVER_WORKERS,
+        "worker_class": "gthread",
+        "threads": SERVER_THREADS,
+        "keepalive": SERVER_KEEPALIVE,
+        "timeout": SERVER_TIMEOUT,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT,
+        "preload_app": True,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+    }
+
+
+class ZaatarServer(BaseApplication):
+    """Gunicorn application serving create_app() with options from zaatar.settings."""
+
+    def __init__(self, options: dict[str, Any] | None = None) -> None:
+        self.options = options if options is not None else gunicorn_options()
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):  # noqa: ANN201
+        return create_app()
+
+
+def main() -> None:
+    if SERVER_WORKERS > 1:
+        logger.warning(
+            f"Running {SERVER_WORKERS} workers: deferred summaries and metrics are per worker, so "
+            "/web_search/summary polls and /metrics scrapes may reach a worker that does not have them"
+        )
+    ZaatarServer().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,151 @@
 import os
+from typing import cast
+
+from zaatar.definitions import EXTRACT_MODES, ExtractMode
 
 # SearXNG
 SEARXNG_BASE_URL: str = os.getenv("SEARXNG_BASE_URL", "http://localhost:8080")
 SEARXNG_ENGINES: str = os.getenv("SEARXNG_ENGINES", "")
 SEARXNG_SAFESEARCH: int = int(os.getenv("SEARXNG_SAFESEARCH", "0"))
+# SearXNG instances (comma-separated, defaults to SEARXNG_BASE_URL); each search goes to the one with the lowest
+# moving-average latency. An instance is ejected for SEARXNG_EJECT_SECONDS after SEARXNG_EJECT_ERRORS consecutive errors
+SEARXNG_BASE_URLS: list[str] = [
+    url.strip().rstrip("/") for url in os.getenv("SEARXNG_BASE_URLS", SEARXNG_BASE_URL).split(",") if url.strip()
+]
+SEARXNG_EJECT_ERRORS: int = int(os.getenv("SEARXNG_EJECT_ERRORS", "2"))
+SEARXNG_EJECT_SECONDS: float = float(os.getenv("SEARXNG_EJECT_SECONDS", "30"))
+# Hedged searches (two or more instances): a search unanswered after the recent SEARXNG_HEDGE_PERCENTILE latency
+# (at least SEARXNG_HEDGE_MIN_DELAY seconds) is also sent to a second instance, and the first answer is used.
+# Hedges are capped at SEARXNG_HEDGE_MAX_RATIO of searches
+SEARXNG_HEDGE: bool = os.getenv("SEARXNG_HEDGE", "true").lower() in ("1", "true", "yes")
+SEARXNG_HEDGE_PERCENTILE: float = float(os.getenv("SEARXNG_HEDGE_PERCENTILE", "0.95"))
+SEARXNG_HEDGE_MIN_DELAY: float = float(os.getenv("SEARXNG_HEDGE_MIN_DELAY", "0.05"))
+SEARXNG_HEDGE_MAX_RATIO: float = float(os.getenv("SEARXNG_HEDGE_MAX_RATIO", "0.1"))
 
 # Search defaults
 DEFAULT_SEARCH_COUNT: int = int(os.getenv("DEFAULT_SEARCH_COUNT", "5"))
-MAX_SEARCH_COUNT: int = int(os.getenv("MAX_SEARCH_COUNT", "10"))
+MAX_SEARCH_COUNT: int = int(os.getenv("MAX_SEARCH_COUNT", "50"))
+# Results SearXNG is expected to return per page; larger counts request ceil(count / SEARXNG_PAGE_SIZE) pages
+# concurrently
+SEARXNG_PAGE_SIZE: int = int(os.getenv("SEARXNG_PAGE_SIZE", "10"))
+
+# Batch search: max queries per request and how many run concurrently
+SEARCH_BATCH_MAX_SIZE: int = int(os.getenv("SEARCH_BATCH_MAX_SIZE", "50"))
+SEARCH_BATCH_CONCURRENCY: int = int(os.getenv("SEARCH_BATCH_CONCURRENCY", "8"))
+
+# Search result cache (max entries, 0 disables); TTLs in seconds
+SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "1024"))
+SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_STALE_TTL: int = int(os.getenv("SEARCH_CACHE_STALE_TTL", "600"))
 
 # Fetch
 FETCH_TIMEOUT: int = int(os.getenv("FETCH_TIMEOUT", "30"))
 FETCH_MAX_CHARS: int = int(os.getenv("FETCH_MAX_CHARS", "50000"))
 
+# Download byte budget: maxChars * FETCH_BYTES_PER_CHAR (markup overhead), clamped to [FETCH_MIN_BYTES, FETCH_MAX_BYTES]
+FETCH_BYTES_PER_CHAR: int = int(os.getenv("FETCH_BYTES_PER_CHAR", "16"))
+FETCH_MIN_BYTES: int = int(os.getenv("FETCH_MIN_BYTES", str(512 * 1024)))
+FETCH_MAX_BYTES: int = int(os.getenv("FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+
+# Batch fetch: max URLs per request, concurrent downloads (overall and per host), extraction threads
+FETCH_BATCH_MAX_SIZE: int = int(os.getenv("FETCH_BATCH_MAX_SIZE", "20"))
+FETCH_BATCH_CONCURRENCY: int = int(os.getenv("FETCH_BATCH_CONCURRENCY", "8"))
+FETCH_BATCH_PER_HOST: int = int(os.getenv("FETCH_BATCH_PER_HOST", "2"))
+FETCH_BATCH_EXTRACT_WORKERS: int = int(os.getenv("FETCH_BATCH_EXTRACT_WORKERS", "2"))
+
+# Fetch cache (max cached URLs, 0 disables); retention bounds how long validators are kept (seconds).
+# FETCH_CACHE_MAX_BYTES bounds the cached bodies and extracted text together (characters, 0 for no limit)
+FETCH_CACHE_MAX_SIZE: int = int(os.getenv("FETCH_CACHE_MAX_SIZE", "256"))
+FETCH_CACHE_MAX_BYTES: int = int(os.getenv("FETCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+FETCH_CACHE_RETENTION: int = int(os.getenv("FETCH_CACHE_RETENTION", "86400"))
+
+# Extraction process pool (0 runs extraction in the request thread); per-page timeout in seconds
+EXTRACTION_WORKERS: int = int(os.getenv("EXTRACTION_WORKERS", "2"))
+EXTRACTION_TIMEOUT: float = float(os.getenv("EXTRACTION_TIMEOUT", "15"))
+EXTRACTION_START_METHOD: str = os.getenv("EXTRACTION_START_METHOD", "spawn")
+
+# Deep search (depth=deep): how many top results are fetched, the time budget shared by their fetches (seconds),
+# the most characters of page text kept per result, and the extractMode used
+DEEP_SEARCH_RESULTS: int = int(os.getenv("DEEP_SEARCH_RESULTS", "3"))
+DEEP_SEARCH_TIMEOUT: float = float(os.getenv("DEEP_SEARCH_TIMEOUT", "8"))
+DEEP_SEARCH_MAX_CHARS: int = int(os.getenv("DEEP_SEARCH_MAX_CHARS", "4000"))
+DEEP_SEARCH_EXTRACT_MODE: ExtractMode = cast("ExtractMode", os.getenv("DEEP_SEARCH_EXTRACT_MODE", "lxml-text"))
+if DEEP_SEARCH_EXTRACT_MODE not in EXTRACT_MODES:
+    msg = f"DEEP_SEARCH_EXTRACT_MODE must be one of {', '.join(EXTRACT_MODES)}, not '{DEEP_SEARCH_EXTRACT_MODE}'"
+    raise ValueError(msg)
+
 # Ollama
 OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "gemma3:4b")
 OLLAMA_TIMEOUT: int = int(os.getenv("OLLAMA_TIMEOUT", "120"))
+# Ollama instances sharing summarization (comma-separated, defaults to OLLAMA_BASE_URL); each summary goes to
+# the one with the fewest requests in flight. An instance is ejected for OLLAMA_EJECT_SECONDS after
+# OLLAMA_EJECT_ERRORS consecutive errors
+OLLAMA_BASE_URLS: list[str] = [
+    url.strip().rstrip("/") for url in os.getenv("OLLAMA_BASE_URLS", OLLAMA_BASE_URL).split(",") if url.strip()
+]
+OLLAMA_EJECT_ERRORS: int = int(os.getenv("OLLAMA_EJECT_ERRORS", "2"))
+OLLAMA_EJECT_SECONDS: float = float(os.getenv("OLLAMA_EJECT_SECONDS", "30"))
+# Summarization context window (num_ctx) and the most tokens a summary may generate (num_predict);
+# the prompt is trimmed to fit num_ctx - num_predict
+OLLAMA_NUM_CTX: int = int(os.getenv("OLLAMA_NUM_CTX", "4096"))
+OLLAMA_NUM_PREDICT: int = int(os.getenv("OLLAMA_NUM_PREDICT", "512"))
+# How long Ollama keeps the model loaded after a request (Ollama duration, e.g. "30m"; "-1" keeps it loaded)
+OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+# Background model pull/warm-up: seconds between warm pings (0 disables), and between retries after a failure
+OLLAMA_WARM_INTERVAL: int = int(os.getenv("OLLAMA_WARM_INTERVAL", "240"))
+OLLAMA_WARM_RETRY: int = int(os.getenv("OLLAMA_WARM_RETRY", "30"))
+
+# Summarization admission control, per server process: summaries generated at once, summaries queued
+# behind them, and how long a queued summary may wait (seconds) before results are returned without it
+SUMMARY_MAX_ACTIVE: int = int(os.getenv("SUMMARY_MAX_ACTIVE", str(4 * len(OLLAMA_BASE_URLS))))
+SUMMARY_MAX_QUEUED: int = int(os.getenv("SUMMARY_MAX_QUEUED", "16"))
+SUMMARY_MAX_WAIT: float = float(os.getenv("SUMMARY_MAX_WAIT", "10"))
+
+# Summary cache (max in-memory entries, 0 disables); set SUMMARY_CACHE_PATH to persist summaries to SQLite
+SUMMARY_CACHE_MAX_SIZE: int = int(os.getenv("SUMMARY_CACHE_MAX_SIZE", "512"))
+SUMMARY_CACHE_TTL: int = int(os.getenv("SUMMARY_CACHE_TTL", "86400"))
+SUMMARY_CACHE_PATH: str = os.getenv("SUMMARY_CACHE_PATH", "")
+SUMMARY_CACHE_DISK_MAX_SIZE: int = int(os.getenv("SUMMARY_CACHE_DISK_MAX_SIZE", "10000"))
+
+# Semantic summary cache (max indexed queries, 0 disables; needs numpy: pip install zaatar[semantic-cache]).
+# Queries are embedded with OLLAMA_EMBED_MODEL, and a summary is reused for a query whose embedding has cosine
+# similarity of at least SEMANTIC_CACHE_THRESHOLD with a summarized one, when at least SEMANTIC_CACHE_MIN_URL_OVERLAP
+# of the current results' URLs were summarized then. Entries expire after SUMMARY_CACHE_TTL
+SEMANTIC_CACHE_MAX_SIZE: int = int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "0"))
+SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+SEMANTIC_CACHE_MIN_URL_OVERLAP: float = float(os.getenv("SEMANTIC_CACHE_MIN_URL_OVERLAP", "0.5"))
+OLLAMA_EMBED_MODEL: str = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+# Deferred summaries (defer_summary=true): worker threads, max queued jobs, how long finished
+# summaries can be fetched (seconds), max tracked jobs, and the longest allowed long-poll wait (seconds)
+SUMMARY_JOB_WORKERS: int = int(os.getenv("SUMMARY_JOB_WORKERS", "2"))
+SUMMARY_JOB_QUEUE_SIZE: int = int(os.getenv("SUMMARY_JOB_QUEUE_SIZE", "64"))
+SUMMARY_JOB_TTL: int = int(os.getenv("SUMMARY_JOB_TTL", "600"))
+SUMMARY_JOB_MAX_SIZE: int = int(os.getenv("SUMMARY_JOB_MAX_SIZE", "1024"))
+SUMMARY_JOB_MAX_WAIT: int = int(os.getenv("SUMMARY_JOB_MAX_WAIT", "30"))
+
+# Shared HTTP client pools
+HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_ENABLE_HTTP2: bool = os.getenv("HTTP_ENABLE_HTTP2", "false").lower() in ("1", "true", "yes")
 
 # Flask
 FLASK_HOST: str = os.getenv("FLASK_HOST", "0.0.0.0")  # noqa: S104
 FLASK_PORT: int = int(os.getenv("FLASK_PORT", "5000"))
+# Development server only (uv run python -m zaatar): enables the reloader and debugger
+FLASK_DEBUG: bool = os.getenv("FLASK_DEBUG", "false").lower() in ("1", "true", "yes")
+
+# Production server (uv run python -m zaatar.server, gunicorn): worker processes, threads per worker,
+# keep-alive (seconds), worker timeout (seconds, above OLLAMA_TIMEOUT), and how long a worker may
+# drain in-flight requests after SIGTERM (seconds). Deferred summary jobs, caches and metrics are kept per
+# process, so more than one worker needs sticky routing for /web_search/summary and gives per-worker /metrics
+SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", "1"))
+SERVER_THREADS: int = int(os.getenv("SERVER_THREADS", "8"))
+SERVER_KEEPALIVE: int = int(os.getenv("SERVER_KEEPALIVE", "5"))
+SERVER_TIMEOUT: int = int(os.getenv("SERVER_TIMEOUT", "180"))
+SERVER_GRACEFUL_TIMEOUT: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+# Long-polls of /web_search/summary each hold a server thread; at most this many wait at once per process,
+# and further polls get the summary's current state immediately
+SUMMARY_JOB_MAX_WAITERS: int = int(os.getenv("SUMMARY_JOB_MAX_WAITERS", str(max(1, SERVER_THREADS // 2))))
@@ -0,0 +1,126 @@
+"""Request coalescing: concurrent calls with the same key share one in-flight execution."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+@dataclass
+class _AsyncCall:
+    task: asyncio.Future[Any]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one.
+
+    The first caller for a key (the leader) runs the function; callers arriving while it
+    is in flight wait for it and receive the same result, or the same exception. Results
+    are shared, so callers that mutate them must copy. Threads (``do``) and event-loop
+    tasks (``ado``) are coalesced separately; an event-loop call runs as its own task, which
+    is cancelled only once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[str, _Call] = {}
+        self._async_calls: dict[str, _AsyncCall] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+        _groups[name] = self
+
+    def do(self, key: str, func: Callable[..., Any], *args: object) -> Any:  # noqa: ANN401
+        """Run ``func(*args)``, or wait for the in-flight call with the same key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key: str, func: Callable[..., Awaitable[Any]], *args: object) -> Any:  # noqa: ANN401
+        """Async variant of do() for coroutines on one event loop."""
+        call = self._async_calls.get(key)
+        if call is None:
+            call = _AsyncCall(asyncio.ensure_future(func(*args)))
+            self._async_calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+            with self._lock:
+                self.executions += 1
+        else:
+            with self._lock:
+                self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield: a cancelled caller must not cancel the call others are still waiting for
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _AsyncCall) -> None:
+        if self._async_calls.get(key) is call:
+            del self._async_calls[key]
+
+    def after_fork(self) -> None:
+        """Forget calls in flight in the parent; nothing in a forked child would ever finish them."""
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
+
+
+_groups: dict[str, SingleFlight] = {}
+
+
+def reset_after_fork() -> None:
+    """Reset every single-flight group in a forked child process."""
+    for group in _groups.values():
+        group.after_fork()
+
+
+def coalescing_stats() -> dict[str, dict[str, int]]:
+    """Return execution and coalesced-call counters for every single-flight group."""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,105 @@
+"""Background Ollama model pull and warm-up, so startup does not block on a multi-GB download."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import httpx
+
+from zaatar.clients.ollama import pull_model, semantic_summaries, warm_model
+from zaatar.models import ModelState, ModelStatus
+from zaatar.settings import OLLAMA_EMBED_MODEL, OLLAMA_MODEL, OLLAMA_WARM_INTERVAL, OLLAMA_WARM_RETRY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ModelWarmer:
+    """Pull and load the summarization model on a daemon thread, then keep it loaded.
+
+    The model (and the embedding model, when the semantic summary cache is enabled) is pulled
+    if missing and loaded with an empty generate request; failures are
+    retried every ``retry`` seconds. Once ready, a warm ping is sent every ``interval`` seconds
+    (0 disables) so Ollama does not unload the model between bursts of summary requests.
+    """
+
+    def __init__(self, model: str, interval: float = OLLAMA_WARM_INTERVAL, retry: float = OLLAMA_WARM_RETRY) -> None:
+        self.model = model
+        self.interval = interval
+        self.retry = retry
+        self.state = ModelState.PENDING
+        self.error: str | None = None
+        self.last_warmed_at: float | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state is ModelState.READY
+
+    def start(self) -> None:
+        """Start the background thread (once)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-warmup", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _prepare(self) -> None:
+        self.state = ModelState.PULLING
+        pull_model(self.model)
+        if semantic_summaries.enabled:
+            pull_model(OLLAMA_EMBED_MODEL)
+        self.state = ModelState.WARMING
+        self._warm()
+
+    def _warm(self) -> None:
+        warm_model(self.model)
+        self.last_warmed_at = time.time()
+        self.error = None
+        self.state = ModelState.READY
+
+    def _attempt(self, step: Callable[[], None]) -> bool:
+        try:
+            step()
+        except Exception as exc:  # noqa: BLE001 - retried in the background
+            # Ollama being down or the model missing is expected; anything else gets a traceback
+            unexpected = not isinstance(exc, httpx.HTTPError)
+            logger.warning(f"Ollama model '{self.model}' is not ready: {exc!r}", exc_info=unexpected)
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.state = ModelState.FAILED
+            return False
+        return True
+
+    def _run(self) -> None:
+        while not self._attempt(self._prepare):
+            if self._stop.wait(self.retry):
+                return
+        logger.info(f"Ollama model '{self.model}' is loaded")
+
+        # A failed ping pulls again next time, in case the model was removed
+        while self.interval > 0 and not self._stop.wait(self.interval):
+            self._attempt(self._warm if self.ready else self._prepare)
+
+    def after_fork(self) -> None:
+        """Reset state in a forked child; start() launches the child's own thread."""
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.state = ModelState.PENDING
+
+    def status(self) -> ModelStatus:
+        return ModelStatus(model=self.model, state=self.state, error=self.error, last_warmed_at=self.last_warmed_at)
+
+
+model_warmer = ModelWarmer(OLLAMA_MODEL)